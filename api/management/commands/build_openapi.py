@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandParser
+
+from api.openapi import SCHEMA_FILES
+
+# Формат команды spectacular для каждого файла из api.openapi.SCHEMA_FILES
+SPECTACULAR_FORMATS = {"yaml": "openapi", "json": "openapi-json"}
+
+
+class Command(BaseCommand):
+    help = "Генерирует OpenAPI-схему (schema.yaml и schema.json), которую /api/schema/ отдаёт с диска"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output-dir",
+            default=None,
+            help="каталог для файлов схемы (по умолчанию settings.OPENAPI_SCHEMA_DIR)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        output_dir = Path(options["output_dir"] or settings.OPENAPI_SCHEMA_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        for key, (filename, _) in SCHEMA_FILES.items():
+            path = output_dir / filename
+            call_command("spectacular", file=str(path), format=SPECTACULAR_FORMATS[key], validate=True)
+            self.stdout.write(self.style.SUCCESS(f"✔ OpenAPI schema written: {path}"))
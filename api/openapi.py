@@ -0,0 +1,45 @@
+"""
+Отдача OpenAPI-схемы с диска.
+
+Схема собирается заранее командой `manage.py build_openapi` (при деплое)
+в settings.OPENAPI_SCHEMA_DIR: schema.yaml и schema.json. /api/schema/
+отдаёт файл без импорта генератора drf_spectacular. Если файла нет
+(локальная разработка) — схема генерируется на лету SpectacularAPIView.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.views.decorators.http import require_safe
+
+from main.lazy import lazy_view
+
+SCHEMA_FILES = {
+    "yaml": ("schema.yaml", "application/vnd.oai.openapi"),
+    "json": ("schema.json", "application/vnd.oai.openapi+json"),
+}
+
+_generate_schema = lazy_view("drf_spectacular.views.SpectacularAPIView")
+
+
+def schema_format(request: HttpRequest) -> str:
+    """Формат как у SpectacularAPIView: ?format=json или JSON в Accept, иначе YAML."""
+    requested = request.GET.get("format")
+    if requested in SCHEMA_FILES:
+        return requested
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+@require_safe
+def openapi_schema(request: HttpRequest) -> HttpResponse:
+    filename, content_type = SCHEMA_FILES[schema_format(request)]
+    path = Path(settings.OPENAPI_SCHEMA_DIR) / filename
+    if not path.is_file():
+        return _generate_schema(request)
+
+    response = FileResponse(path.open("rb"), content_type=content_type)
+    response["Vary"] = "Accept"
+    return response
@@ -4,6 +4,7 @@ from typing import Any, Dict, List
 
 from rest_framework import serializers
 
+from products.images import variant_urls
 from products.models import Product
 
 from .category_serializers import CategorySerializer
@@ -18,6 +19,7 @@ class ProductSerializer(serializers.ModelSerializer):
         - вложенную категорию (CategorySerializer)
         - вложенные характеристики товара (ProductSpecificationSerializer)
         - вычисляемые поля скидки (is_discounted, discount_percent)
+        - производные изображения по формату и ширине (image_variants)
     """
 
     category: CategorySerializer = CategorySerializer(read_only=True)
@@ -25,6 +27,7 @@ class ProductSerializer(serializers.ModelSerializer):
 
     is_discounted: serializers.BooleanField = serializers.BooleanField(read_only=True)
     discount_percent: serializers.IntegerField = serializers.IntegerField(read_only=True)
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
@@ -39,6 +42,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "old_price",
             "stock",
             "image",
+            "image_variants",
             "is_active",
             "tags",
             "is_discounted",
@@ -53,3 +57,17 @@ class ProductSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+
+    def get_image_variants(self, obj: Product) -> Dict[str, Dict[str, str]]:
+        """
+        URL производных изображения (products/images.py):
+
+        {"webp": {"320": "https://…/products/hops.3f9c2a1b7d4e.320w.webp", …}, "jpeg": {…}}
+
+        Пусто, пока производные не построены — тогда используется image.
+        """
+        request = self.context.get("request")
+        return {
+            fmt: {str(width): request.build_absolute_uri(url) if request else url for width, url in sizes.items()}
+            for fmt, sizes in variant_urls(obj).items()
+        }
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from api.views.cart_views import CartItemViewSet
 from api.views.order_views import OrderViewSet
-from api.views.products.category_views import CategoryViewSet
-from api.views.products.product_views import ProductViewSet
+from api.views.products.category_views import AsyncCategoryViewSet, CategoryViewSet
+from api.views.products.product_views import AsyncProductViewSet, ProductViewSet
 from api.views.review_views import ReviewViewSet
 from api.views.user_views import MeView, RegisterView, UpdateProfileView
 
@@ -16,9 +17,13 @@ from api.views.user_views import MeView, RegisterView, UpdateProfileView
 # ---------------------------------------------------------
 router = DefaultRouter()
 
-# Каталог
-router.register(r"products", ProductViewSet, basename="product")
-router.register(r"categories", CategoryViewSet, basename="category")
+# Каталог (под ASGI — ViewSet'ы с async-списком, см. products/urls.py)
+if settings.SERVER_MODE == "asgi":
+    router.register(r"products", AsyncProductViewSet, basename="product")
+    router.register(r"categories", AsyncCategoryViewSet, basename="category")
+else:
+    router.register(r"products", ProductViewSet, basename="product")
+    router.register(r"categories", CategoryViewSet, basename="category")
 
 # Корзина
 router.register(r"cart", CartItemViewSet, basename="cartitem")
@@ -113,14 +113,8 @@ class CartItemViewSet(ModelViewSet):
         if new_qty < 1:
             return Response({"detail": "Quantity must be >= 1"}, status=400)
 
-        diff: int = new_qty - item.quantity
-
         try:
-            if diff > 0:
-                service.add(item.product, diff)
-            else:
-                for _ in range(abs(diff)):
-                    service.decrease(item.id)
+            service.set_quantity(item.id, new_qty)
         except ValidationError as e:
             return Response({"detail": str(e)}, status=400)
 
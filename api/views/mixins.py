@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from functools import partial, wraps
+from typing import Any, Callable
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def async_method_decorator(decorator: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    method_decorator для async-действий adrf.
+
+    Обёртка django.utils.decorators.method_decorator — синхронная функция
+    с пометкой «корутина», а adrf проверяет действие через
+    inspect.iscoroutinefunction (на Python < 3.12 пометку не видит).
+    """
+
+    def wrap(method: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(method)
+        async def wrapper(self: Any, request: Request, *args: Any, **kwargs: Any) -> Any:
+            bound = wraps(method)(partial(method, self))
+            return await decorator(bound)(request, *args, **kwargs)
+
+        return wrapper
+
+    return wrap
+
+
+class AsyncListModelMixin:
+    """
+    Async-действие list() для ViewSet на базе adrf.viewsets.GenericViewSet.
+
+    Выборка идёт через async ORM (async-итерация выполняет и prefetch_related),
+    поэтому под ASGI ожидание БД не занимает поток воркера. Фильтры и
+    пагинатор DRF синхронные — adrf вызывает их через sync_to_async.
+
+    Остальные действия ViewSet могут оставаться синхронными:
+    adrf выполняет их в пуле потоков.
+    """
+
+    async def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        queryset = await self.afilter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+
+        page = await self.apaginate_queryset(queryset)  # type: ignore[attr-defined]
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)  # type: ignore[attr-defined]
+            return await self.get_apaginated_response(serializer.data)  # type: ignore[attr-defined]
+
+        instances = [obj async for obj in queryset]
+        serializer = self.get_serializer(instances, many=True)  # type: ignore[attr-defined]
+        return Response(serializer.data)
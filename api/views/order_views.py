@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Type, Union
 
 from django.db.models import QuerySet
-from drf_spectacular.utils import OpenApiExample, OpenApiRequest, OpenApiResponse, extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiRequest, OpenApiResponse, extend_schema
 from rest_framework import permissions, status, viewsets
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from api.serializers.orders.order_serializers import OrderSerializer
-from orders.models import Order
+from orders import idempotency
+from orders.models import Order, OrderRecord
 from orders.services import create_order_from_cart
 
 
@@ -61,12 +63,16 @@ class OrderViewSet(viewsets.ModelViewSet):
             )
         },
     )
-    def get_queryset(self) -> QuerySet[Order]:
+    def get_queryset(self) -> Union[QuerySet[Order], QuerySet[OrderRecord]]:
         user = self.request.user
 
         if not user.is_authenticated:
             return Order.objects.none()
 
+        # Просмотр — вместе с архивными заказами (только чтение)
+        if self.request.method in permissions.SAFE_METHODS:
+            return Order.objects.with_archive().filter(user=user).order_by("-created_at")
+
         return Order.objects.filter(user=user).order_by("-created_at")
 
     # ----------------------------------------------------------------------
@@ -97,7 +103,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         },
     )
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        order: Order = self.get_object()
+        order: OrderRecord = self.get_object()
 
         if order.user_id != request.user.id:
             raise PermissionDenied("Вы не можете просматривать этот заказ.")
@@ -111,8 +117,20 @@ class OrderViewSet(viewsets.ModelViewSet):
         summary="Оформить заказ",
         description=(
             "Создаёт заказ на основе корзины (гостевой или пользовательской).\n\n"
-            "**В запросе:** full_name, email, phone, shipping_address, payment_method, comment\n"
+            "**В запросе:** full_name, email, phone, shipping_address, payment_method, comment\n\n"
+            "**Idempotency-Key:** повтор запроса с тем же ключом (ретрай после обрыва связи) "
+            "возвращает уже созданный заказ с заголовком `Idempotent-Replayed: true`, "
+            "не оформляя новый. Ключ действует сутки; тот же ключ с другими данными — 422.\n"
         ),
+        parameters=[
+            OpenApiParameter(
+                name="Idempotency-Key",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                required=False,
+                description="Уникальный ключ попытки оформления (например, UUID), до 255 символов.",
+            )
+        ],
         request=OpenApiRequest(
             request=Dict[str, Any],
             examples=[
@@ -135,11 +153,23 @@ class OrderViewSet(viewsets.ModelViewSet):
                 description="Заказ успешно создан.",
             ),
             400: OpenApiResponse(description="Ошибка оформления заказа."),
+            422: OpenApiResponse(description="Idempotency-Key уже использован для другого запроса."),
         },
     )
     def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         try:
-            order: Order = create_order_from_cart(request, request.data)
+            order, replayed = idempotency.run_once(
+                request,
+                idempotency.SCOPE_API,
+                idempotency.request_key(request),
+                request.data,
+                lambda: create_order_from_cart(request, request.data),
+            )
+        except idempotency.KeyReused as e:
+            return Response(
+                {"detail": e.messages[0]},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
         except Exception as e:
             return Response(
                 {"detail": str(e)},
@@ -147,4 +177,5 @@ class OrderViewSet(viewsets.ModelViewSet):
             )
 
         serializer = OrderSerializer(order)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, List, Type
+import datetime
+from typing import Any, List, Optional, Type
 
+from adrf.viewsets import GenericViewSet
 from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
@@ -10,7 +15,55 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from api.serializers.products.category_serializers import CategorySerializer
+from api.views.mixins import AsyncListModelMixin, async_method_decorator
+from products.edge_cache import edge_cache
 from products.models import Category
+from products.versioning import acategories_stamp, api_variant, async_condition, categories_stamp, make_etag
+
+
+def _categories_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+    return make_etag(categories_stamp(), api_variant(request))
+
+
+def _categories_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[datetime.datetime]:
+    return categories_stamp()
+
+
+async def _acategories_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+    return make_etag(await acategories_stamp(), api_variant(request))
+
+
+async def _acategories_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[datetime.datetime]:
+    return await acategories_stamp()
+
+
+# Список и карточка категории зависят только от таблицы категорий
+# (async-вариант — для списка AsyncCategoryViewSet)
+categories_condition = method_decorator(
+    condition(etag_func=_categories_etag, last_modified_func=_categories_last_modified)
+)
+categories_async_condition = async_method_decorator(
+    async_condition(etag_func=_acategories_etag, last_modified_func=_acategories_last_modified)
+)
+
+# Описание списка — общее для sync- и async-варианта ViewSet
+category_list_schema = extend_schema(
+    summary="Получить список категорий",
+    description=(
+        "Возвращает список всех категорий с одноуровневой структурой.\n\n"
+        "Каждая категория включает:\n"
+        "- `parent`: родитель\n"
+        "- `children`: дочерние категории\n\n"
+        "Пример использования:\n"
+        "`/api/categories/`"
+    ),
+    responses={
+        200: OpenApiResponse(
+            response=CategorySerializer(many=True),
+            description="Список категорий успешно получен.",
+        )
+    },
+)
 
 
 @extend_schema(
@@ -31,6 +84,8 @@ from products.models import Category
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для работы с категориями товаров.
+
+    Все действия синхронные; под ASGI регистрируется AsyncCategoryViewSet (api/urls.py).
     """
 
     serializer_class: Type[CategorySerializer] = CategorySerializer
@@ -43,23 +98,9 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     # ----------------------------------------------------------------------
     # LIST — список категорий
     # ----------------------------------------------------------------------
-    @extend_schema(
-        summary="Получить список категорий",
-        description=(
-            "Возвращает список всех категорий с одноуровневой структурой.\n\n"
-            "Каждая категория включает:\n"
-            "- `parent`: родитель\n"
-            "- `children`: дочерние категории\n\n"
-            "Пример использования:\n"
-            "`/api/categories/`"
-        ),
-        responses={
-            200: OpenApiResponse(
-                response=CategorySerializer(many=True),
-                description="Список категорий успешно получен.",
-            )
-        },
-    )
+    @category_list_schema
+    @method_decorator(edge_cache)
+    @categories_condition
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().list(request, *args, **kwargs)
 
@@ -77,5 +118,20 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
             404: OpenApiResponse(description="Категория не найдена."),
         },
     )
+    @method_decorator(edge_cache)
+    @categories_condition
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().retrieve(request, *args, **kwargs)
+
+
+class AsyncCategoryViewSet(AsyncListModelMixin, CategoryViewSet, GenericViewSet):
+    """
+    CategoryViewSet для ASGI (SERVER_MODE=asgi): список — async (adrf, async ORM),
+    карточка — синхронная (см. AsyncProductViewSet).
+    """
+
+    @category_list_schema
+    @async_method_decorator(edge_cache)
+    @categories_async_condition
+    async def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return await super().list(request, *args, **kwargs)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, List, Type
+import datetime
+from typing import Any, List, Optional, Type
 
+from adrf.viewsets import GenericViewSet
 from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import filters, viewsets
@@ -11,7 +16,54 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from api.serializers.products.product_serializers import ProductSerializer
+from api.views.mixins import AsyncListModelMixin, async_method_decorator
+from products.edge_cache import edge_cache
 from products.models import Product
+from products.versioning import acatalog_stamp, api_variant, async_condition, catalog_stamp, make_etag, product_stamp
+
+
+def _list_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+    return make_etag(catalog_stamp(), api_variant(request))
+
+
+def _list_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[datetime.datetime]:
+    return catalog_stamp()
+
+
+async def _alist_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+    return make_etag(await acatalog_stamp(), api_variant(request))
+
+
+async def _alist_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[datetime.datetime]:
+    return await acatalog_stamp()
+
+
+def _detail_etag(request: HttpRequest, slug: str, **kwargs: Any) -> Optional[str]:
+    return make_etag(product_stamp(slug), api_variant(request))
+
+
+def _detail_last_modified(request: HttpRequest, slug: str, **kwargs: Any) -> Optional[datetime.datetime]:
+    return product_stamp(slug)
+
+
+# Описание списка — общее для sync- и async-варианта ViewSet
+product_list_schema = extend_schema(
+    summary="Список товаров",
+    description=(
+        "Возвращает список товаров с поддержкой поиска, сортировки и фильтров.\n\n"
+        "**Примеры запросов:**\n"
+        "- `/api/products/?search=hop`\n"
+        "- `/api/products/?ordering=-price`\n"
+        "- `/api/products/?category__id=2`\n"
+        "- `/api/products/?price__gte=5&price__lte=20`"
+    ),
+    responses={
+        200: OpenApiResponse(
+            response=ProductSerializer(many=True),
+            description="Список товаров успешно получен.",
+        )
+    },
+)
 
 
 @extend_schema(
@@ -31,6 +83,8 @@ from products.models import Product
 class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API ViewSet для модели Product.
+
+    Все действия синхронные; под ASGI регистрируется AsyncProductViewSet (api/urls.py).
     """
 
     serializer_class: Type[ProductSerializer] = ProductSerializer
@@ -38,8 +92,12 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = "slug"
 
     # ---- queryset ----
+    # Всё, что читает сериализатор (включая parent/children категории), выбирается заранее:
+    # async list() (AsyncProductViewSet) не может догружать связи по ходу сериализации
     queryset: QuerySet[Product] = (
-        Product.objects.filter(is_active=True).select_related("category").prefetch_related("specifications")
+        Product.objects.filter(is_active=True)
+        .select_related("category__parent")
+        .prefetch_related("specifications", "category__children")
     )
 
     # ---- фильтры, сортировка, поиск ----
@@ -60,23 +118,9 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     # ----------------------------------------------------------------------
     # LIST endpoint
     # ----------------------------------------------------------------------
-    @extend_schema(
-        summary="Список товаров",
-        description=(
-            "Возвращает список товаров с поддержкой поиска, сортировки и фильтров.\n\n"
-            "**Примеры запросов:**\n"
-            "- `/api/products/?search=hop`\n"
-            "- `/api/products/?ordering=-price`\n"
-            "- `/api/products/?category__id=2`\n"
-            "- `/api/products/?price__gte=5&price__lte=20`"
-        ),
-        responses={
-            200: OpenApiResponse(
-                response=ProductSerializer(many=True),
-                description="Список товаров успешно получен.",
-            )
-        },
-    )
+    @product_list_schema
+    @method_decorator(edge_cache)
+    @method_decorator(condition(etag_func=_list_etag, last_modified_func=_list_last_modified))
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().list(request, *args, **kwargs)
 
@@ -94,5 +138,21 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
             404: OpenApiResponse(description="Товар не найден."),
         },
     )
+    @method_decorator(edge_cache)
+    @method_decorator(condition(etag_func=_detail_etag, last_modified_func=_detail_last_modified))
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().retrieve(request, *args, **kwargs)
+
+
+class AsyncProductViewSet(AsyncListModelMixin, ProductViewSet, GenericViewSet):
+    """
+    ProductViewSet для ASGI (SERVER_MODE=asgi): список — async (adrf, async ORM),
+    карточка — синхронная. GenericViewSet adrf в базах — его as_view() и dispatch()
+    обслуживают async-действия.
+    """
+
+    @product_list_schema
+    @async_method_decorator(edge_cache)
+    @async_method_decorator(async_condition(etag_func=_alist_etag, last_modified_func=_alist_last_modified))
+    async def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return await super().list(request, *args, **kwargs)
@@ -5,7 +5,7 @@ from rest_framework import permissions, viewsets
 from rest_framework.exceptions import ValidationError
 
 from api.serializers.review_serializers import ReviewSerializer
-from orders.models import Order
+from reviews.eligibility import get_eligibility
 from reviews.models import Review
 
 
@@ -122,18 +122,14 @@ class ReviewViewSet(viewsets.ModelViewSet):
         user = self.request.user
         product = serializer.validated_data["product"]
 
-        # Проверяем факт покупки
-        has_bought = Order.objects.filter(
-            user=user,
-            items__product=product,
-            status__in=["paid", "delivered"],
-        ).exists()
+        eligibility = get_eligibility(user)
 
-        if not has_bought:
+        # Проверяем факт покупки
+        if not eligibility.has_bought(product.pk):
             raise ValidationError("Оставлять отзывы могут только пользователи, " "которые покупали этот товар.")
 
         # Проверяем повторный отзыв
-        if Review.objects.filter(user=user, product=product).exists():
+        if eligibility.already_reviewed(product.pk):
             raise ValidationError("Вы уже оставили отзыв на этот товар.")
 
         serializer.save(user=user)
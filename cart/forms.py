@@ -62,7 +62,7 @@ class AddToCartForm(forms.Form):
             owner_filter = {"user": self.request.user}
         else:
             session_key = self.request.session.session_key
-            owner_filter = {"session_key": session_key}
+            owner_filter = {"session_key": session_key, "user__isnull": True}
 
         # Проверяем, есть ли уже CartItem для этого товара
         existing_item = CartItem.objects.filter(product=self.product, **owner_filter).first()
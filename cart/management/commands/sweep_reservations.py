@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from cart.reservations import SWEEP_BATCH_SIZE, sweep
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет истёкшие резервы товаров пачками — cart/reservations.py. "
+        "Истёкшие резервы и так не учитываются в остатке; команда только убирает строки."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SWEEP_BATCH_SIZE,
+            help=f"резервов в одном DELETE (по умолчанию {SWEEP_BATCH_SIZE})",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        started = time.monotonic()
+        deleted = sweep(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"✔ Expired reservations removed: {deleted} ({time.monotonic() - started:.1f}s)")
+        )
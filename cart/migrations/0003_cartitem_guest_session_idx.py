@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0002_alter_cartitem_product_alter_cartitem_quantity_and_more"),
+        ("products", "0004_product_catalog_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # Новые индексы создаются до удаления старых, покрытых ими
+    operations = [
+        migrations.AddIndex(
+            model_name="cartitem",
+            index=models.Index(
+                condition=models.Q(("user__isnull", True)), fields=["session_key"], name="cartitem_guest_session_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cartitem",
+            name="session_key",
+            field=models.CharField(
+                blank=True, help_text="Сессионный ключ гостевой корзины.", max_length=255, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0003_cartitem_guest_session_idx"),
+        ("products", "0007_productimageupload"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockReservation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "session_key",
+                    models.CharField(
+                        blank=True, help_text="Сессионный ключ гостевой корзины.", max_length=255, null=True
+                    ),
+                ),
+                ("quantity", models.PositiveIntegerField(help_text="Зарезервированное количество.")),
+                ("expires_at", models.DateTimeField(help_text="После этого момента резерв не учитывается.")),
+                (
+                    "product",
+                    models.ForeignKey(
+                        db_index=False,
+                        help_text="Зарезервированный товар.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reservations",
+                        to="products.product",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Владелец резерва. Null — если корзина гостевая.",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_reservations",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["product", "expires_at"], name="reservation_product_exp_idx"),
+                    models.Index(fields=["expires_at"], name="reservation_expires_idx"),
+                    models.Index(
+                        condition=models.Q(("user__isnull", True)),
+                        fields=["session_key"],
+                        name="reservation_guest_session_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("user", "product"), name="unique_user_reservation"),
+                    models.UniqueConstraint(fields=("session_key", "product"), name="unique_session_reservation"),
+                ],
+            },
+        ),
+    ]
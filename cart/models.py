@@ -49,11 +49,18 @@ class CartItem(models.Model):
         max_length=255,
         null=True,
         blank=True,
-        db_index=True,
         help_text="Сессионный ключ гостевой корзины.",
     )
 
     class Meta:
+        indexes = [
+            # Гостевая корзина: только строки без пользователя
+            models.Index(
+                fields=["session_key"],
+                condition=models.Q(user__isnull=True),
+                name="cartitem_guest_session_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["user", "product"],
@@ -72,3 +79,63 @@ class CartItem(models.Model):
     def total_price(self) -> Decimal:
         """Возвращает итоговую стоимость позиции."""
         return self.product.price * self.quantity
+
+
+class StockReservation(models.Model):
+    """
+    Резерв товара на время оформления заказа (cart/reservations.py).
+
+    Создаётся при переходе к оформлению на всё содержимое корзины и живёт
+    STOCK_RESERVATION_TTL секунд. Владелец — как у CartItem: пользователь
+    или гостевая сессия. Доступный остаток товара для остальных покупателей —
+    stock минус активные (не истёкшие) резервы.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="stock_reservations",
+        null=True,
+        blank=True,
+        help_text="Владелец резерва. Null — если корзина гостевая.",
+    )
+
+    session_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Сессионный ключ гостевой корзины.",
+    )
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="reservations",
+        help_text="Зарезервированный товар.",
+        # Индекс по product — префикс reservation_product_exp_idx
+        db_index=False,
+    )
+
+    quantity = models.PositiveIntegerField(help_text="Зарезервированное количество.")
+
+    expires_at = models.DateTimeField(help_text="После этого момента резерв не учитывается.")
+
+    class Meta:
+        indexes = [
+            # Сумма активных резервов товара: product = … AND expires_at > now()
+            models.Index(fields=["product", "expires_at"], name="reservation_product_exp_idx"),
+            # Пакетная очистка истёкших
+            models.Index(fields=["expires_at"], name="reservation_expires_idx"),
+            models.Index(
+                fields=["session_key"],
+                condition=models.Q(user__isnull=True),
+                name="reservation_guest_session_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "product"], name="unique_user_reservation"),
+            models.UniqueConstraint(fields=["session_key", "product"], name="unique_session_reservation"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.product_id} x {self.quantity} до {self.expires_at:%H:%M:%S}"
@@ -0,0 +1,84 @@
+"""
+Резервы товара на время оформления заказа.
+
+Без резерва остаток проверялся только в корзине и ещё раз при создании
+заказа: в распродажу ограниченного товара многие покупатели проходили
+корзину и получали отказ уже на оформлении, после ожидания блокировок.
+
+Теперь при переходе к оформлению (CartService.reserve) на содержимое
+корзины создаются резервы на STOCK_RESERVATION_TTL секунд — вставка строк
+без блокировки товаров. Доступный остаток — stock минус активные резервы
+других покупателей (available_stock): по нему работают корзина и списание
+при создании заказа; свой резерв покупателю не мешает. Заказ снимает
+резервы владельца, истёкшие просто перестают учитываться и удаляются
+пачками командой sweep_reservations.
+
+Резерв — не жёсткая гарантия: два одновременных резерва последних единиц
+могут пройти оба. Итог решает атомарное списание при создании заказа
+(UPDATE … WHERE доступный остаток >= количества) — оно не уводит остаток
+в минус и не отдаёт чужой активный резерв.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F, OuterRef, QuerySet, Subquery, Sum
+from django.db.models.expressions import CombinedExpression
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from products.models import Product
+
+from .models import StockReservation
+
+SWEEP_BATCH_SIZE = 5000
+
+
+def expires_at(now: Optional[datetime] = None) -> datetime:
+    return (now or timezone.now()) + timedelta(seconds=settings.STOCK_RESERVATION_TTL)
+
+
+def active_reservations() -> QuerySet[StockReservation]:
+    return StockReservation.objects.filter(expires_at__gt=timezone.now())
+
+
+def reserved_by_others(owner: Dict[str, Any], product_ref: str = "product_id") -> Coalesce:
+    """Сумма активных резервов товара OuterRef(product_ref), кроме резервов владельца owner (фильтр CartService)."""
+    total = (
+        active_reservations()
+        .filter(product_id=OuterRef(product_ref))
+        .exclude(**owner)
+        .order_by()
+        .values("product_id")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    return Coalesce(Subquery(total), 0)
+
+
+def available_stock(owner: Dict[str, Any], product_ref: str = "product_id") -> CombinedExpression:
+    """
+    Доступный владельцу остаток — выражение для условия UPDATE:
+    product_ref — поле со ссылкой на товар («product_id» у CartItem, «pk» у Product).
+    """
+    stock: Any = F("stock")
+    if product_ref != "pk":
+        stock = Subquery(Product.objects.filter(pk=OuterRef(product_ref)).values("stock")[:1])
+    return stock - reserved_by_others(owner, product_ref)
+
+
+def sweep(batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """Удаляет истёкшие резервы пачками (короткие DELETE по индексу expires_at); число удалённых."""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            StockReservation.objects.filter(expires_at__lte=now).order_by().values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += StockReservation.objects.filter(pk__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
@@ -8,21 +8,34 @@
 - получение содержимого корзины
 - проверку остатков
 - поддержку user/session_key
+- резерв товаров на время оформления заказа (cart/reservations.py)
+
+Количество меняется одним условным UPDATE («quantity = quantity + 1
+WHERE quantity + 1 <= доступный остаток»): остаток (stock минус чужие
+активные резервы) сверяется в самом запросе с текущим
+значением строки, без чтения в Python и без select_for_update. Двойной клик
+или параллельные вкладки не теряют изменения — каждый запрос прибавляет
+к уже записанному количеству; 0 изменённых строк — позиции нет или
+не хватает товара.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, List, Optional
 
 from django.core.exceptions import ValidationError
-from django.db import transaction
-from django.db.models import QuerySet
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.lookups import LessThanOrEqual
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 
-from cart.models import CartItem
+from cart import reservations
+from cart.models import CartItem, StockReservation
 from products.models import Product
 
+OUT_OF_STOCK = "Недостаточно товара на складе."
+
 
 class CartService:
     """
@@ -43,15 +56,48 @@ class CartService:
         self.session_key: str = request.session.session_key
         self.user = request.user if request.user.is_authenticated else None
 
+    @classmethod
+    async def afrom_request(cls, request: HttpRequest) -> CartService:
+        """
+        Конструктор для async-представлений: сессия и пользователь
+        загружаются через async-API (request.user в event loop недоступен).
+        """
+        if not request.session.session_key:
+            await request.session.acreate()
+
+        user = await request.auser()
+
+        service = cls.__new__(cls)
+        service.request = request
+        service.session_key = request.session.session_key
+        service.user = user if user.is_authenticated else None
+        return service
+
     # ---------------------------------------------
     # Вспомогательные методы
     # ---------------------------------------------
     def _owner_filter(self) -> Dict[str, Any]:
         """Фильтр для выборки CartItem владельца."""
+        if self.user:
+            return {"user": self.user}
+        # user IS NULL — условие частичного индекса cartitem_guest_session_idx
+        return {"session_key": self.session_key, "user__isnull": True}
+
+    def _owner_fields(self) -> Dict[str, Any]:
+        """Поля владельца для новой CartItem."""
         if self.user:
             return {"user": self.user}
         return {"session_key": self.session_key}
 
+    def _owned(self, item_id: int) -> QuerySet[CartItem]:
+        return CartItem.objects.filter(id=item_id, **self._owner_filter())
+
+    def _missing_or_out_of_stock(self, items: QuerySet[CartItem]) -> Exception:
+        """Почему условный UPDATE не изменил строку: позиции нет (как _get_cart_item) или не хватает товара."""
+        if not items.exists():
+            return CartItem.DoesNotExist("CartItem matching query does not exist.")
+        return ValidationError(OUT_OF_STOCK)
+
     def _get_cart_item(self, item_id: int) -> CartItem:
         """Получить CartItem владельца или ошибку."""
         return CartItem.objects.get(id=item_id, **self._owner_filter())
@@ -74,11 +120,16 @@ class CartService:
         """
         return CartItem.objects.filter(**self._owner_filter()).select_related("product")
 
-    def get_total(self) -> float:
-        """Посчитать итоговую сумму корзины."""
-        return float(sum(item.total_price for item in self.get_items()))
+    async def aget_items(self) -> List[CartItem]:
+        """get_items() для async-представлений: выборка через async ORM."""
+        return [item async for item in self.get_items_queryset()]
+
+    def get_total(self, items: Optional[Iterable[CartItem]] = None) -> float:
+        """Посчитать итоговую сумму корзины (или уже выбранных позиций items)."""
+        if items is None:
+            items = self.get_items()
+        return float(sum(item.total_price for item in items))
 
-    @transaction.atomic
     def add(self, product: Product, quantity: int) -> CartItem:
         """
         Добавление товара в корзину.
@@ -86,46 +137,96 @@ class CartService:
         - Если нет > создать новую запись
         """
         owner = self._owner_filter()
-
-        item, created = CartItem.objects.select_for_update().get_or_create(
-            product=product,
-            defaults={"quantity": quantity, **owner},
-            **owner,
-        )
-
-        if not created:
-            new_qty = item.quantity + quantity
-            if new_qty > product.stock:
-                raise ValidationError("Недостаточно товара на складе.")
-            item.quantity = new_qty
-            item.save()
-
+        items = CartItem.objects.filter(product=product, **owner)
+        fits = LessThanOrEqual(F("quantity") + quantity, reservations.available_stock(owner))
+
+        if not items.filter(fits).update(quantity=F("quantity") + quantity):
+            available = (
+                Product.objects.filter(pk=product.pk)
+                .values_list(reservations.available_stock(owner, "pk"), flat=True)
+                .first()
+            )
+            if available is None or quantity > available:
+                raise ValidationError(OUT_OF_STOCK)
+            try:
+                # Савепоинт: позицию могла создать параллельная вкладка
+                with transaction.atomic():
+                    return CartItem.objects.create(product=product, quantity=quantity, **self._owner_fields())
+            except IntegrityError:
+                pass
+            # Позиция уже есть — прибавляем к ней (или её количество упёрлось в остаток)
+            if not items.filter(fits).update(quantity=F("quantity") + quantity):
+                raise ValidationError(OUT_OF_STOCK)
+
+        item = items.get()
+        item.product = product
         return item
 
-    @transaction.atomic
     def increase(self, item_id: int) -> None:
         """Увеличить количество на 1."""
-        item = self._get_cart_item(item_id)
-
-        if item.quantity + 1 > item.product.stock:
-            raise ValidationError("Недостаточно товара на складе.")
-
-        item.quantity += 1
-        item.save()
+        items = self._owned(item_id)
+        fits = LessThanOrEqual(F("quantity") + 1, reservations.available_stock(self._owner_filter()))
+        if not items.filter(fits).update(quantity=F("quantity") + 1):
+            raise self._missing_or_out_of_stock(items)
 
-    @transaction.atomic
     def decrease(self, item_id: int) -> None:
         """
         Уменьшить количество на 1.
         Если количество становится 0 — удаляем позицию.
         """
-        item = self._get_cart_item(item_id)
+        items = self._owned(item_id)
+        while not items.filter(quantity__gt=1).update(quantity=F("quantity") - 1):
+            # Последняя единица: удаляем, только если её не успели увеличить
+            deleted, _ = items.filter(quantity__lte=1).delete()
+            if deleted:
+                return
+            if not items.exists():
+                raise CartItem.DoesNotExist("CartItem matching query does not exist.")
+
+    def set_quantity(self, item_id: int, quantity: int) -> None:
+        """
+        Установить количество позиции (API). Уменьшение разрешено всегда,
+        увеличение — в пределах остатка.
+        """
+        items = self._owned(item_id)
+        available = reservations.available_stock(self._owner_filter())
+        allowed = Q(LessThanOrEqual(Value(quantity), available)) | Q(quantity__gte=quantity)
+        if not items.filter(allowed).update(quantity=quantity):
+            raise self._missing_or_out_of_stock(items)
+
+    def reserve(self) -> None:
+        """
+        Резерв содержимого корзины на STOCK_RESERVATION_TTL — при переходе
+        к оформлению. Прежние резервы владельца заменяются; если чего-то
+        не хватает — ValidationError со списком товаров, резервы не меняются.
 
-        if item.quantity > 1:
-            item.quantity -= 1
-            item.save()
-        else:
-            item.delete()
+        Действующий резерв на то же содержимое корзины не продлевается:
+        перезагрузкой страницы оформления товар нельзя держать бесконечно.
+        Новый резерв — если корзина изменилась или прежний истёк.
+        """
+        owner = self._owner_filter()
+        items = list(self.get_items_queryset().annotate(available=reservations.available_stock(owner)))
+
+        short = [item.product.name for item in items if item.quantity > item.available]
+        if short:
+            raise ValidationError(f"Недостаточно товара: {', '.join(short)}")
+
+        held = set(reservations.active_reservations().filter(**owner).values_list("product_id", "quantity"))
+        if held == {(item.product_id, item.quantity) for item in items}:
+            return
+
+        expires_at = reservations.expires_at()
+        with transaction.atomic():
+            StockReservation.objects.filter(**owner).delete()
+            StockReservation.objects.bulk_create(
+                StockReservation(
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    expires_at=expires_at,
+                    **self._owner_fields(),
+                )
+                for item in items
+            )
 
     def remove(self, item_id: int) -> None:
         """Удаление товара из корзины."""
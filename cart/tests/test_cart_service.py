@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from cart.models import CartItem
+from cart.services import CartService
+from products.models import Product
+
+
+def _service(user: Any) -> CartService:
+    request = RequestFactory().post("/cart/")
+    request.session = SessionStore()
+    request.user = user
+    return CartService(request)
+
+
+def _in_threads(workers: int, calls: int, action: Callable[[], Any]) -> List[Exception]:
+    """workers потоков одновременно выполняют action по calls раз; ошибки — списком."""
+    barrier = threading.Barrier(workers)
+    errors: List[Exception] = []
+
+    def run() -> None:
+        try:
+            barrier.wait()
+            for _ in range(calls):
+                try:
+                    action()
+                except ValidationError as exc:
+                    errors.append(exc)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(workers) as pool:
+        for future in [pool.submit(run) for _ in range(workers)]:
+            future.result()
+    return errors
+
+
+# ---------------------------------------------------------
+# 1. Условные UPDATE: остаток проверяется в запросе, без блокировок
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_conditional_updates(user_fixture: Any, product_fixture: Product) -> None:
+    service = _service(user_fixture)
+    item = service.add(product_fixture, 9)
+
+    with CaptureQueriesContext(connection) as queries:
+        service.increase(item.pk)
+    assert len(queries) == 1
+    assert "FOR UPDATE" not in queries[0]["sql"]
+
+    with pytest.raises(ValidationError):
+        service.increase(item.pk)
+    with pytest.raises(ValidationError):
+        service.add(product_fixture, 1)
+    assert CartItem.objects.get().quantity == 10
+
+    # Остаток уменьшился: увеличить нельзя, уменьшить — можно
+    Product.objects.filter(pk=product_fixture.pk).update(stock=3)
+    with pytest.raises(ValidationError):
+        service.set_quantity(item.pk, 11)
+    service.set_quantity(item.pk, 4)
+    with pytest.raises(ValidationError):
+        service.set_quantity(item.pk, 5)
+
+    for _ in range(4):
+        service.decrease(item.pk)
+    assert not CartItem.objects.exists()
+    with pytest.raises(CartItem.DoesNotExist):
+        service.increase(item.pk)
+
+
+# ---------------------------------------------------------
+# 2. Параллельные изменения: ни одно не теряется, остаток не превышается
+# ---------------------------------------------------------
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_updates_are_not_lost(user_fixture: Any, product_fixture: Product) -> None:
+    if connection.vendor != "postgresql":
+        pytest.skip("параллельная запись — только на PostgreSQL")
+
+    Product.objects.filter(pk=product_fixture.pk).update(stock=1000)
+    product_fixture.refresh_from_db()
+
+    # Новая позиция из 8 вкладок сразу: одна строка, все добавления учтены
+    errors = _in_threads(8, 5, lambda: _service(user_fixture).add(product_fixture, 2))
+    assert errors == []
+    item = CartItem.objects.get()
+    assert item.quantity == 8 * 5 * 2
+
+    errors = _in_threads(8, 25, lambda: _service(user_fixture).increase(item.pk))
+    assert errors == []
+    item.refresh_from_db()
+    assert item.quantity == 80 + 8 * 25
+
+    # Упор в остаток: ровно stock, лишние увеличения отклонены
+    Product.objects.filter(pk=product_fixture.pk).update(stock=300)
+    errors = _in_threads(8, 25, lambda: _service(user_fixture).increase(item.pk))
+    item.refresh_from_db()
+    assert item.quantity == 300
+    assert len(errors) == 8 * 25 - 20
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, List
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from cart.models import CartItem, StockReservation
+from cart.services import CartService
+from orders.models import Order
+from orders.services import create_order_from_cart
+from products.models import Product
+
+FORM = {"full_name": "Buyer", "email": "b@b.io", "phone": "1", "shipping_address": "Street", "payment_method": "cash"}
+
+
+def _request(user: Any) -> Any:
+    request = RequestFactory().post("/checkout/")
+    request.session = SessionStore()
+    request.user = user
+    return request
+
+
+@pytest.fixture
+def buyer(django_user_model: Any) -> Any:
+    return django_user_model.objects.create_user(username="buyer", password="x")
+
+
+# ---------------------------------------------------------
+# 1. Резерв при открытии оформления: чужой резерв уменьшает доступный
+#    остаток корзины, истёкший не учитывается и удаляется командой
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_checkout_page_reserves_cart(
+    client_web: Client, user_fixture: Any, buyer: Any, product_fixture: Product
+) -> None:
+    CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=7)
+    client_web.force_login(user_fixture)
+
+    response = client_web.get(reverse("orders:checkout"))
+    assert response.status_code == 200 and "error" not in response.context
+    hold = StockReservation.objects.get()
+    assert (hold.user, hold.quantity) == (user_fixture, 7)
+
+    # Повторное открытие не продлевает действующий резерв и не добавляет второй
+    client_web.get(reverse("orders:checkout"))
+    assert StockReservation.objects.values_list("pk", "quantity", "expires_at").get() == (hold.pk, 7, hold.expires_at)
+
+    other = CartService(_request(buyer))
+    with pytest.raises(ValidationError):
+        other.add(product_fixture, 4)
+    item = other.add(product_fixture, 3)
+    with pytest.raises(ValidationError):
+        other.increase(item.pk)
+    # Остаток уменьшили: 3 в корзине уже не покрыть, резерв не создаётся
+    Product.objects.filter(pk=product_fixture.pk).update(stock=9)
+    with pytest.raises(ValidationError, match="Недостаточно товара"):
+        other.reserve()
+    assert StockReservation.objects.count() == 1
+
+    StockReservation.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+    other.increase(item.pk)
+    other.reserve()
+
+    out = io.StringIO()
+    call_command("sweep_reservations", stdout=out)
+    assert "removed: 1" in out.getvalue()
+    assert list(StockReservation.objects.values_list("user", "quantity")) == [(buyer.pk, 4)]
+
+
+# ---------------------------------------------------------
+# 2. Оформление: свой резерв не мешает, чужой — защищён; резервы снимаются
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_order_respects_reservations(user_fixture: Any, buyer: Any, product_fixture: Product) -> None:
+    CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=6)
+    CartItem.objects.create(user=buyer, product=product_fixture, quantity=5)
+    CartService(_request(user_fixture)).reserve()
+
+    # 10 на складе, 6 в чужом резерве: 5 списать нельзя
+    with pytest.raises(ValidationError):
+        create_order_from_cart(_request(buyer), FORM)
+    assert not Order.objects.exists()
+
+    order = create_order_from_cart(_request(user_fixture), FORM)
+    assert order.items.get().quantity == 6
+    assert Product.objects.get(pk=product_fixture.pk).stock == 4
+    assert not StockReservation.objects.exists()
+    assert not CartItem.objects.filter(user=user_fixture).exists()
+
+
+# ---------------------------------------------------------
+# 3. Распродажа: параллельные заказы не уводят остаток в минус
+# ---------------------------------------------------------
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_checkouts_never_oversell(django_user_model: Any, product_fixture: Product) -> None:
+    if connection.vendor != "postgresql":
+        pytest.skip("параллельная запись — только на PostgreSQL")
+
+    Product.objects.filter(pk=product_fixture.pk).update(stock=5)
+    buyers = [django_user_model.objects.create_user(username=f"buyer{i}", password="x") for i in range(12)]
+    CartItem.objects.bulk_create(CartItem(user=user, product=product_fixture, quantity=1) for user in buyers)
+
+    barrier = threading.Barrier(len(buyers))
+    failed: List[str] = []
+
+    def checkout(user: Any) -> None:
+        try:
+            barrier.wait()
+            create_order_from_cart(_request(user), FORM)
+        except ValidationError as exc:
+            failed.append(exc.messages[0])
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(len(buyers)) as pool:
+        for future in [pool.submit(checkout, user) for user in buyers]:
+            future.result()
+
+    assert Order.objects.count() == 5
+    assert Product.objects.get(pk=product_fixture.pk).stock == 0
+    assert failed == ["Недостаточно товара"] * 7
+
+
+# ---------------------------------------------------------
+# 4. Резерв заменяется, только если корзина изменилась или он истёк
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_reserve_renews_only_changed_or_expired(user_fixture: Any, product_fixture: Product) -> None:
+    item = CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=2)
+    service = CartService(_request(user_fixture))
+    service.reserve()
+    hold = StockReservation.objects.get()
+
+    service.reserve()
+    assert StockReservation.objects.get().expires_at == hold.expires_at
+
+    CartItem.objects.filter(pk=item.pk).update(quantity=3)
+    service.reserve()
+    changed = StockReservation.objects.get()
+    assert changed.quantity == 3 and changed.pk != hold.pk
+
+    StockReservation.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+    service.reserve()
+    renewed = StockReservation.objects.get()
+    assert renewed.quantity == 3 and renewed.expires_at > timezone.now()
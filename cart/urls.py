@@ -1,11 +1,15 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
 app_name = "cart"
 
+# Async-вариант страницы корзины — только под ASGI (см. products/urls.py)
+cart_detail = views.acart_detail if settings.SERVER_MODE == "asgi" else views.cart_detail
+
 urlpatterns = [
-    path("", views.cart_detail, name="detail"),
+    path("", cart_detail, name="detail"),
     path("add/<int:product_id>/", views.add_to_cart, name="add"),
     path("remove/<int:item_id>/", views.remove_from_cart, name="remove"),
     path("increase/<int:item_id>/", views.increase_quantity, name="increase"),
@@ -19,6 +19,7 @@ from typing import Any, Dict
 from django.contrib import messages
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.response import TemplateResponse
 from django.views.decorators.http import require_POST
 
 from products.models import Product
@@ -132,7 +133,7 @@ def cart_detail(request: HttpRequest) -> HttpResponse:
     """
     service = CartService(request)
     items = service.get_items()
-    total = service.get_total()
+    total = service.get_total(items)
 
     context: Dict[str, Any] = {
         "items": items,
@@ -140,3 +141,23 @@ def cart_detail(request: HttpRequest) -> HttpResponse:
     }
 
     return render(request, "cart/cart_detail.html", context)
+
+
+async def acart_detail(request: HttpRequest) -> HttpResponse:
+    """
+    cart_detail для ASGI (SERVER_MODE=asgi, см. cart/urls.py).
+
+    Корзина читается через async ORM. TemplateResponse, а не render():
+    шаблон рендерится обработчиком Django вне event loop
+    (контекст-процессоры обращаются к request.user синхронно).
+    """
+    service = await CartService.afrom_request(request)
+    items = await service.aget_items()
+    total = service.get_total(items)
+
+    context: Dict[str, Any] = {
+        "items": items,
+        "total": total,
+    }
+
+    return TemplateResponse(request, "cart/cart_detail.html", context)
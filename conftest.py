@@ -1,12 +1,33 @@
 import pytest
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import Client
 from django.urls import reverse
 from rest_framework.test import APIClient
 
+from main.cache import cache_config
 from products.models import Category, Product
 from reviews.models import Review
 
+# Тесты идут в одном процессе: кеш в памяти, без таблицы django_cache —
+# проверки числа запросов считают только запросы самого приложения
+settings.CACHES = {"default": cache_config("locmem://")}
+
+# ======================================================================
+# CACHE
+# ======================================================================
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кеш не откатывается вместе с транзакцией теста — чистим его явно."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 # ======================================================================
 # USERS
 # ======================================================================
@@ -236,3 +257,41 @@ def user_cart_item_fixture(db, user_fixture, product_fixture):
 @pytest.fixture
 def client_web(db):
     return Client()
+
+
+# ======================================================================
+# QUERY PLANS
+# ======================================================================
+
+
+def _is_full_scan(line, table):
+    """Строка плана — полное чтение таблицы (PostgreSQL Seq Scan, SQLite SCAN без индекса)."""
+    if f"Seq Scan on {table}" in line:
+        return True
+    return f"SCAN {table}" in line and "INDEX" not in line
+
+
+@pytest.fixture
+def assert_index_scan(db):
+    """
+    EXPLAIN запроса: таблица table читается по индексу, без полного сканирования.
+
+    PostgreSQL на маленькой тестовой таблице предпочёл бы Seq Scan, поэтому он
+    запрещается (enable_seqscan = off до конца тестовой транзакции): если
+    подходящего индекса нет, план всё равно покажет Seq Scan. SQLite получает
+    статистику по засеянным данным (ANALYZE). Возвращает текст плана.
+    """
+
+    def check(queryset, table):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            elif connection.vendor == "sqlite":
+                cursor.execute("ANALYZE")
+
+        plan = queryset.explain()
+        full_scans = [line for line in plan.splitlines() if _is_full_scan(line, table)]
+        assert not full_scans, f"{table}: полное сканирование таблицы\n{plan}"
+        return plan
+
+    return check
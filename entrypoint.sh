@@ -10,7 +10,7 @@ if [ -n "${POSTGRES_HOST:-}" ]; then
   echo "Waiting for Postgres at ${POSTGRES_HOST}:${POSTGRES_PORT:-5432}..."
   until python - <<'PY'
 import os, sys
-import psycopg2
+import psycopg
 
 host = os.getenv("POSTGRES_HOST", "db")
 port = int(os.getenv("POSTGRES_PORT", "5432"))
@@ -19,7 +19,7 @@ user = os.getenv("POSTGRES_USER", "hopbarley")
 pwd  = os.getenv("POSTGRES_PASSWORD", "hopbarley")
 
 try:
-    psycopg2.connect(host=host, port=port, dbname=db, user=user, password=pwd).close()
+    psycopg.connect(host=host, port=port, dbname=db, user=user, password=pwd).close()
 except Exception:
     sys.exit(1)
 sys.exit(0)
@@ -32,8 +32,12 @@ fi
 # -------------------------------------------------------------------
 # Django
 # -------------------------------------------------------------------
-python manage.py migrate
+# Без statement_timeout: миграции на больших таблицах дольше веб-запроса
+DB_STATEMENT_TIMEOUT_MS=0 python manage.py migrate
+# Таблица общего кеша (CACHE_URL=db://, main/cache.py); существующую не трогает
+python manage.py createcachetable
 python manage.py collectstatic --noinput
+python manage.py build_openapi
 
 # -------------------------------------------------------------------
 # Подготовка MEDIA для картинок товаров
@@ -55,6 +59,8 @@ if [ "${LOAD_FIXTURES:-0}" = "1" ]; then
     python manage.py loaddata products/fixtures/products.json
     python manage.py loaddata users/fixtures/test_database.json
     python manage.py loaddata cart/fixtures/cart_items_test.json
+    # loaddata не вызывает Product.save: теги фикстур строим явно
+    python manage.py backfill_product_tags
     echo "Fixtures loaded."
   fi
 
@@ -65,6 +71,12 @@ if [ "${LOAD_FIXTURES:-0}" = "1" ]; then
   python manage.py print_jwt
 fi
 
+# Производные изображений товаров (размеры, WebP / AVIF), которых ещё нет
+python manage.py build_product_images
+
+# Загрузки изображений, не обработанные до перезапуска (products/image_queue.py)
+python manage.py process_image_uploads
+
 # -------------------------------------------------------------------
 # Запускаем команду из docker-compose
 # -------------------------------------------------------------------
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.apps import AppConfig
+
+
+class GraphqlApiConfig(AppConfig):
+    """
+    Конфигурация приложения graphql_api.
+    Подключает сигналы инвалидации кеша результатов каталога.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "graphql_api"
+
+    def ready(self) -> None:
+        # Импортируем сигналы ради side-effect, поэтому noqa
+        import graphql_api.signals  # noqa: F401
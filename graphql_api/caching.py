@@ -0,0 +1,111 @@
+"""
+Кеш результатов публичных запросов каталога.
+
+Операция кешируется целиком, если на корневом уровне она запрашивает
+только публичные поля (PUBLIC_QUERY_FIELDS) — их ответ одинаков для всех
+пользователей. Поля пользователя (cart, myOrders, me, ...) в такую
+операцию не входят, поэтому всегда выполняются заново.
+
+Ключ: версия каталога + хеш документа + имя операции + переменные.
+Любая запись Product / Category / ProductSpecification / Review увеличивает
+версию каталога (graphql_api/signals.py), и старые записи перестают
+использоваться (удаляются по TIMEOUT).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+if TYPE_CHECKING:
+    from graphql import OperationDefinitionNode
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": 60,
+}
+
+# Корневые поля, ответ которых не зависит от пользователя
+PUBLIC_QUERY_FIELDS = frozenset({"allProducts", "product", "categories", "productReviews"})
+
+VERSION_KEY = "graphql:catalog:version"
+RESULT_KEY_PREFIX = "graphql:result:"
+
+
+def get_result_cache_setting(name: str) -> Any:
+    """Значение из settings.GRAPHQL_RESULT_CACHE (или значение по умолчанию)."""
+    configured: Dict[str, Any] = getattr(settings, "GRAPHQL_RESULT_CACHE", {})
+    return configured.get(name, DEFAULT_SETTINGS[name])
+
+
+def _cache() -> BaseCache:
+    return caches[get_result_cache_setting("CACHE_ALIAS")]
+
+
+def is_public_operation(operation: Optional[OperationDefinitionNode]) -> bool:
+    """
+    True, если операция — query и запрашивает только публичные поля каталога.
+    Фрагменты на корневом уровне не разбираем — считаем такую операцию приватной.
+    """
+    # graphql-core импортируем здесь: модуль загружается при старте (signals.py),
+    # а сам GraphQL — только при первом запросе
+    from graphql import FieldNode, OperationType
+
+    if operation is None or operation.operation != OperationType.QUERY:
+        return False
+
+    selections = operation.selection_set.selections
+    return bool(selections) and all(
+        isinstance(selection, FieldNode)
+        and (selection.name.value in PUBLIC_QUERY_FIELDS or selection.name.value == "__typename")
+        for selection in selections
+    )
+
+
+# ======================================================================
+# ВЕРСИЯ КАТАЛОГА
+# ======================================================================
+def get_catalog_version() -> int:
+    cache = _cache()
+    version: Optional[int] = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return int(version)  # type: ignore[arg-type]
+
+
+def bump_catalog_version() -> None:
+    """Инвалидирует все закешированные результаты каталога."""
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Ключа нет (первая запись или кеш очищен) — начинаем новую версию
+        cache.add(VERSION_KEY, 1, None)
+        cache.incr(VERSION_KEY)
+
+
+# ======================================================================
+# РЕЗУЛЬТАТЫ
+# ======================================================================
+def result_cache_key(
+    document_key: str,
+    operation_name: Optional[str],
+    variables: Optional[Dict[str, Any]],
+) -> str:
+    arguments = json.dumps([operation_name, variables or {}], sort_keys=True, default=str)
+    digest = hashlib.sha256(f"{document_key}:{arguments}".encode("utf-8")).hexdigest()
+    return f"{RESULT_KEY_PREFIX}{get_catalog_version()}:{digest}"
+
+
+def get_cached_result(key: str) -> Optional[Dict[str, Any]]:
+    data: Optional[Dict[str, Any]] = _cache().get(key)
+    return data
+
+
+def set_cached_result(key: str, data: Dict[str, Any]) -> None:
+    _cache().set(key, data, get_result_cache_setting("TIMEOUT"))
@@ -0,0 +1,87 @@
+"""
+Relay-connections с keyset-пагинацией.
+
+Курсоры и условие «строго после курсора» — main/keyset.py: следующая
+страница выбирается не OFFSET, стоимость запроса не растёт с номером
+страницы.
+
+Размер страницы ограничен MAX_PAGE_SIZE (graphql_api/validation.py).
+totalCount считается отдельным COUNT(*) и только если поле запрошено.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Type
+
+import graphene
+from django.db.models import QuerySet
+from graphene import ResolveInfo
+
+from graphql_api.dataloaders import mark_siblings
+from graphql_api.validation import clamp_page_size
+from main.keyset import after_filter, decode_cursor, encode_cursor
+
+DEFAULT_PAGE_SIZE = 20
+
+
+class CountableConnection(graphene.relay.Connection):
+    """Connection с полем totalCount."""
+
+    class Meta:
+        abstract = True
+
+    total_count = graphene.Int(description="Total number of items (computed only when requested).")
+
+    def resolve_total_count(self, info: ResolveInfo) -> int:
+        # iterable — исходный QuerySet без курсора и LIMIT
+        return int(self.iterable.count())
+
+
+def connection_args() -> Dict[str, Any]:
+    """Аргументы прямой пагинации для connection-полей."""
+    return {
+        "first": graphene.Int(default_value=DEFAULT_PAGE_SIZE, description="Page size."),
+        "after": graphene.String(description="Cursor of the last item of the previous page."),
+    }
+
+
+# ======================================================================
+# CONNECTION
+# ======================================================================
+def keyset_connection(
+    connection_type: Type[CountableConnection],
+    queryset: QuerySet[Any],
+    ordering: Sequence[str],
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> CountableConnection:
+    """
+    Страница queryset в виде connection_type.
+
+    ordering должен однозначно упорядочивать строки — последним полем
+    всегда идёт pk.
+    """
+    page_size = clamp_page_size(first)
+
+    page_qs = queryset.order_by(*ordering)
+    if after:
+        page_qs = page_qs.filter(after_filter(ordering, decode_cursor(after, ordering, queryset.model)))
+
+    # Лишняя строка показывает, есть ли следующая страница
+    rows = list(page_qs[: page_size + 1])
+    has_next_page = len(rows) > page_size
+    nodes = mark_siblings(rows[:page_size])
+
+    edges = [connection_type.Edge(node=node, cursor=encode_cursor(node, ordering)) for node in nodes]
+    connection = connection_type(
+        edges=edges,
+        page_info=graphene.relay.PageInfo(
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            has_next_page=has_next_page,
+            # Назад не листаем; наличие курсора означает, что до страницы что-то было
+            has_previous_page=bool(after),
+        ),
+    )
+    connection.iterable = queryset
+    return connection
@@ -0,0 +1,202 @@
+"""
+Per-request DataLoader-слой для GraphQL.
+
+graphql-core 3 в синхронном режиме разрешает поля «в глубину»: сначала
+целиком один объект списка, потом следующий. Классический DataLoader
+(очередь ключей + отложенный dispatch) в таком режиме не батчит ничего.
+
+Поэтому здесь используется «группа соседей»: каждый объект, полученный
+одним SQL-запросом, помнит весь список, в котором он пришёл. При первом
+обращении к связи любого объекта загрузчик подгружает эту связь сразу
+для всей группы (по PK или FK) и кеширует результат до конца запроса.
+
+Итог: один SQL-запрос на уровень вложенности, независимо от длины списков.
+Загрузчики живут на `info.context` (HttpRequest), т.е. не пересекаются
+между запросами.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from django.db import models
+from graphene import ResolveInfo
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+SIBLINGS_ATTR = "_graphql_siblings"
+CONTEXT_ATTR = "graphql_loaders"
+
+
+# ======================================================================
+# SIBLING GROUPS
+# ======================================================================
+def mark_siblings(instances: Iterable[Any]) -> List[Any]:
+    """
+    Вычисляет instances (QuerySet или список) и помечает каждый объект
+    общей группой соседей. Возвращает список — его можно отдавать из резолвера.
+    """
+    group = [obj for obj in instances if obj is not None]
+    for obj in group:
+        setattr(obj, SIBLINGS_ATTR, group)
+    return group
+
+
+def _siblings(obj: models.Model) -> List[Any]:
+    return getattr(obj, SIBLINGS_ATTR, None) or [obj]
+
+
+# ======================================================================
+# DATALOADER
+# ======================================================================
+class DataLoader(Generic[K, V]):
+    """
+    Синхронный загрузчик с кешем на время одного запроса.
+
+    batch_load_fn получает ключи, которых ещё нет в кеше, и возвращает
+    словарь {ключ: значение}. Ненайденные ключи получают default().
+    """
+
+    def __init__(
+        self,
+        batch_load_fn: Callable[[List[K]], Dict[K, V]],
+        default: Callable[[], Optional[V]] = lambda: None,
+    ) -> None:
+        self.batch_load_fn = batch_load_fn
+        self.default = default
+        self._cache: Dict[K, Optional[V]] = {}
+
+    def load_many(self, keys: Iterable[Optional[K]]) -> List[Optional[V]]:
+        keys = list(keys)
+        missing = [key for key in dict.fromkeys(keys) if key is not None and key not in self._cache]
+
+        if missing:
+            loaded = self.batch_load_fn(missing)
+            for key in missing:
+                self._cache[key] = loaded[key] if key in loaded else self.default()
+
+        return [self._cache[key] if key is not None else None for key in keys]
+
+    def load(self, key: Optional[K], batch_keys: Iterable[Optional[K]] = ()) -> Optional[V]:
+        """
+        Возвращает значение для key. Если его нет в кеше — догружает
+        одним запросом вместе с batch_keys (ключами соседей).
+        """
+        if key is None:
+            return None
+        if key not in self._cache:
+            self.load_many([key, *batch_keys])
+        return self._cache[key]
+
+    def prime(self, key: K, value: V) -> None:
+        self._cache.setdefault(key, value)
+
+
+# ======================================================================
+# BATCH FUNCTIONS
+# ======================================================================
+def _batch_by_pk(model: Type[models.Model]) -> Callable[[List[Any]], Dict[Any, Any]]:
+    def batch(keys: List[Any]) -> Dict[Any, Any]:
+        objects = model._default_manager.in_bulk(keys)
+        mark_siblings(objects.values())
+        return objects
+
+    return batch
+
+
+def _batch_by_fk(
+    model: Type[models.Model],
+    fk_attname: str,
+    unique: bool,
+) -> Callable[[List[Any]], Dict[Any, Any]]:
+    def batch(keys: List[Any]) -> Dict[Any, Any]:
+        qs = model._default_manager.filter(**{f"{fk_attname}__in": keys})
+        if not model._meta.ordering:
+            qs = qs.order_by("pk")
+
+        objects = mark_siblings(qs)
+
+        if unique:
+            return {getattr(obj, fk_attname): obj for obj in objects}
+
+        grouped: Dict[Any, List[Any]] = defaultdict(list)
+        for obj in objects:
+            grouped[getattr(obj, fk_attname)].append(obj)
+        return grouped
+
+    return batch
+
+
+class Loaders:
+    """
+    Набор загрузчиков одного запроса. Создаются лениво на каждую связь:
+    - by_pk(model) — объекты по первичному ключу (ForeignKey / OneToOne)
+    - by_fk(model, fk) — объекты по внешнему ключу (обратные связи)
+    """
+
+    def __init__(self) -> None:
+        self._loaders: Dict[Tuple[Any, ...], DataLoader[Any, Any]] = {}
+
+    def by_pk(self, model: Type[models.Model]) -> DataLoader[Any, Any]:
+        key = ("pk", model)
+        if key not in self._loaders:
+            self._loaders[key] = DataLoader(_batch_by_pk(model))
+        return self._loaders[key]
+
+    def by_fk(self, model: Type[models.Model], fk_attname: str, unique: bool = False) -> DataLoader[Any, Any]:
+        key = ("fk", model, fk_attname)
+        if key not in self._loaders:
+            self._loaders[key] = DataLoader(
+                _batch_by_fk(model, fk_attname, unique),
+                default=(lambda: None) if unique else list,
+            )
+        return self._loaders[key]
+
+
+def get_loaders(info: ResolveInfo) -> Loaders:
+    """Загрузчики текущего запроса (создаются при первом обращении)."""
+    context = info.context
+    loaders: Optional[Loaders] = getattr(context, CONTEXT_ATTR, None)
+    if loaders is None:
+        loaders = Loaders()
+        setattr(context, CONTEXT_ATTR, loaders)
+    return loaders
+
+
+# ======================================================================
+# RESOLVER HELPERS
+# ======================================================================
+def load_related(info: ResolveInfo, obj: models.Model, field_name: str) -> Any:
+    """
+    Прямая связь (ForeignKey / OneToOneField): obj.<field_name>.
+
+    Если связь уже загружена через select_related — используем её,
+    но помечаем связанные объекты группой, чтобы следующий уровень тоже батчился.
+    """
+    field = obj._meta.get_field(field_name)
+    siblings = _siblings(obj)
+
+    if field.is_cached(obj):
+        related = getattr(obj, field_name)
+        if related is not None and not hasattr(related, SIBLINGS_ATTR):
+            mark_siblings(getattr(s, field_name) for s in siblings if field.is_cached(s))
+        return related
+
+    loader = get_loaders(info).by_pk(field.related_model)
+    return loader.load(
+        getattr(obj, field.attname),
+        [getattr(s, field.attname) for s in siblings],
+    )
+
+
+def load_reverse(info: ResolveInfo, obj: models.Model, related_name: str) -> Any:
+    """
+    Обратная связь (related_name у ForeignKey / OneToOneField): obj.<related_name>.
+
+    Для ForeignKey возвращает список, для OneToOne — объект или None.
+    """
+    rel = obj._meta.get_field(related_name)
+    loader = get_loaders(info).by_fk(rel.related_model, rel.field.attname, unique=rel.one_to_one)
+    return loader.load(obj.pk, [s.pk for s in _siblings(obj)])
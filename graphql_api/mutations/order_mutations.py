@@ -8,6 +8,7 @@ from django.http import HttpRequest
 from graphene import ResolveInfo
 
 from graphql_api.types.order_types import OrderType
+from orders import idempotency
 from orders.models import Order
 from orders.services import create_order_from_cart
 
@@ -34,10 +35,14 @@ class CreateOrderPayload(graphene.Mutation):
     Мутация создания заказа на основе текущей корзины.
 
     Логика полностью переиспользует сервис `create_order_from_cart`.
+
+    Ключ идемпотентности — аргумент idempotencyKey или заголовок
+    Idempotency-Key: повтор с тем же ключом возвращает уже созданный заказ.
     """
 
     class Arguments:
         data = CreateOrderInput(required=True)
+        idempotency_key = graphene.String(required=False)
 
     ok = graphene.Boolean()
     order = graphene.Field(OrderType)
@@ -48,11 +53,20 @@ class CreateOrderPayload(graphene.Mutation):
         root: object,
         info: ResolveInfo,
         data: Dict[str, Any],
+        idempotency_key: str | None = None,
     ) -> "CreateOrderPayload":
         request: HttpRequest = info.context  # Django HttpRequest
+        key = (idempotency_key or "").strip() or idempotency.request_key(request)
 
         try:
-            order: Order = create_order_from_cart(request, data)
+            order: Order
+            order, _ = idempotency.run_once(
+                request,
+                idempotency.SCOPE_GRAPHQL,
+                key,
+                data,
+                lambda: create_order_from_cart(request, data),
+            )
             return CreateOrderPayload(ok=True, order=order, error=None)
         except ValidationError as exc:
             return CreateOrderPayload(ok=False, order=None, error=str(exc))
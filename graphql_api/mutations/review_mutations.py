@@ -5,8 +5,8 @@ from django.core.exceptions import ValidationError
 from graphene import ResolveInfo
 
 from graphql_api.types.review_types import ReviewType
-from orders.models import Order
 from products.models import Product
+from reviews.eligibility import get_eligibility
 from reviews.models import Review
 
 
@@ -43,21 +43,17 @@ class CreateReview(graphene.Mutation):
         except Product.DoesNotExist:
             return CreateReview(ok=False, error="Product not found.")
 
-        # ---- Purchase check ----
-        has_bought = Order.objects.filter(
-            user=user,
-            items__product=product,
-            status__in=[Order.STATUS_PAID, Order.STATUS_DELIVERED],
-        ).exists()
+        eligibility = get_eligibility(user)
 
-        if not has_bought:
+        # ---- Purchase check ----
+        if not eligibility.has_bought(product.pk):
             return CreateReview(
                 ok=False,
                 error="You can leave a review only after purchasing the product.",
             )
 
         # ---- One review per product ----
-        if Review.objects.filter(user=user, product=product).exists():
+        if eligibility.already_reviewed(product.pk):
             return CreateReview(
                 ok=False,
                 error="You have already reviewed this product.",
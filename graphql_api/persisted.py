@@ -0,0 +1,152 @@
+"""
+Persisted queries и кеш разобранных документов.
+
+1. Automatic persisted queries (протокол Apollo APQ):
+   клиент передаёт extensions.persistedQuery.sha256Hash вместо текста запроса.
+   Если хеш неизвестен — отвечаем ошибкой PersistedQueryNotFound, клиент
+   повторяет запрос с текстом, и мы запоминаем пару hash → document
+   в Django cache (общем для всех воркеров при Redis/Memcached).
+
+2. LRU-кеш разобранных и провалидированных документов (в памяти процесса):
+   повторные запросы не проходят parse/validate заново.
+   Кеш сбрасывается при изменении лимитов (setting_changed).
+
+3. Persisted GET-запросы к публичным полям каталога отдаются
+   с Cache-Control: public — их URL короткий и стабильный.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpRequest
+from graphql import DocumentNode
+
+from graphql_api.validation import OperationMetrics
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_HASH_MISMATCH = "provided sha does not match query"
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": 60 * 60 * 24,
+    "DOCUMENT_CACHE_SIZE": 256,
+    "HTTP_MAX_AGE": 60,
+}
+
+CACHE_KEY_PREFIX = "graphql:apq:"
+
+
+def get_persisted_setting(name: str) -> Any:
+    """Значение из settings.GRAPHQL_PERSISTED_QUERIES (или значение по умолчанию)."""
+    configured: Dict[str, Any] = getattr(settings, "GRAPHQL_PERSISTED_QUERIES", {})
+    return configured.get(name, DEFAULT_SETTINGS[name])
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+# ======================================================================
+# PERSISTED QUERIES
+# ======================================================================
+def get_persisted_hash(request: HttpRequest, data: Dict[str, Any]) -> Optional[str]:
+    """
+    sha256Hash из extensions.persistedQuery.
+    В POST extensions приходит в JSON-теле, в GET — строкой в query string.
+    """
+    extensions: Any = data.get("extensions") if isinstance(data, dict) else None
+    if extensions is None:
+        extensions = request.GET.get("extensions")
+
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+
+    if not isinstance(extensions, dict):
+        return None
+
+    persisted = extensions.get("persistedQuery")
+    if not isinstance(persisted, dict):
+        return None
+
+    sha = persisted.get("sha256Hash")
+    return sha.lower() if isinstance(sha, str) else None
+
+
+def register_persisted_query(sha: str, query: str) -> None:
+    cache = caches[get_persisted_setting("CACHE_ALIAS")]
+    cache.set(CACHE_KEY_PREFIX + sha, query, get_persisted_setting("TIMEOUT"))
+
+
+def lookup_persisted_query(sha: str) -> Optional[str]:
+    cache = caches[get_persisted_setting("CACHE_ALIAS")]
+    query: Optional[str] = cache.get(CACHE_KEY_PREFIX + sha)
+    return query
+
+
+# ======================================================================
+# DOCUMENT CACHE
+# ======================================================================
+@dataclass(frozen=True)
+class CachedDocument:
+    """Разобранный документ, прошедший валидацию, и метрики его операций."""
+
+    document: DocumentNode
+    metrics: Tuple[OperationMetrics, ...]
+
+
+class DocumentCache:
+    """Потокобезопасный LRU-кеш: sha256 текста запроса → CachedDocument."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, CachedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedDocument]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedDocument) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+document_cache = DocumentCache(get_persisted_setting("DOCUMENT_CACHE_SIZE"))
+
+
+@receiver(setting_changed)
+def _reset_document_cache(setting: str, **kwargs: Any) -> None:
+    """Провалидированные документы зависят от лимитов — при их смене кеш сбрасываем."""
+    if setting == "GRAPHQL_QUERY_LIMITS":
+        document_cache.clear()
+    elif setting == "GRAPHQL_PERSISTED_QUERIES":
+        document_cache.clear()
+        document_cache.maxsize = get_persisted_setting("DOCUMENT_CACHE_SIZE")
@@ -6,9 +6,13 @@ import graphene
 from django.db.models import QuerySet, Sum
 from graphene import ResolveInfo
 
-from graphql_api.types.order_types import OrderType
+from graphql_api.connections import CountableConnection, connection_args, keyset_connection
+from graphql_api.dataloaders import mark_siblings
+from graphql_api.types.order_types import OrderConnection, OrderType
 from graphql_api.types.product_types import ProductType
-from orders.models import Order, OrderItem
+from graphql_api.validation import clamp_page_size
+from main.db_router import analytics_db
+from orders.models import Order, OrderItemRecord, OrderRecord
 from products.models import Product
 
 
@@ -22,6 +26,8 @@ class OrderQuery(graphene.ObjectType):
     - totalRevenue: суммарная выручка (по оплаченным/доставленным)
     - ordersCount: количество всех заказов
     - topProducts(limit): топ товаров по количеству проданных единиц
+
+    Заказы и аналитика читаются вместе с архивом (Order.objects.with_archive()).
     """
 
     order = graphene.Field(
@@ -30,9 +36,10 @@ class OrderQuery(graphene.ObjectType):
         description="Returns a single order by its ID.",
     )
 
-    my_orders = graphene.List(
-        OrderType,
-        description="Returns list of orders for the authenticated user.",
+    my_orders = graphene.Field(
+        OrderConnection,
+        **connection_args(),
+        description="Returns a page of orders for the authenticated user.",
     )
 
     total_revenue = graphene.Float(description="Total revenue for paid / shipped / delivered orders.")
@@ -49,18 +56,23 @@ class OrderQuery(graphene.ObjectType):
     # RESOLVERS
     # ============================================================
 
-    def resolve_order(self, info: ResolveInfo, id: int) -> Optional[Order]:
+    def resolve_order(self, info: ResolveInfo, id: int) -> Optional[OrderRecord]:
         """
-        Возвращает заказ по его ID.
+        Возвращает заказ по его ID (в том числе архивный).
         """
         try:
-            return Order.objects.select_related("user").prefetch_related("items__product").get(id=id)
-        except Order.DoesNotExist as exc:  # pragma: no cover
+            return Order.objects.with_archive().get(id=id)
+        except OrderRecord.DoesNotExist as exc:  # pragma: no cover
             raise ValueError(f"Order with ID {id} not found.") from exc
 
-    def resolve_my_orders(self, info: ResolveInfo) -> QuerySet[Order]:
+    def resolve_my_orders(
+        self,
+        info: ResolveInfo,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> CountableConnection:
         """
-        Возвращает заказы текущего авторизованного пользователя.
+        Возвращает страницу заказов текущего авторизованного пользователя.
         Если пользователь не авторизован — бросает ошибку.
         """
         user = info.context.user
@@ -68,14 +80,16 @@ class OrderQuery(graphene.ObjectType):
         if not user or not user.is_authenticated:
             raise ValueError("Authentication required to access orders.")
 
-        return Order.objects.filter(user=user).prefetch_related("items__product").order_by("-created_at")
+        qs = Order.objects.with_archive().filter(user=user)
+        return keyset_connection(OrderConnection, qs, ["-created_at", "-pk"], first, after)
 
     def resolve_total_revenue(self, info: ResolveInfo) -> float:
         """
         Суммарная выручка по заказам со статусами:
         paid, shipped, delivered.
         """
-        result = Order.objects.filter(
+        orders = Order.objects.with_archive().using(analytics_db())
+        result = orders.filter(
             status__in=(
                 Order.STATUS_PAID,
                 Order.STATUS_SHIPPED,
@@ -89,7 +103,7 @@ class OrderQuery(graphene.ObjectType):
         """
         Общее количество заказов.
         """
-        return Order.objects.count()
+        return Order.objects.with_archive().using(analytics_db()).count()
 
     def resolve_top_products(
         self,
@@ -101,7 +115,12 @@ class OrderQuery(graphene.ObjectType):
 
         Возвращает список Product в порядке убывания продаж.
         """
-        items = OrderItem.objects.values("product").annotate(total_sold=Sum("quantity")).order_by("-total_sold")[:limit]
+        items = (
+            OrderItemRecord.objects.using(analytics_db())
+            .values("product")
+            .annotate(total_sold=Sum("quantity"))
+            .order_by("-total_sold")[: clamp_page_size(limit)]
+        )
 
         product_ids: List[int] = [obj["product"] for obj in items]
         products: QuerySet[Product] = Product.objects.filter(id__in=product_ids)
@@ -109,4 +128,4 @@ class OrderQuery(graphene.ObjectType):
         # Сохраняем порядок по агрегату total_sold
         product_map = {p.id: p for p in products}
         ordered_products: List[Product] = [product_map[pid] for pid in product_ids if pid in product_map]
-        return ordered_products
+        return mark_siblings(ordered_products)
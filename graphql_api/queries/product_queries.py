@@ -7,7 +7,9 @@ from django.db import models
 from django.db.models import Q, QuerySet
 from graphene import ResolveInfo
 
-from graphql_api.types.product_types import CategoryType, ProductType
+from graphql_api.connections import CountableConnection, connection_args, keyset_connection
+from graphql_api.dataloaders import mark_siblings
+from graphql_api.types.product_types import CategoryType, ProductConnection, ProductType
 from products.models import Category, Product
 
 # ================================
@@ -27,13 +29,13 @@ ALLOWED_SORT_FIELDS: List[str] = [
 class ProductQuery(graphene.ObjectType):
     """
     GraphQL запросы для каталога продукции:
-    - всеТовары: список с фильтрами, поиском, нумерацией страниц, сортировкой
+    - всеТовары: connection с фильтрами, поиском, keyset-пагинацией, сортировкой
     - продукт: получить продукт по пуле
     - категории: список доступных категорий.
     """
 
-    all_products = graphene.List(
-        ProductType,
+    all_products = graphene.Field(
+        ProductConnection,
         search=graphene.String(required=False),
         category=graphene.String(required=False),
         order_by=graphene.String(required=False),
@@ -41,9 +43,8 @@ class ProductQuery(graphene.ObjectType):
         price_max=graphene.Float(required=False),
         in_stock=graphene.Boolean(required=False),
         discounted=graphene.Boolean(required=False),
-        limit=graphene.Int(required=False),
-        offset=graphene.Int(required=False),
-        description="Returns filtered list of active products.",
+        **connection_args(),
+        description="Returns filtered page of active products.",
     )
 
     product = graphene.Field(
@@ -71,11 +72,12 @@ class ProductQuery(graphene.ObjectType):
         price_max: Optional[float] = None,
         in_stock: Optional[bool] = None,
         discounted: Optional[bool] = None,
-        limit: Optional[int] = None,
-        offset: Optional[int] = None,
-    ) -> QuerySet[Product]:
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> CountableConnection:
 
-        qs = Product.objects.filter(is_active=True).select_related("category").prefetch_related("specifications")
+        # Связи (category, specifications) догружаются батчами через dataloaders
+        qs: QuerySet[Product] = Product.objects.filter(is_active=True)
 
         # SEARCH
         if search:
@@ -105,25 +107,21 @@ class ProductQuery(graphene.ObjectType):
         if discounted is True:
             qs = qs.filter(old_price__gt=models.F("price"))
 
-        # SORTING
+        # SORTING (pk делает порядок однозначным для курсора)
         if order_by:
-            if order_by in ALLOWED_SORT_FIELDS:
-                qs = qs.order_by(order_by)
-            else:
+            if order_by not in ALLOWED_SORT_FIELDS:
                 raise ValueError(f"Invalid sorting field: {order_by}")
+            ordering = [order_by, "pk"]
+        else:
+            ordering = ["-created_at", "-pk"]
 
-        # PAGINATION
-        if offset:
-            qs = qs[offset:]
-        if limit:
-            qs = qs[:limit]
-
-        return qs
+        # PAGINATION (keyset, размер страницы ограничен MAX_PAGE_SIZE)
+        return keyset_connection(ProductConnection, qs, ordering, first, after)
 
     # ---------------------------------------------------------
     def resolve_product(self, info: ResolveInfo, slug: str) -> Optional[Product]:
         try:
-            return Product.objects.select_related("category").prefetch_related("specifications").get(slug=slug)
+            return Product.objects.get(slug=slug)
         except Product.DoesNotExist:
             raise ValueError(f"Product with slug '{slug}' not found.")
 
@@ -131,5 +129,5 @@ class ProductQuery(graphene.ObjectType):
     def resolve_categories(
         self,
         info: ResolveInfo,
-    ) -> QuerySet[Category]:
-        return Category.objects.all()
+    ) -> List[Category]:
+        return mark_siblings(Category.objects.all())
@@ -1,28 +1,34 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Optional
 
 import graphene
 from graphene import ResolveInfo
 
-from graphql_api.types.review_types import ReviewType
+from graphql_api.connections import CountableConnection, connection_args, keyset_connection
+from graphql_api.types.review_types import ReviewConnection
 from reviews.models import Review
 
+# Новые отзывы первыми; pk делает порядок однозначным для курсора
+REVIEW_ORDERING = ["-created_at", "-pk"]
+
 
 class ReviewQuery(graphene.ObjectType):
     """
     GraphQL-запросы отзывов.
     """
 
-    product_reviews = graphene.List(
-        ReviewType,
+    product_reviews = graphene.Field(
+        ReviewConnection,
         product_slug=graphene.String(required=True),
-        description="Returns all reviews for a product.",
+        **connection_args(),
+        description="Returns a page of reviews for a product.",
     )
 
-    my_reviews = graphene.List(
-        ReviewType,
-        description="Returns reviews created by the current user.",
+    my_reviews = graphene.Field(
+        ReviewConnection,
+        **connection_args(),
+        description="Returns a page of reviews created by the current user.",
     )
 
     # ---------------------------------------------------------
@@ -30,15 +36,23 @@ class ReviewQuery(graphene.ObjectType):
         self,
         info: ResolveInfo,
         product_slug: str,
-    ) -> Iterable[Review]:
-        return (
-            Review.objects.select_related("user", "product").filter(product__slug=product_slug).order_by("-created_at")
-        )
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> CountableConnection:
+        qs = Review.objects.filter(product__slug=product_slug)
+        return keyset_connection(ReviewConnection, qs, REVIEW_ORDERING, first, after)
 
     # ---------------------------------------------------------
-    def resolve_my_reviews(self, info: ResolveInfo) -> Iterable[Review]:
+    def resolve_my_reviews(
+        self,
+        info: ResolveInfo,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> CountableConnection:
         user = info.context.user
         if not user.is_authenticated:
-            return Review.objects.none()
+            qs = Review.objects.none()
+        else:
+            qs = Review.objects.filter(user=user)
 
-        return Review.objects.select_related("product").filter(user=user).order_by("-created_at")
+        return keyset_connection(ReviewConnection, qs, REVIEW_ORDERING, first, after)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+
+from graphql_api.caching import bump_catalog_version
+from products.models import Category, Product, ProductSpecification
+from reviews.models import Review
+
+# Модели, от которых зависят публичные поля каталога
+CATALOG_MODELS = (Product, Category, ProductSpecification, Review)
+
+
+def invalidate_catalog_results(sender: type, **kwargs: Any) -> None:
+    """
+    Любая запись в модели каталога делает закешированные
+    GraphQL-ответы каталога неактуальными.
+    """
+    bump_catalog_version()
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog_results, sender=model, dispatch_uid=f"graphql_catalog_save_{model.__name__}")
+    post_delete.connect(
+        invalidate_catalog_results, sender=model, dispatch_uid=f"graphql_catalog_delete_{model.__name__}"
+    )
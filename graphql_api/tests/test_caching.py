@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import Any
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from graphql import get_operation_ast, parse
+
+from cart.models import CartItem
+from graphql_api.caching import is_public_operation
+from orders.services import create_order_from_cart
+from products.catalog_io import CatalogImporter, read_rows
+
+CATALOG_QUERY = "{ allProducts(first: 5) { edges { node { name category { name } } } } categories { name } }"
+
+
+def _post(client: Any, query: str) -> Any:
+    return client.post(
+        reverse("graphql"),
+        data=json.dumps({"query": query}),
+        content_type="application/json",
+    )
+
+
+def _is_public(query: str) -> bool:
+    return is_public_operation(get_operation_ast(parse(query)))
+
+
+# ---------------------------------------------------------
+# 1. Повторный запрос каталога не обращается к БД
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_catalog_result_served_from_cache(client_web: Any, product_fixture: Any) -> None:
+    first = _post(client_web, CATALOG_QUERY).json()
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = _post(client_web, CATALOG_QUERY).json()
+
+    assert second == first
+    assert len(ctx.captured_queries) == 0
+
+
+# ---------------------------------------------------------
+# 2. Запись товара инвалидирует кеш
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_product_save_invalidates_cache(client_web: Any, product_fixture: Any) -> None:
+    _post(client_web, CATALOG_QUERY)
+
+    product_fixture.name = "Renamed"
+    product_fixture.save()
+
+    data = _post(client_web, CATALOG_QUERY).json()["data"]
+    assert data["allProducts"]["edges"][0]["node"]["name"] == "Renamed"
+
+
+# ---------------------------------------------------------
+# 3. Аргументы входят в ключ кеша
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_arguments_are_part_of_key(client_web: Any, product_fixture: Any) -> None:
+    query = "query P($slug: String!) { product(slug: $slug) { name } }"
+
+    def fetch(slug: str) -> Any:
+        payload = {"query": query, "variables": {"slug": slug}}
+        return client_web.post(reverse("graphql"), data=json.dumps(payload), content_type="application/json").json()
+
+    assert fetch(product_fixture.slug)["data"]["product"]["name"] == product_fixture.name
+    assert fetch("missing")["errors"]
+
+
+# ---------------------------------------------------------
+# 4. Поля пользователя никогда не кешируются
+# ---------------------------------------------------------
+def test_user_fields_bypass_cache() -> None:
+    assert _is_public("{ allProducts { totalCount } categories { slug } }")
+    assert not _is_public("{ me { username } }")
+    assert not _is_public("{ cart { totalPrice } }")
+    assert not _is_public("{ allProducts { totalCount } myOrders { totalCount } }")
+    assert not _is_public('mutation { createReview(productSlug: "x", rating: 5) { ok } }')
+
+
+# ---------------------------------------------------------
+# 5. Массовые записи без сигналов (заказ, импорт каталога) инвалидируют кеш
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_bulk_writes_invalidate_cache(
+    client_web: Any, user_fixture: Any, product_fixture: Any, django_capture_on_commit_callbacks: Any
+) -> None:
+    query = "{ allProducts(first: 5) { edges { node { name stock } } } }"
+
+    def node() -> Any:
+        return _post(client_web, query).json()["data"]["allProducts"]["edges"][0]["node"]
+
+    assert node() == {"name": product_fixture.name, "stock": 10}
+
+    CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=3)
+    request = RequestFactory().post("/checkout/")
+    request.session = SessionStore()
+    request.user = user_fixture
+    form = {"full_name": "Buyer", "phone": "1", "shipping_address": "Street", "payment_method": "cash"}
+    with django_capture_on_commit_callbacks(execute=True):
+        create_order_from_cart(request, form)
+    assert node()["stock"] == 7
+
+    record = {
+        "slug": product_fixture.slug,
+        "name": "Imported",
+        "price": "120",
+        "category": product_fixture.category.slug,
+    }
+    columns, records = read_rows(io.StringIO(json.dumps(record) + "\n"), "jsonl")
+    with django_capture_on_commit_callbacks(execute=True):
+        assert CatalogImporter(columns).run(records).updated == 1
+    assert node()["name"] == "Imported"
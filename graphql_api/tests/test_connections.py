@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from graphql import parse, validate
+
+from graphql_api.schema import schema
+from graphql_api.validation import QueryComplexityRule
+from products.models import Product
+from reviews.models import Review
+
+
+def _execute(query: str, variables: Optional[Dict[str, Any]] = None, user: Any = None) -> Any:
+    request = RequestFactory().post("/graphql/")
+    request.user = user or AnonymousUser()
+    return schema.execute(query, variable_values=variables, context_value=request)
+
+
+def _make_products(category: Any, count: int) -> List[Product]:
+    return [
+        Product.objects.create(
+            name=f"Hop {i}",
+            slug=f"hop-{i}",
+            description="d",
+            price=10 + i,
+            category=category,
+        )
+        for i in range(count)
+    ]
+
+
+PRODUCTS_PAGE = """
+query Page($after: String) {
+  allProducts(first: 2, orderBy: "price", after: $after) {
+    edges { cursor node { name } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+# ---------------------------------------------------------
+# 1. Постраничный обход по курсорам без пропусков и повторов
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_products_keyset_pagination(category_fixture: Any) -> None:
+    _make_products(category_fixture, 5)
+
+    names: List[str] = []
+    after = None
+    while True:
+        result = _execute(PRODUCTS_PAGE, {"after": after})
+        assert result.errors is None, result.errors
+        page = result.data["allProducts"]
+        names += [edge["node"]["name"] for edge in page["edges"]]
+        if not page["pageInfo"]["hasNextPage"]:
+            break
+        after = page["pageInfo"]["endCursor"]
+
+    assert names == [f"Hop {i}" for i in range(5)]
+
+
+# ---------------------------------------------------------
+# 2. totalCount считается только когда запрошен
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_total_count_is_lazy(category_fixture: Any) -> None:
+    _make_products(category_fixture, 3)
+
+    with CaptureQueriesContext(connection) as ctx:
+        _execute("{ allProducts(first: 1) { edges { node { name } } } }")
+    assert not any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = _execute("{ allProducts(first: 1) { totalCount edges { node { name } } } }")
+    assert result.data["allProducts"]["totalCount"] == 3
+    assert any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+
+
+# ---------------------------------------------------------
+# 3. Размер страницы ограничен MAX_PAGE_SIZE
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_page_size_capped(settings: Any, product_fixture: Any) -> None:
+    settings.GRAPHQL_QUERY_LIMITS = {"MAX_PAGE_SIZE": 2}
+    for i in range(4):
+        user = get_user_model().objects.create_user(username=f"reviewer{i}", password="pass12345")
+        Review.objects.create(product=product_fixture, user=user, rating=5, comment="ok")
+
+    query = '{ productReviews(productSlug: "%s", first: 50) { totalCount edges { node { rating } } } }'
+    result = _execute(query % product_fixture.slug)
+
+    assert result.errors is None, result.errors
+    assert result.data["productReviews"]["totalCount"] == 4
+    assert len(result.data["productReviews"]["edges"]) == 2
+
+
+# ---------------------------------------------------------
+# 4. Некорректный курсор — ошибка, а не полный список
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_invalid_cursor_rejected() -> None:
+    result = _execute(PRODUCTS_PAGE, {"after": "not-a-cursor"})
+
+    assert result.errors
+    assert "Invalid cursor" in str(result.errors[0])
+
+    # Подделанное значение поля сортировки отклоняется до запроса к БД
+    forged = base64.urlsafe_b64encode(json.dumps({"o": ["price", "pk"], "v": ["garbage", 1]}).encode()).decode()
+    result = _execute(PRODUCTS_PAGE, {"after": forged})
+    assert result.errors
+    assert "Invalid cursor" in str(result.errors[0])
+
+
+# ---------------------------------------------------------
+# 5. Стоимость connection: first умножает только edges
+# ---------------------------------------------------------
+def test_connection_cost_counts_edges_once() -> None:
+    document = parse("{ myOrders(first: 10) { totalCount edges { node { items { product { name } } } } } }")
+
+    assert validate(schema.graphql_schema, document, [QueryComplexityRule]) == []
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from graphql_api.schema import schema
+from orders.models import Order, OrderItem
+from products.models import Category, Product
+
+
+def _execute(query: str, user: Any = None) -> Any:
+    request = RequestFactory().post("/graphql/")
+    request.user = user or AnonymousUser()
+    result = schema.execute(query, context_value=request)
+    assert result.errors is None, result.errors
+    return result.data
+
+
+def _count_queries(query: str, user: Any = None) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        _execute(query, user)
+    return len(ctx.captured_queries)
+
+
+def _make_tree(prefix: str, roots: int, children: int) -> None:
+    for i in range(roots):
+        root = Category.objects.create(name=f"{prefix} {i}", slug=f"{prefix}-{i}")
+        for j in range(children):
+            Category.objects.create(name=f"{prefix} {i}-{j}", slug=f"{prefix}-{i}-{j}", parent=root)
+
+
+# ---------------------------------------------------------
+# 1. categories { children { parent } } — запросов не больше, чем уровней
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_category_tree_query_count_does_not_grow() -> None:
+    query = "{ categories { name parent { name } children { name parent { slug } } } }"
+
+    _make_tree("small", roots=2, children=2)
+    small = _count_queries(query)
+
+    _make_tree("large", roots=6, children=4)
+    large = _count_queries(query)
+
+    assert small == large == 3
+
+
+# ---------------------------------------------------------
+# 2. myOrders { items { product { category } } } — 4 запроса (по одному на уровень)
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_my_orders_nested_relations_batched(
+    user_fixture: Any,
+    category_fixture: Any,
+) -> None:
+    for i in range(3):
+        order = Order.objects.create(user=user_fixture, status="paid", shipping_address="addr")
+        for j in range(2):
+            product = Product.objects.create(
+                name=f"P {i}-{j}",
+                slug=f"p-{i}-{j}",
+                description="d",
+                price=10,
+                category=category_fixture,
+            )
+            OrderItem.objects.create(order=order, product=product, quantity=j + 1, price=10)
+
+    query = "{ myOrders { edges { node { itemsCount items { quantity product { name category { name } } } } } } }"
+
+    assert _count_queries(query, user_fixture) == 4
+
+    orders = [edge["node"] for edge in _execute(query, user_fixture)["myOrders"]["edges"]]
+    assert len(orders) == 3
+    assert all(order["itemsCount"] == 3 for order in orders)
+    assert orders[0]["items"][0]["product"]["category"]["name"] == category_fixture.name
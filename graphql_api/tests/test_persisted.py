@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator
+
+import pytest
+from django.urls import reverse
+
+from graphql_api import views
+from graphql_api.persisted import document_cache, query_hash
+
+CATALOG_QUERY = "query Catalog { allProducts(first: 5) { edges { node { name } } } }"
+
+
+@pytest.fixture(autouse=True)
+def _clean_document_cache() -> Iterator[None]:
+    document_cache.clear()
+    yield
+    document_cache.clear()
+
+
+def _extensions(sha: str) -> Dict[str, Any]:
+    return {"persistedQuery": {"version": 1, "sha256Hash": sha}}
+
+
+def _post(client: Any, payload: Dict[str, Any]) -> Any:
+    return client.post(reverse("graphql"), data=json.dumps(payload), content_type="application/json")
+
+
+def _get_persisted(client: Any, sha: str) -> Any:
+    return client.get(
+        reverse("graphql"),
+        {"extensions": json.dumps(_extensions(sha))},
+        HTTP_ACCEPT="application/json",
+    )
+
+
+# ---------------------------------------------------------
+# 1. Неизвестный хеш → PersistedQueryNotFound
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_unknown_hash_not_found(client_web: Any) -> None:
+    response = _get_persisted(client_web, query_hash(CATALOG_QUERY))
+
+    assert response.json()["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+# ---------------------------------------------------------
+# 2. Зарегистрированный запрос выполняется по хешу и кешируется по HTTP
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_registered_query_served_by_hash(client_web: Any, product_fixture: Any) -> None:
+    sha = query_hash(CATALOG_QUERY)
+    _post(client_web, {"query": CATALOG_QUERY, "extensions": _extensions(sha)})
+
+    response = _get_persisted(client_web, sha)
+
+    assert response.status_code == 200
+    assert response.json()["data"]["allProducts"]["edges"][0]["node"]["name"] == product_fixture.name
+    assert "public" in response["Cache-Control"]
+    assert "csrftoken" not in response.cookies
+
+
+# ---------------------------------------------------------
+# 3. Хеш не совпадает с текстом — запрос не регистрируется
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_hash_mismatch_rejected(client_web: Any) -> None:
+    response = _post(client_web, {"query": CATALOG_QUERY, "extensions": _extensions("0" * 64)})
+
+    assert "provided sha does not match query" in response.json()["errors"][0]["message"]
+    assert _get_persisted(client_web, "0" * 64).json()["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+# ---------------------------------------------------------
+# 4. Повторный запрос не проходит parse/validate
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_document_cache_skips_parse(client_web: Any, monkeypatch: Any, product_fixture: Any) -> None:
+    _post(client_web, {"query": CATALOG_QUERY})
+
+    def _fail(*_args: Any, **_kwargs: Any) -> None:
+        raise AssertionError("document must come from cache")
+
+    monkeypatch.setattr(views, "parse", _fail)
+    monkeypatch.setattr(views, "validate", _fail)
+
+    response = _post(client_web, {"query": CATALOG_QUERY})
+
+    assert response.status_code == 200
+    assert response.json()["data"]["allProducts"]["edges"][0]["node"]["name"] == product_fixture.name
+
+
+# ---------------------------------------------------------
+# 5. Поля пользователя по HTTP не кешируются
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_private_persisted_query_not_cacheable(client_web: Any) -> None:
+    query = "{ me { username } }"
+    sha = query_hash(query)
+    _post(client_web, {"query": query, "extensions": _extensions(sha)})
+
+    response = _get_persisted(client_web, sha)
+
+    assert "public" not in response.get("Cache-Control", "")
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+import pytest
+from django.urls import reverse
+
+
+def _post(client: Any, query: str) -> Any:
+    return client.post(
+        reverse("graphql"),
+        data=json.dumps({"query": query}),
+        content_type="application/json",
+    )
+
+
+def _errors(response: Any) -> str:
+    payload: Dict[str, Any] = response.json()
+    return " ".join(error["message"] for error in payload.get("errors", []))
+
+
+# ---------------------------------------------------------
+# 1. Обычный запрос проходит
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_simple_query_allowed(client_web: Any, product_fixture: Any) -> None:
+    response = _post(client_web, "{ allProducts(first: 10) { edges { node { name category { name } } } } }")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["allProducts"]["edges"][0]["node"]["name"] == product_fixture.name
+
+
+# ---------------------------------------------------------
+# 2. Слишком глубокий запрос отклоняется до выполнения
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_deep_query_rejected(client_web: Any, settings: Any) -> None:
+    settings.GRAPHQL_QUERY_LIMITS = {"MAX_DEPTH": 3, "MAX_COST": 10_000}
+
+    response = _post(client_web, "{ categories { parent { parent { parent { name } } } } }")
+
+    assert response.status_code == 400
+    assert "maximum allowed depth is 3" in _errors(response)
+
+
+# ---------------------------------------------------------
+# 3. Слишком дорогой запрос отклоняется (вложенные списки перемножаются)
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_expensive_query_rejected(client_web: Any) -> None:
+    query = "{ categories { children { children { children { name } } } } }"
+
+    response = _post(client_web, query)
+
+    assert response.status_code == 400
+    assert "maximum allowed cost is" in _errors(response)
+
+
+# ---------------------------------------------------------
+# 4. Фрагменты учитываются так же, как поля
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_fragments_counted(client_web: Any, settings: Any) -> None:
+    settings.GRAPHQL_QUERY_LIMITS = {"MAX_DEPTH": 2}
+
+    query = "fragment Tree on CategoryType { children { children { name } } } query Deep { categories { ...Tree } }"
+    response = _post(client_web, query)
+
+    assert response.status_code == 400
+    assert "Operation 'Deep' has depth 4" in _errors(response)
@@ -5,6 +5,7 @@ from graphene import ResolveInfo
 from graphene_django import DjangoObjectType
 
 from cart.models import CartItem
+from graphql_api.dataloaders import load_related, mark_siblings
 
 
 class CartItemType(DjangoObjectType):
@@ -22,6 +23,9 @@ class CartItemType(DjangoObjectType):
             "quantity",
         )
 
+    def resolve_product(self, info: ResolveInfo):
+        return load_related(info, self, "product")
+
     def resolve_total_price(self, info: ResolveInfo) -> str:
         return str(self.total_price)
 
@@ -38,7 +42,7 @@ class CartType(graphene.ObjectType):
     # ↓↓↓ ВАЖНО ↓↓↓
 
     def resolve_items(self, info: ResolveInfo):
-        return self.get_items()
+        return mark_siblings(self.get_items())
 
     def resolve_total_quantity(self, info: ResolveInfo) -> int:
         return sum(item.quantity for item in self.get_items())
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from typing import Any
 
 import graphene
 from graphene_django import DjangoObjectType
 
-from orders.models import Order, OrderItem
+from graphql_api.connections import CountableConnection
+from graphql_api.dataloaders import load_related, load_reverse
+from orders.models import Order, OrderItem, OrderItemRecord, OrderRecord
 
 
 class OrderItemType(DjangoObjectType):
@@ -32,6 +35,14 @@ class OrderItemType(DjangoObjectType):
         )
         description = "Single product position inside an order."
 
+    @classmethod
+    def is_type_of(cls, root: Any, info: graphene.ResolveInfo) -> bool:
+        # Позиции архивных заказов приходят из представления OrderItemRecord
+        return isinstance(root, (OrderItem, OrderItemRecord))
+
+    def resolve_product(self, info: graphene.ResolveInfo):
+        return load_related(info, self, "product")
+
     def resolve_total(self, info: graphene.ResolveInfo) -> Decimal:
         return self.price * self.quantity  # type: ignore[no-any-return]
 
@@ -70,6 +81,23 @@ class OrderType(DjangoObjectType):
         )
         description = "Order entity with customer, pricing and items information."
 
+    @classmethod
+    def is_type_of(cls, root: Any, info: graphene.ResolveInfo) -> bool:
+        # myOrders / order(id) отдают заказы вместе с архивом — OrderRecord
+        return isinstance(root, (Order, OrderRecord))
+
+    def resolve_items(self, info: graphene.ResolveInfo):
+        return load_reverse(info, self, "items")
+
+    def resolve_user(self, info: graphene.ResolveInfo):
+        return load_related(info, self, "user")
+
     def resolve_items_count(self, info: graphene.ResolveInfo) -> int:
-        # Используем уже готовое свойство модели
-        return self.items_count  # type: ignore[no-any-return]
+        # Позиции берём из загрузчика, чтобы не делать запрос на каждый заказ
+        return sum(item.quantity for item in load_reverse(info, self, "items"))
+
+
+class OrderConnection(CountableConnection):
+    class Meta:
+        node = OrderType
+        description = "Paginated list of orders."
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import graphene
+from graphene import ResolveInfo
 from graphene_django import DjangoObjectType
 
+from graphql_api.connections import CountableConnection
+from graphql_api.dataloaders import load_related, load_reverse
+from products.images import variant_urls
 from products.models import Category, Product, ProductSpecification
 
 
@@ -24,6 +28,12 @@ class CategoryType(DjangoObjectType):
         )
         description = "Product category with support for nested hierarchy."
 
+    def resolve_parent(self, info: ResolveInfo):
+        return load_related(info, self, "parent")
+
+    def resolve_children(self, info: ResolveInfo):
+        return load_reverse(info, self, "children")
+
 
 class ProductSpecificationType(DjangoObjectType):
     """
@@ -40,14 +50,28 @@ class ProductSpecificationType(DjangoObjectType):
         description = "Product specification key-value pair."
 
 
+class ImageVariantType(graphene.ObjectType):
+    """Производная изображения товара: формат и ширина (products/images.py)."""
+
+    format = graphene.String(required=True, description="avif, webp, jpeg or png.")
+    width = graphene.Int(required=True, description="Width in pixels.")
+    url = graphene.String(required=True)
+
+
 class ProductType(DjangoObjectType):
     """
     Базовый GraphQL тип товара.
     Содержит вычисляемые поля:
     - discountPercent (camelCase): процент скидки
+    - imageVariants: производные изображения для srcset
     """
 
     discount_percent = graphene.Int(description="Discount percentage calculated from price and old_price.")
+    image_variants = graphene.List(
+        graphene.NonNull(ImageVariantType),
+        required=True,
+        description="Resized image variants (empty until generated; use image then).",
+    )
 
     class Meta:
         model = Product
@@ -64,6 +88,7 @@ class ProductType(DjangoObjectType):
             "discount_percent",
             "category",
             "image",
+            "image_variants",
             "is_active",
             "stock",
             "tags",
@@ -75,6 +100,19 @@ class ProductType(DjangoObjectType):
     # Custom Resolvers
     # -------------------------------
 
+    def resolve_category(self, info: ResolveInfo):
+        return load_related(info, self, "category")
+
+    def resolve_specifications(self, info: ResolveInfo):
+        return load_reverse(info, self, "specifications")
+
+    def resolve_image_variants(self, info: ResolveInfo):
+        return [
+            ImageVariantType(format=fmt, width=width, url=url)
+            for fmt, sizes in variant_urls(self).items()
+            for width, url in sizes.items()
+        ]
+
     def resolve_discount_percent(self, info) -> int:
         """
         Возвращает процент скидки.
@@ -83,3 +121,9 @@ class ProductType(DjangoObjectType):
         if not self.old_price or self.old_price <= 0:
             return 0
         return int(100 - (float(self.price) / float(self.old_price) * 100))
+
+
+class ProductConnection(CountableConnection):
+    class Meta:
+        node = ProductType
+        description = "Paginated list of products."
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import graphene
+from graphene import ResolveInfo
 from graphene_django import DjangoObjectType
 
+from graphql_api.connections import CountableConnection
+from graphql_api.dataloaders import load_related
 from reviews.models import Review
 
 
@@ -25,6 +28,18 @@ class ReviewType(DjangoObjectType):
         )
         description = "Product review."
 
-    def resolve_username(self, info) -> str:
-        user = self.user
+    def resolve_user(self, info: ResolveInfo):
+        return load_related(info, self, "user")
+
+    def resolve_product(self, info: ResolveInfo):
+        return load_related(info, self, "product")
+
+    def resolve_username(self, info: ResolveInfo) -> str:
+        user = load_related(info, self, "user")
         return user.username or user.email
+
+
+class ReviewConnection(CountableConnection):
+    class Meta:
+        node = ReviewType
+        description = "Paginated list of reviews."
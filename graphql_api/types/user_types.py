@@ -4,6 +4,7 @@ import graphene
 from django.contrib.auth import get_user_model
 from graphene_django import DjangoObjectType
 
+from graphql_api.dataloaders import load_reverse
 from users.models import UserProfile
 
 User = get_user_model()
@@ -53,4 +54,4 @@ class UserType(DjangoObjectType):
 
     def resolve_profile(self, info) -> UserProfile:
         # profile всегда существует по signal
-        return self.profile
+        return load_reverse(info, self, "profile")
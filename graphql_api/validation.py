@@ -0,0 +1,270 @@
+"""
+Статический анализ сложности GraphQL-запросов.
+
+Правило QueryComplexityRule выполняется на этапе валидации (до execute)
+и для каждой операции считает:
+- depth — максимальную вложенность полей;
+- cost  — оценочную стоимость: вес поля + размер списка x стоимость вложенных полей.
+
+Размер списка берётся из аргумента limit/first (не больше MAX_PAGE_SIZE);
+для списков без такого аргумента используется DEFAULT_LIST_SIZE.
+У Relay-connection размер страницы умножает только `edges`,
+а не pageInfo / totalCount.
+Поля интроспекции (`__schema`, `__type`) не учитываются.
+Лимиты и веса настраиваются через settings.GRAPHQL_QUERY_LIMITS.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+)
+from graphql.validation import ValidationRule
+
+logger = logging.getLogger("graphql_api")
+
+DEFAULT_LIMITS: Dict[str, Any] = {
+    "MAX_DEPTH": 8,
+    "MAX_COST": 1000,
+    "DEFAULT_LIST_SIZE": 20,
+    "MAX_PAGE_SIZE": 100,
+    # Вес поля "<Type>.<field>". По умолчанию: объект/список — 1, скаляр — 0.
+    "FIELD_COSTS": {
+        "Query.allProducts": 5,
+        "Query.topProducts": 10,
+        "Query.totalRevenue": 10,
+        "Query.ordersCount": 5,
+        "Mutation.createOrder": 20,
+        "Mutation.createReview": 10,
+    },
+}
+
+SIZE_ARGUMENTS = ("limit", "first", "last")
+
+
+@dataclass(frozen=True)
+class OperationMetrics:
+    """Результат анализа одной операции."""
+
+    operation: str
+    operation_type: str
+    depth: int
+    cost: int
+    rejected: bool
+
+
+# Сборщик метрик текущей валидации (нужен кешу документов, см. views.py)
+_metrics_collector: ContextVar[Optional[List[OperationMetrics]]] = ContextVar("graphql_metrics", default=None)
+
+
+@contextmanager
+def collect_metrics() -> Iterator[List[OperationMetrics]]:
+    """Собирает метрики всех операций, провалидированных внутри блока."""
+    collected: List[OperationMetrics] = []
+    token = _metrics_collector.set(collected)
+    try:
+        yield collected
+    finally:
+        _metrics_collector.reset(token)
+
+
+def log_operation_metrics(metrics: OperationMetrics, cached: bool = False) -> None:
+    logger.log(
+        logging.WARNING if metrics.rejected else logging.INFO,
+        "graphql operation=%s type=%s depth=%d cost=%d rejected=%s cached=%s",
+        metrics.operation,
+        metrics.operation_type,
+        metrics.depth,
+        metrics.cost,
+        metrics.rejected,
+        cached,
+    )
+
+
+def get_query_limit(name: str) -> Any:
+    """Значение лимита из settings.GRAPHQL_QUERY_LIMITS (или значение по умолчанию)."""
+    configured: Dict[str, Any] = getattr(settings, "GRAPHQL_QUERY_LIMITS", {})
+    return configured.get(name, DEFAULT_LIMITS[name])
+
+
+def clamp_page_size(value: Optional[int]) -> int:
+    """Размер страницы, ограниченный сверху MAX_PAGE_SIZE."""
+    max_size: int = get_query_limit("MAX_PAGE_SIZE")
+    if value is None or value <= 0:
+        return max_size
+    return min(value, max_size)
+
+
+def _is_connection(named_type: GraphQLNamedType) -> bool:
+    return isinstance(named_type, GraphQLObjectType) and {"edges", "pageInfo"} <= set(named_type.fields)
+
+
+class QueryComplexityRule(ValidationRule):
+    """
+    Отклоняет операции глубже MAX_DEPTH или дороже MAX_COST
+    и логирует метрики каждой операции.
+    """
+
+    def enter_operation_definition(self, node: OperationDefinitionNode, *_args: Any) -> None:
+        schema = self.context.schema
+        root_type = schema.get_root_type(node.operation)
+        if root_type is None:
+            return
+
+        self._field_costs: Dict[str, int] = get_query_limit("FIELD_COSTS")
+        cost, depth = self._measure(node.selection_set, root_type, 0, set())
+
+        operation = node.name.value if node.name else "anonymous"
+        max_depth: int = get_query_limit("MAX_DEPTH")
+        max_cost: int = get_query_limit("MAX_COST")
+
+        if depth > max_depth:
+            self.report_error(
+                GraphQLError(
+                    f"Operation '{operation}' has depth {depth}, maximum allowed depth is {max_depth}.",
+                    node,
+                )
+            )
+        if cost > max_cost:
+            self.report_error(
+                GraphQLError(
+                    f"Operation '{operation}' has cost {cost}, maximum allowed cost is {max_cost}.",
+                    node,
+                )
+            )
+
+        metrics = OperationMetrics(
+            operation=operation,
+            operation_type=node.operation.value,
+            depth=depth,
+            cost=cost,
+            rejected=depth > max_depth or cost > max_cost,
+        )
+        log_operation_metrics(metrics)
+
+        collector = _metrics_collector.get()
+        if collector is not None:
+            collector.append(metrics)
+
+    # ------------------------------------------------------------------
+    # Подсчёт
+    # ------------------------------------------------------------------
+    def _measure(
+        self,
+        selection_set: SelectionSetNode,
+        parent_type: GraphQLNamedType,
+        depth: int,
+        visited_fragments: Set[str],
+        page_size: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """
+        Возвращает (cost, depth) для selection_set внутри parent_type.
+        page_size — размер страницы connection, к которому относятся edges.
+        """
+        total_cost = 0
+        max_depth = depth
+
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost, field_depth = self._measure_field(selection, parent_type, depth, visited_fragments, page_size)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = self.context.schema.get_type(selection.type_condition.name.value) or parent_type
+                cost, field_depth = self._measure(
+                    selection.selection_set, fragment_type, depth, visited_fragments, page_size
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.context.get_fragment(name)
+                if fragment is None or name in visited_fragments:
+                    continue
+                fragment_type = self.context.schema.get_type(fragment.type_condition.name.value) or parent_type
+                cost, field_depth = self._measure(
+                    fragment.selection_set, fragment_type, depth, visited_fragments | {name}, page_size
+                )
+            else:  # pragma: no cover
+                continue
+
+            total_cost += cost
+            max_depth = max(max_depth, field_depth)
+
+        return total_cost, max_depth
+
+    def _measure_field(
+        self,
+        node: FieldNode,
+        parent_type: GraphQLNamedType,
+        depth: int,
+        visited_fragments: Set[str],
+        page_size: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        name = node.name.value
+        if name.startswith("__") or not isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            return 0, depth
+
+        field_def = parent_type.fields.get(name)
+        if field_def is None:
+            # Неизвестное поле — ошибку сообщит стандартное правило FieldsOnCorrectType
+            return 0, depth
+
+        field_type = field_def.type
+        named_type = get_named_type(field_type)
+        default_weight = 1 if node.selection_set else 0
+        weight: int = self._field_costs.get(f"{parent_type.name}.{name}", default_weight)
+
+        if not node.selection_set:
+            return weight, depth + 1
+
+        if _is_connection(named_type):
+            # Размер страницы применяется к edges внутри connection
+            child_cost, child_depth = self._measure(
+                node.selection_set, named_type, depth + 1, visited_fragments, self._list_size(node, field_def)
+            )
+            return weight + child_cost, child_depth
+
+        size = page_size if name == "edges" and page_size is not None else self._list_size(node, field_def)
+        child_cost, child_depth = self._measure(node.selection_set, named_type, depth + 1, visited_fragments)
+        return weight + size * child_cost, child_depth
+
+    def _list_size(self, node: FieldNode, field_def: GraphQLField) -> int:
+        """Ожидаемое количество элементов, которое вернёт поле."""
+        for argument in node.arguments or ():
+            if argument.name.value in SIZE_ARGUMENTS:
+                if isinstance(argument.value, IntValueNode):
+                    return clamp_page_size(int(argument.value.value))
+                # Переменная: значение неизвестно на этапе валидации — берём худший случай
+                return clamp_page_size(None)
+
+        # Аргумент размера не передан — значение по умолчанию или полная страница
+        for name in SIZE_ARGUMENTS:
+            if name in field_def.args:
+                default = field_def.args[name].default_value
+                return clamp_page_size(default if isinstance(default, int) else None)
+
+        field_type = field_def.type
+        if isinstance(field_type, GraphQLNonNull):
+            field_type = field_type.of_type
+        if isinstance(field_type, GraphQLList):
+            return int(get_query_limit("DEFAULT_LIST_SIZE"))
+        return 1
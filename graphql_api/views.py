@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed
+from django.utils.cache import patch_cache_control
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
+from graphql import (
+    ExecutionResult,
+    GraphQLError,
+    OperationType,
+    execute,
+    get_operation_ast,
+    parse,
+    specified_rules,
+    validate,
+    validate_schema,
+)
+
+from graphql_api.caching import get_cached_result, is_public_operation, result_cache_key, set_cached_result
+from graphql_api.persisted import (
+    PERSISTED_QUERY_HASH_MISMATCH,
+    PERSISTED_QUERY_NOT_FOUND,
+    CachedDocument,
+    document_cache,
+    get_persisted_hash,
+    get_persisted_setting,
+    lookup_persisted_query,
+    query_hash,
+    register_persisted_query,
+)
+from graphql_api.validation import QueryComplexityRule, collect_metrics, log_operation_metrics
+
+# Флаг на request: ответ можно кешировать по HTTP (см. dispatch)
+HTTP_CACHEABLE_ATTR = "graphql_http_cacheable"
+
+
+class ShopGraphQLView(GraphQLView):
+    """
+    GraphQL endpoint магазина.
+
+    К стандартным правилам валидации добавлен анализ глубины и стоимости
+    запроса: слишком тяжёлые операции отклоняются до выполнения резолверов.
+
+    Поддерживаются automatic persisted queries; разобранные и провалидированные
+    документы кешируются (graphql_api/persisted.py), результаты публичных
+    запросов каталога — тоже (graphql_api/caching.py).
+    """
+
+    validation_rules = (*specified_rules, QueryComplexityRule)
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        response: HttpResponse = super().dispatch(request, *args, **kwargs)
+
+        if getattr(request, HTTP_CACHEABLE_ATTR, False) and response.status_code == 200:
+            patch_cache_control(response, public=True, max_age=get_persisted_setting("HTTP_MAX_AGE"))
+            # Set-Cookie делает ответ некешируемым для прокси; токен здесь не нужен
+            response.cookies.pop(settings.CSRF_COOKIE_NAME, None)
+
+        return response
+
+    # ------------------------------------------------------------------
+    # Выполнение (повторяет GraphQLView.execute_graphql_request,
+    # но берёт документ из persisted-реестра и кеша документов)
+    # ------------------------------------------------------------------
+    def execute_graphql_request(
+        self,
+        request: HttpRequest,
+        data: Dict[str, Any],
+        query: Optional[str],
+        variables: Optional[Dict[str, Any]],
+        operation_name: Optional[str],
+        show_graphiql: bool = False,
+    ) -> Optional[ExecutionResult]:
+        persisted_hash = get_persisted_hash(request, data)
+        if persisted_hash:
+            if query:
+                if query_hash(query) != persisted_hash:
+                    return ExecutionResult(errors=[GraphQLError(PERSISTED_QUERY_HASH_MISMATCH)])
+                register_persisted_query(persisted_hash, query)
+            else:
+                query = lookup_persisted_query(persisted_hash)
+                if query is None:
+                    return ExecutionResult(errors=[GraphQLError(PERSISTED_QUERY_NOT_FOUND)])
+
+        if not query:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        schema = self.schema.graphql_schema
+
+        schema_validation_errors = validate_schema(schema)
+        if schema_validation_errors:
+            return ExecutionResult(data=None, errors=schema_validation_errors)
+
+        key = persisted_hash or query_hash(query)
+        cached = document_cache.get(key)
+
+        if cached is not None:
+            document = cached.document
+        else:
+            try:
+                document = parse(query)
+            except Exception as e:
+                return ExecutionResult(errors=[e])
+
+        operation_ast = get_operation_ast(document, operation_name)
+
+        if request.method == "GET" and operation_ast is not None and operation_ast.operation != OperationType.QUERY:
+            if show_graphiql:
+                return None
+
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ["POST"],
+                    f"Can only perform a {operation_ast.operation.value} operation from a POST request.",
+                )
+            )
+
+        if cached is not None:
+            for metrics in cached.metrics:
+                log_operation_metrics(metrics, cached=True)
+        else:
+            with collect_metrics() as collected:
+                validation_errors = validate(
+                    schema,
+                    document,
+                    self.validation_rules,
+                    graphene_settings.MAX_VALIDATION_ERRORS,
+                )
+
+            if validation_errors:
+                return ExecutionResult(data=None, errors=validation_errors)
+
+            document_cache.set(key, CachedDocument(document=document, metrics=tuple(collected)))
+
+        # Публичные поля каталога одинаковы для всех пользователей — отдаём из кеша
+        public = is_public_operation(operation_ast)
+        # Persisted GET к публичным полям: URL стабилен, ответ можно кешировать по HTTP
+        http_cacheable = public and request.method == "GET" and bool(persisted_hash)
+
+        result_key: Optional[str] = None
+        if public:
+            result_key = result_cache_key(key, operation_name, variables)
+            cached_data = get_cached_result(result_key)
+            if cached_data is not None:
+                setattr(request, HTTP_CACHEABLE_ATTR, http_cacheable)
+                return ExecutionResult(data=cached_data)
+
+        try:
+            execute_options: Dict[str, Any] = {
+                "root_value": self.get_root_value(request),
+                "context_value": self.get_context(request),
+                "variable_values": variables,
+                "operation_name": operation_name,
+                "middleware": self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                execute_options["execution_context_class"] = self.execution_context_class
+
+            if (
+                operation_ast is not None
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute(schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result  # type: ignore[return-value]
+
+            result = execute(schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+        if not result.errors:
+            if result_key is not None:
+                set_cached_result(result_key, result.data)
+            setattr(request, HTTP_CACHEABLE_ATTR, http_cacheable)
+
+        return result  # type: ignore[return-value]
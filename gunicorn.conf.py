@@ -1,13 +1,92 @@
 import os
 
-workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+from main.server_profile import auto_profile, cpu_count, memory_limit_mb
+
+# ---------------------------------------------------------
+# Режим сервера
+#   wsgi — синхронные воркеры (main.wsgi), по умолчанию;
+#   asgi — uvicorn-воркеры (main.asgi): async-представления каталога,
+#          карточки, корзины и списков API ждут БД, не занимая поток,
+#          и один процесс держит сотни медленных клиентов.
+# ---------------------------------------------------------
+server_mode = os.getenv("SERVER_MODE", "wsgi")
+
+if server_mode == "asgi":
+    wsgi_app = "main.asgi:application"
+else:
+    wsgi_app = "main.wsgi:application"
+
+# ---------------------------------------------------------
+# Профиль процессов
+#   default    — 1 воркер без preload (разработка, демо);
+#   production — воркеры/потоки по CPU и памяти (main/server_profile.py),
+#                preload_app и прогрев (main/warmup.py).
+# GUNICORN_WORKERS / GUNICORN_THREADS / GUNICORN_PRELOAD задают значения явно.
+# ---------------------------------------------------------
+gunicorn_profile = os.getenv("GUNICORN_PROFILE", "default")
+
+if gunicorn_profile == "production":
+    _profile = auto_profile(
+        server_mode,
+        cpus=cpu_count(),
+        memory_mb=memory_limit_mb(),
+        worker_memory_mb=int(os.getenv("GUNICORN_WORKER_MEMORY_MB", "150")),
+        reserve_mb=int(os.getenv("GUNICORN_RESERVE_MEMORY_MB", "256")),
+        threads=int(os.getenv("GUNICORN_THREADS", "4")),
+    )
+    workers = int(os.getenv("GUNICORN_WORKERS", str(_profile.workers)))
+    threads = _profile.threads
+    worker_class = _profile.worker_class
+    preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+    # Перезапуск воркера с preload — fork от master без повторного импорта Django
+    max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+else:
+    workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+    threads = int(os.getenv("GUNICORN_THREADS", "1"))
+    if server_mode == "asgi":
+        worker_class = "uvicorn_worker.UvicornWorker"
+    preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+    max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "500"))
+
 timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
 graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
-
-max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "500"))
 max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "50"))
 
 accesslog = "-"
 errorlog = "-"
 loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
 capture_output = True
+
+
+# ---------------------------------------------------------
+# Хуки: прогрев и соединения после fork
+# ---------------------------------------------------------
+def when_ready(server):
+    # preload: приложение уже загружено в master — прогреваем до fork,
+    # воркеры делят прогретые структуры (copy-on-write)
+    if server.cfg.preload_app:
+        from main.warmup import warm_up
+
+        server.log.info("Warm-up done in master: %s", ", ".join(warm_up()))
+
+
+def post_fork(server, worker):
+    # Соединения и пулы, открытые в master до fork, воркеры использовать не должны
+    if server.cfg.preload_app:
+        from django.core.cache import caches
+        from django.db import connections
+
+        connections.close_all()
+        for connection in connections.all(initialized_only=True):
+            if hasattr(connection, "close_pool"):
+                connection.close_pool()
+        caches.close_all()
+
+
+def post_worker_init(worker):
+    # Без preload приложение загружается в каждом воркере — прогреваем там,
+    # но GraphQL оставляем ленивым: его загрузит первый запрос к /graphql/
+    if not worker.cfg.preload_app:
+        from main.warmup import warm_up
+
+        worker.log.info("Warm-up done: %s", ", ".join(warm_up(graphql=False)))
@@ -0,0 +1,50 @@
+"""
+Общий кеш процессов: CACHES["default"] по CACHE_URL.
+
+В кеше лежат данные, которые должны быть одинаковыми во всех воркерах
+gunicorn / uvicorn: метки ETag / Last-Modified (products/versioning.py),
+версия каталога и результаты GraphQL (graphql_api/caching.py), реестр
+persisted queries, права на отзыв (reviews/eligibility.py). Кеш в памяти
+процесса (LocMemCache) обновил бы только воркер, выполнивший запись:
+остальные отвечали бы 304 на изменённые товары.
+
+Используется main/settings.py. CACHE_URL:
+- db[://<таблица>]     — (по умолчанию) DatabaseCache в основной БД,
+                         таблица django_cache (manage.py createcachetable);
+- redis://… / rediss://… — RedisCache (нужен пакет redis);
+- memcached://host:port — PyMemcacheCache (нужен пакет pymemcache);
+- locmem://             — память процесса: только один процесс (разработка).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+DEFAULT_CACHE_TABLE = "django_cache"
+
+
+def cache_config(url: str, max_entries: int = 100_000) -> Dict[str, Any]:
+    """
+    Возвращает настройки CACHES["default"] для CACHE_URL.
+
+    max_entries — предел записей для db и locmem (по умолчанию у Django 300:
+    метки 100 000 товаров постоянно вытеснялись бы). Вытесненная метка
+    не ошибка — она восстанавливается из БД при следующем запросе.
+    """
+    parts = urlsplit(url or "db://")
+    scheme = parts.scheme or parts.path
+
+    if scheme == "db":
+        return {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": parts.netloc or DEFAULT_CACHE_TABLE,
+            "OPTIONS": {"MAX_ENTRIES": max_entries},
+        }
+    if scheme in ("redis", "rediss"):
+        return {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": url}
+    if scheme == "memcached":
+        return {"BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache", "LOCATION": parts.netloc}
+    if scheme == "locmem":
+        return {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "OPTIONS": {"MAX_ENTRIES": max_entries}}
+    raise ValueError(f"CACHE_URL must start with db, redis, rediss, memcached or locmem, got {url!r}")
@@ -0,0 +1,95 @@
+"""
+Соединения с PostgreSQL: режим переиспользования, пул и серверные таймауты.
+
+Используется main/settings.py. Режим задаёт DB_CONNECTION_MODE:
+- direct      — новое соединение на каждый запрос (CONN_MAX_AGE=0);
+- persistent  — (по умолчанию) постоянное соединение на поток воркера
+                на DB_CONN_MAX_AGE секунд, перед повторным использованием
+                проверяется (CONN_HEALTH_CHECKS);
+- pool        — пул psycopg 3 в каждом процессе (OPTIONS["pool"]): min_size
+                соединений открываются заранее, при выдаче соединение
+                проверяется (CONN_HEALTH_CHECKS); подходит и для ASGI,
+                где постоянные соединения на поток не используются;
+- pgbouncer   — внешний пулер в режиме transaction: соединение с pgbouncer
+                постоянное, серверные курсоры отключены (курсор не переживает
+                транзакцию на другом серверном соединении).
+
+Таймауты (statement_timeout, idle_in_transaction_session_timeout) передаются
+серверу параметром libpq options при открытии соединения. pgbouncer этот
+параметр не пропускает — там таймауты задаются в его конфигурации
+(query_timeout, idle_transaction_timeout).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+CONNECTION_MODES = ("direct", "persistent", "pool", "pgbouncer")
+
+
+def default_pool_size(server_mode: str, threads: int) -> int:
+    """
+    Размер пула одного воркера: WSGI-поток держит не больше одного соединения,
+    под ASGI sync-код запросов выполняется в отдельных потоках — пул ограничивает
+    их число, лишние запросы ждут соединение (DB_POOL_TIMEOUT).
+    """
+    if server_mode == "asgi":
+        return 10
+    return max(1, threads)
+
+
+def server_options(statement_timeout_ms: int, idle_in_transaction_ms: int) -> str:
+    """Значение libpq options: SET-параметры сессии, 0 — без ограничения."""
+    params = {
+        "statement_timeout": statement_timeout_ms,
+        "idle_in_transaction_session_timeout": idle_in_transaction_ms,
+    }
+    return " ".join(f"-c {name}={value}" for name, value in params.items() if value > 0)
+
+
+def configure_database(
+    database: Mapping[str, Any],
+    mode: str,
+    conn_max_age: int = 600,
+    pool_min_size: int = 1,
+    pool_max_size: int = 4,
+    pool_timeout: float = 10,
+    statement_timeout_ms: int = 0,
+    idle_in_transaction_ms: int = 0,
+) -> Dict[str, Any]:
+    """Возвращает копию настроек соединения DATABASES["default"] для режима mode."""
+    if mode not in CONNECTION_MODES:
+        raise ValueError(f"DB_CONNECTION_MODE must be one of {', '.join(CONNECTION_MODES)}, got {mode!r}")
+
+    config = {**database, "OPTIONS": dict(database.get("OPTIONS", {}))}
+    if "postgresql" not in config["ENGINE"]:
+        # SQLite (тесты, локальный запуск): пул и таймауты PostgreSQL не применимы
+        return config
+
+    options = config["OPTIONS"]
+    # Для пула Django передаёт проверку в ConnectionPool(check=...): соединение
+    # проверяется при выдаче из пула
+    config["CONN_HEALTH_CHECKS"] = mode != "direct"
+
+    if mode == "direct":
+        config["CONN_MAX_AGE"] = 0
+    elif mode == "persistent":
+        config["CONN_MAX_AGE"] = conn_max_age
+    elif mode == "pool":
+        # Пул несовместим с постоянными соединениями Django: соединение
+        # возвращается в пул в конце запроса
+        config["CONN_MAX_AGE"] = 0
+        options["pool"] = {
+            "min_size": min(pool_min_size, pool_max_size),
+            "max_size": pool_max_size,
+            "timeout": pool_timeout,
+        }
+    else:
+        config["CONN_MAX_AGE"] = conn_max_age
+        config["DISABLE_SERVER_SIDE_CURSORS"] = True
+        return config
+
+    timeouts = server_options(statement_timeout_ms, idle_in_transaction_ms)
+    if timeouts:
+        options["options"] = " ".join(filter(None, [options.get("options", ""), timeouts]))
+    return config
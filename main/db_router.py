@@ -0,0 +1,129 @@
+"""
+Чтение каталога и аналитики с реплики PostgreSQL.
+
+ReplicaRouter (settings.DATABASE_ROUTERS) отправляет чтение моделей из
+REPLICA_READ_APPS (каталог: товары, категории, отзывы) на алиас
+REPLICA_DATABASE. Аналитика (staff dashboard, агрегаты админки, GraphQL
+totalRevenue / topProducts) выбирает БД явно: .using(analytics_db()).
+
+Чтение идёт с основной БД, если:
+- реплика не настроена (нет алиаса в DATABASES) или недоступна —
+  после ошибки подключения реплика пропускается REPLICA_RETRY_SECONDS;
+- открыта транзакция на основной БД (select_for_update, проверка остатков);
+- запрос «закреплён» за основной БД (read-your-writes): после записи
+  в этом же запросе, для POST / PUT / PATCH / DELETE и по cookie
+  REPLICA_PIN_COOKIE (ReplicaPinningMiddleware). Cookie на
+  REPLICA_PIN_SECONDS ставит только запрос, который сам писал в БД:
+  так пользователь видит свои изменения, пока реплика догоняет основную
+  БД, а запросы с cookie окно не продлевают.
+
+Служебные таблицы REPLICA_PIN_IGNORED_APPS (DatabaseCache, сессии) не
+закрепляют: их пишет и анонимный GET с холодным кешем, а чтение с
+реплики к ним не относится.
+
+Запись всегда идёт в основную БД, миграции — только в неё.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Any, Optional, Type
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+REPLICA_DATABASE = "replica"
+
+# Чтение в текущем запросе (или management-команде) — с основной БД
+_pinned: ContextVar[bool] = ContextVar("replica_pinned", default=False)
+# Текущий запрос писал в таблицы приложений — нужен cookie
+_wrote: ContextVar[bool] = ContextVar("replica_wrote", default=False)
+
+# monotonic-время, до которого реплика считается недоступной
+_replica_down_until = 0.0
+
+
+def pin_to_primary() -> None:
+    """Дальнейшее чтение в текущем контексте — с основной БД."""
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+def _replica_available() -> bool:
+    global _replica_down_until
+
+    if REPLICA_DATABASE not in connections.settings or time.monotonic() < _replica_down_until:
+        return False
+    try:
+        connections[REPLICA_DATABASE].ensure_connection()
+    except OperationalError:
+        _replica_down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        return False
+    return True
+
+
+def analytics_db() -> str:
+    """Алиас БД для чтения: реплика, если её можно использовать (см. описание модуля)."""
+    if is_pinned() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    return REPLICA_DATABASE if _replica_available() else DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Связанные объекты читаем из той же БД, что и исходный
+            return str(instance._state.db)
+        if model._meta.app_label not in settings.REPLICA_READ_APPS:
+            return None
+        return analytics_db()
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        if model._meta.app_label not in settings.REPLICA_PIN_IGNORED_APPS:
+            _wrote.set(True)
+            pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        # Реплика — копия основной БД: связи между алиасами допустимы
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> Optional[bool]:
+        return db != REPLICA_DATABASE
+
+
+# ======================================================================
+# MIDDLEWARE
+# ======================================================================
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """
+    Read-your-writes: закрепляет запрос за основной БД (см. описание модуля)
+    и ставит cookie, только если этот запрос писал в таблицы приложений.
+    """
+
+    def process_request(self, request: HttpRequest) -> None:
+        unsafe = request.method not in ("GET", "HEAD", "OPTIONS")
+        _pinned.set(unsafe or settings.REPLICA_PIN_COOKIE in request.COOKIES)
+        _wrote.set(False)
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        if _wrote.get():
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        # Поток gthread-воркера обслуживает следующие запросы в том же контексте
+        _pinned.set(False)
+        _wrote.set(False)
+        return response
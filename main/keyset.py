@@ -0,0 +1,93 @@
+"""
+Keyset-пагинация: курсоры и условие «строго после курсора».
+
+Курсор — base64(JSON) со значениями полей сортировки последнего элемента
+страницы. Следующая страница выбирается условием WHERE (a, b) > (x, y)
+(в развёрнутом виде), а не OFFSET: стоимость запроса не растёт с номером
+страницы, если под сортировку есть индекс.
+
+Используется GraphQL-connections (graphql_api/connections.py) и лентой
+отзывов на карточке товара (reviews/pagination.py). Модуль не импортирует
+graphene — его можно использовать из представлений, загружаемых при старте.
+
+Курсор приходит от клиента: значения приводятся к типам полей сортировки
+(Field.to_python), поддельный или повреждённый курсор — InvalidCursor
+(ValueError), а не ошибка базы при выполнении запроса.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import json
+from decimal import Decimal
+from typing import Any, List, Sequence, Type, cast
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Курсор повреждён, подделан или выдан для другой сортировки."""
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(obj: models.Model, ordering: Sequence[str]) -> str:
+    values = [_cursor_value(getattr(obj, field.lstrip("-"))) for field in ordering]
+    payload = json.dumps({"o": list(ordering), "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _ordering_field(model: Type[models.Model], name: str) -> models.Field[Any, Any]:
+    return cast("models.Field[Any, Any]", model._meta.pk if name == "pk" else model._meta.get_field(name))
+
+
+def decode_cursor(cursor: str, ordering: Sequence[str], model: Type[models.Model]) -> List[Any]:
+    """
+    Значения полей сортировки из курсора, приведённые к типам полей model.
+    Курсор другой сортировки или значение не того типа — InvalidCursor.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values = payload["v"]
+        valid = payload["o"] == list(ordering) and len(values) == len(ordering)
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        valid = False
+
+    if not valid:
+        raise InvalidCursor("Invalid cursor.")
+
+    fields = [_ordering_field(model, name.lstrip("-")) for name in ordering]
+    try:
+        parsed = [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, TypeError, ValueError, OverflowError):
+        raise InvalidCursor("Invalid cursor.")
+    # None не сравнивается в WHERE (a > x): такого курсора encode_cursor не выдаёт
+    if any(value is None for value in parsed):
+        raise InvalidCursor("Invalid cursor.")
+    return parsed
+
+
+def after_filter(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """
+    Условие «строго после курсора» для сортировки ordering:
+    (a > x) OR (a = x AND b > y) OR ... (для убывающих полей — <).
+    """
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        branch = Q(**{f"{name}__{lookup}": values[index]})
+        for prev_field, prev_value in zip(ordering[:index], values[:index]):
+            branch &= Q(**{prev_field.lstrip("-"): prev_value})
+        condition |= branch
+    return condition
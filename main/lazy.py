@@ -0,0 +1,34 @@
+"""
+Ленивые представления для тяжёлых подсистем.
+
+drf_spectacular (генератор OpenAPI, Swagger / Redoc) и GraphQL (graphene,
+graphql-core, схема graphql_api) импортируются не при загрузке main.urls,
+а при первом запросе к своему URL. Процесс, который отдаёт только HTML
+и REST, их не загружает вовсе.
+"""
+
+from __future__ import annotations
+
+from functools import cache, wraps
+from typing import Any, Callable
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path: str, **initkwargs: Any) -> Callable[..., HttpResponse]:
+    """
+    Представление-заглушка: класс dotted_path импортируется и
+    превращается в view (as_view(**initkwargs)) при первом вызове.
+    """
+
+    @cache
+    def load() -> Callable[..., HttpResponse]:
+        view: Callable[..., HttpResponse] = import_string(dotted_path).as_view(**initkwargs)
+        return view
+
+    def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return load()(request, *args, **kwargs)
+
+    view.load = load  # type: ignore[attr-defined]
+    return wraps(load)(view)
@@ -0,0 +1,100 @@
+"""
+Размер пула процессов Gunicorn по ресурсам машины (контейнера).
+
+Используется gunicorn.conf.py (профиль production) и scripts/bench_gunicorn.py.
+Модуль не импортирует Django: конфигурация Gunicorn читается до загрузки приложения.
+
+Правила:
+- WSGI: 2 × CPU + 1 воркеров gthread, по GUNICORN_THREADS потоков
+  (потоки ждут БД и медленных клиентов, не занимая отдельный процесс);
+- ASGI: по одному uvicorn-воркеру на CPU — конкурентность даёт event loop;
+- в обоих случаях воркеров не больше, чем помещается в память:
+  (лимит − резерв) / память на воркер.
+
+CPU и память берутся из лимитов cgroup (Docker), иначе — из ОС.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+CGROUP_V2_CPU = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V2_MEMORY = Path("/sys/fs/cgroup/memory.max")
+CGROUP_V1_MEMORY = Path("/sys/fs/cgroup/memory/memory.limit_in_bytes")
+
+# Значения больше — «без лимита» (cgroup v1 пишет почти 2**63)
+UNLIMITED_BYTES = 1 << 60
+
+ASGI_WORKER_CLASS = "uvicorn_worker.UvicornWorker"
+
+
+@dataclass(frozen=True)
+class ServerProfile:
+    workers: int
+    threads: int
+    worker_class: str
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def cpu_count() -> int:
+    """CPU, доступные процессу: квота cgroup (cpu.max), affinity или os.cpu_count()."""
+    raw = _read(CGROUP_V2_CPU)
+    if raw:
+        quota, _, period = raw.partition(" ")
+        if quota.isdigit() and period.isdigit() and int(period):
+            return max(1, math.ceil(int(quota) / int(period)))
+
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def memory_limit_mb() -> Optional[int]:
+    """Лимит памяти в МБ: cgroup v2 / v1 или физическая память. None — определить не удалось."""
+    for path in (CGROUP_V2_MEMORY, CGROUP_V1_MEMORY):
+        raw = _read(path)
+        if raw and raw.isdigit() and int(raw) < UNLIMITED_BYTES:
+            return int(raw) // 2**20
+
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2**20
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def auto_profile(
+    server_mode: str,
+    cpus: int,
+    memory_mb: Optional[int],
+    worker_memory_mb: int = 150,
+    reserve_mb: int = 256,
+    threads: int = 4,
+) -> ServerProfile:
+    """
+    Профиль для заданных ресурсов (см. описание модуля).
+
+    worker_memory_mb — RSS одного воркера под нагрузкой,
+    reserve_mb — память master-процесса и остального контейнера.
+    """
+    if server_mode == "asgi":
+        by_cpu, threads, worker_class = cpus, 1, ASGI_WORKER_CLASS
+    else:
+        by_cpu = 2 * cpus + 1
+        worker_class = "gthread" if threads > 1 else "sync"
+
+    workers = by_cpu
+    if memory_mb is not None:
+        by_memory = (memory_mb - reserve_mb) // worker_memory_mb
+        workers = min(workers, by_memory)
+
+    return ServerProfile(workers=max(1, workers), threads=max(1, threads), worker_class=worker_class)
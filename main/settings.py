@@ -12,11 +12,16 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
+from typing import Any
 
 import dj_database_url
 from dotenv import load_dotenv
 
+from main.cache import cache_config
+from main.database import configure_database, default_pool_size
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -61,7 +66,10 @@ INSTALLED_APPS = [
     "rest_framework",
     "drf_spectacular",
     "drf_spectacular_sidecar",
-    "graphene_django",
+    # graphene_django не подключаем как приложение: его __init__ импортирует graphene
+    # и graphql-core при старте каждого процесса. GraphQL загружается при первом
+    # запросе к /graphql/ (main/lazy.py), шаблон GraphiQL — из GRAPHENE_TEMPLATES_DIR,
+    # его статика — из STATICFILES_DIRS.
     # Local apps
     "graphql_api",
     "products.apps.ProductsConfig",
@@ -76,9 +84,49 @@ GRAPHENE = {
     "SCHEMA": "graphql_api.schema.schema",
 }
 
+# Лимиты сложности GraphQL-запросов (graphql_api/validation.py)
+GRAPHQL_QUERY_LIMITS = {
+    "MAX_DEPTH": int(os.getenv("GRAPHQL_MAX_DEPTH", "8")),
+    "MAX_COST": int(os.getenv("GRAPHQL_MAX_COST", "1000")),
+    "DEFAULT_LIST_SIZE": 20,
+    "MAX_PAGE_SIZE": int(os.getenv("GRAPHQL_MAX_PAGE_SIZE", "100")),
+}
+
+# Общий кеш всех воркеров (main/cache.py): метки ETag, версия каталога GraphQL,
+# права на отзыв. По умолчанию — таблица django_cache в основной БД.
+CACHES = {"default": cache_config(os.getenv("CACHE_URL", "db://"), int(os.getenv("CACHE_MAX_ENTRIES", "100000")))}
+
+# Persisted queries и кеш разобранных документов (graphql_api/persisted.py)
+GRAPHQL_PERSISTED_QUERIES = {
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": int(os.getenv("GRAPHQL_PERSISTED_TIMEOUT", str(60 * 60 * 24))),
+    "DOCUMENT_CACHE_SIZE": int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "256")),
+    "HTTP_MAX_AGE": int(os.getenv("GRAPHQL_PERSISTED_MAX_AGE", "60")),
+}
+
+# Кеширующий прокси перед Django (products/edge_cache.py, nginx.conf)
+EDGE_CACHE = {
+    "MAX_AGE": int(os.getenv("EDGE_CACHE_MAX_AGE", "30")),
+    "PURGER": os.getenv("EDGE_CACHE_PURGER", "products.edge_cache.NullPurger"),
+    "PURGE_FILE": os.getenv("EDGE_CACHE_PURGE_FILE", str(BASE_DIR / "edge_purge.log")),
+    "PURGE_BASE_URL": os.getenv("EDGE_CACHE_PURGE_URL", "http://nginx"),
+    # Потоки purge в каждом процессе (не в запросе); 0 — сразу после коммита
+    "PURGE_WORKERS": int(os.getenv("EDGE_CACHE_PURGE_WORKERS", "1")),
+}
+
+# Кеш результатов публичных запросов каталога (graphql_api/caching.py)
+GRAPHQL_RESULT_CACHE = {
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": int(os.getenv("GRAPHQL_RESULT_CACHE_TIMEOUT", "60")),
+}
+
+# Кеш купленных и отрецензированных товаров пользователя (reviews/eligibility.py)
+REVIEW_ELIGIBILITY_CACHE_TIMEOUT = int(os.getenv("REVIEW_ELIGIBILITY_CACHE_TIMEOUT", str(60 * 60)))
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "main.db_router.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -89,10 +137,14 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "main.urls"
 
+# Шаблоны и статика graphene_django (GraphiQL); find_spec не выполняет код пакета
+GRAPHENE_PACKAGE_DIR = Path(find_spec("graphene_django").origin).parent  # type: ignore[union-attr, arg-type]
+GRAPHENE_TEMPLATES_DIR = GRAPHENE_PACKAGE_DIR / "templates"
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [BASE_DIR / "templates"],
+        "DIRS": [BASE_DIR / "templates", GRAPHENE_TEMPLATES_DIR],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -113,9 +165,10 @@ WSGI_APPLICATION = "main.wsgi.application"
 # Database
 
 database_url = os.getenv("DATABASE_URL")
+DATABASES: dict[str, Any]
 
 if database_url:
-    DATABASES = {"default": dj_database_url.parse(database_url, conn_max_age=600)}
+    DATABASES = {"default": dj_database_url.parse(database_url)}
 else:
     DATABASES = {
         "default": {
@@ -128,6 +181,52 @@ else:
         }
     }
 
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+
+# Переиспользование соединений, пул и серверные таймауты — см. main/database.py.
+# Под ASGI по умолчанию пул: запросы выполняются в разных потоках, постоянное
+# соединение осталось бы открытым на каждый поток.
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE", "pool" if SERVER_MODE == "asgi" else "persistent")
+db_connection_options: dict[str, Any] = {
+    "conn_max_age": int(os.getenv("DB_CONN_MAX_AGE", "600")),
+    "pool_min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    "pool_max_size": int(
+        os.getenv("DB_POOL_MAX_SIZE", str(default_pool_size(SERVER_MODE, int(os.getenv("GUNICORN_THREADS", "4")))))
+    ),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    # 0 — без ограничения (migrate и долгие management-команды)
+    "statement_timeout_ms": int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000")),
+    "idle_in_transaction_ms": int(os.getenv("DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", "60000")),
+}
+DATABASES["default"] = configure_database(DATABASES["default"], DB_CONNECTION_MODE, **db_connection_options)
+
+# Реплика для чтения каталога и аналитики (main/db_router.py) с теми же режимом
+# соединений и таймаутами. DATABASE_REPLICA_URL=mirror — локальная замена
+# реплики: та же БД под алиасом replica.
+database_replica_url = os.getenv("DATABASE_REPLICA_URL")
+if database_replica_url == "mirror":
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+elif database_replica_url:
+    DATABASES["replica"] = {
+        **configure_database(dj_database_url.parse(database_replica_url), DB_CONNECTION_MODE, **db_connection_options),
+        "TEST": {"MIRROR": "default"},
+    }
+
+if SERVER_MODE == "asgi" and DB_CONNECTION_MODE != "pool":
+    for database in DATABASES.values():
+        database["CONN_MAX_AGE"] = 0
+
+DATABASE_ROUTERS = ["main.db_router.ReplicaRouter"]
+# Приложения, чтение которых идёт с реплики (каталог)
+REPLICA_READ_APPS = ["products", "reviews"]
+# После записи запросы пользователя читают с основной БД столько секунд (лаг реплики)
+REPLICA_PIN_COOKIE = "pin_primary"
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+# Запись в эти таблицы (DatabaseCache, сессии) не закрепляет клиента за основной БД
+REPLICA_PIN_IGNORED_APPS = ["django_cache", "sessions"]
+# Сколько не обращаться к реплике после ошибки подключения
+REPLICA_RETRY_SECONDS = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -165,12 +264,37 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
+    # graphene_django/graphiql.js и др.: приложение не в INSTALLED_APPS (см. выше),
+    # поэтому AppDirectoriesFinder его статику не видит
+    GRAPHENE_PACKAGE_DIR / "static",
 ]
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Производные изображений товаров (products/images.py)
+PRODUCT_IMAGES = {
+    "WIDTHS": [160, 320, 640, 1280],
+    # Современные форматы; формат оригинала (JPEG / PNG) строится всегда
+    "FORMATS": [name for name in os.getenv("PRODUCT_IMAGE_FORMATS", "avif,webp").split(",") if name],
+    "QUALITY": {"avif": 55, "webp": 78, "jpeg": 82, "original": 88},
+    # Оригинал из очереди загрузок (products/image_queue.py): длинная сторона, px
+    "MAX_SIDE": 2560,
+    # Потоки обработки загрузок в каждом процессе; 0 — обработка сразу после коммита
+    "WORKERS": int(os.getenv("PRODUCT_IMAGE_WORKERS", "2")),
+}
+
+# Доставленные и отменённые заказы старше стольких месяцев переносятся
+# в архив командой archive_orders (orders/archive.py)
+ORDERS_ARCHIVE_AFTER_MONTHS = int(os.getenv("ORDERS_ARCHIVE_AFTER_MONTHS", "12"))
+
+# Резерв товаров корзины на время оформления заказа, секунд (cart/reservations.py)
+STOCK_RESERVATION_TTL = int(os.getenv("STOCK_RESERVATION_TTL", "600"))
+
+# Срок жизни ключей идемпотентности оформления заказа, секунд (orders/idempotency.py)
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", "86400"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -189,6 +313,10 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Готовая схема OpenAPI (manage.py build_openapi): /api/schema/ отдаёт её с диска,
+# без импорта drf_spectacular.openapi; если файла нет — схема генерируется на лету
+OPENAPI_SCHEMA_DIR = Path(os.getenv("OPENAPI_SCHEMA_DIR", BASE_DIR / "openapi"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Hop & Barley API",
     "DESCRIPTION": "API для интернет-магазина Hop & Barley. Каталог, корзина, заказы, отзывы, пользователи.",
@@ -197,6 +325,25 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 
+# -------------------------
+# Logging
+# -------------------------
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # метрики GraphQL-операций (depth / cost)
+        "graphql_api": {
+            "handlers": ["console"],
+            "level": os.getenv("GRAPHQL_LOGLEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+from django.core.cache import CacheHandler
+from django.core.management import call_command
+from django.test import override_settings
+
+from main.cache import cache_config
+
+
+# ---------------------------------------------------------
+# 1. CACHE_URL: по умолчанию — общая таблица в БД
+# ---------------------------------------------------------
+def test_cache_config() -> None:
+    assert cache_config("") == cache_config("db://") == cache_config("db")
+    assert cache_config("")["BACKEND"] == "django.core.cache.backends.db.DatabaseCache"
+    assert cache_config("db://shop_cache", max_entries=10) == {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "shop_cache",
+        "OPTIONS": {"MAX_ENTRIES": 10},
+    }
+    assert cache_config("redis://redis:6379/1")["LOCATION"] == "redis://redis:6379/1"
+    assert cache_config("memcached://mc:11211")["LOCATION"] == "mc:11211"
+    assert cache_config("locmem://")["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache"
+
+    with pytest.raises(ValueError):
+        cache_config("file:///tmp/cache")
+
+
+# ---------------------------------------------------------
+# 2. Запись одного воркера видна другому (отдельные обработчики кеша)
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_database_cache_is_shared_between_workers() -> None:
+    caches = {"default": cache_config("db://")}
+    with override_settings(CACHES=caches):
+        call_command("createcachetable", verbosity=0)
+
+    writer = CacheHandler(caches)["default"]
+    reader = CacheHandler(caches)["default"]
+
+    assert reader.get("catalog:stamp:catalog") is None
+    writer.set("catalog:stamp:catalog", "bumped", None)
+    assert reader.get("catalog:stamp:catalog") == "bumped"
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import pytest
+from django.db import connection
+
+from main.database import configure_database, default_pool_size
+
+POSTGRES: Dict[str, Any] = {
+    "ENGINE": "django.db.backends.postgresql",
+    "NAME": "hopbarley",
+    "OPTIONS": {"sslmode": "prefer"},
+}
+
+
+# ---------------------------------------------------------
+# 1. persistent: постоянное соединение с проверкой и таймауты
+# ---------------------------------------------------------
+def test_persistent_mode() -> None:
+    config = configure_database(POSTGRES, "persistent", conn_max_age=300, statement_timeout_ms=5000)
+
+    assert config["CONN_MAX_AGE"] == 300
+    assert config["CONN_HEALTH_CHECKS"] is True
+    assert config["OPTIONS"] == {"sslmode": "prefer", "options": "-c statement_timeout=5000"}
+    assert POSTGRES["OPTIONS"] == {"sslmode": "prefer"}
+
+
+# ---------------------------------------------------------
+# 2. pool: пул psycopg 3 без постоянных соединений Django
+# ---------------------------------------------------------
+def test_pool_mode() -> None:
+    config = configure_database(
+        POSTGRES, "pool", pool_min_size=8, pool_max_size=4, statement_timeout_ms=5000, idle_in_transaction_ms=60000
+    )
+
+    assert config["CONN_MAX_AGE"] == 0
+    assert config["CONN_HEALTH_CHECKS"] is True
+    assert config["OPTIONS"]["pool"] == {"min_size": 4, "max_size": 4, "timeout": 10}
+    assert config["OPTIONS"]["options"] == "-c statement_timeout=5000 -c idle_in_transaction_session_timeout=60000"
+
+
+# ---------------------------------------------------------
+# 3. direct, pgbouncer, SQLite и неизвестный режим
+# ---------------------------------------------------------
+def test_other_modes() -> None:
+    direct = configure_database(POSTGRES, "direct", statement_timeout_ms=5000)
+    assert direct["CONN_MAX_AGE"] == 0
+    assert direct["CONN_HEALTH_CHECKS"] is False
+
+    pgbouncer = configure_database(POSTGRES, "pgbouncer", statement_timeout_ms=5000)
+    assert pgbouncer["DISABLE_SERVER_SIDE_CURSORS"] is True
+    assert "options" not in pgbouncer["OPTIONS"]
+
+    sqlite = {"ENGINE": "django.db.backends.sqlite3", "NAME": "db.sqlite3"}
+    assert configure_database(sqlite, "pool", statement_timeout_ms=5000) == {**sqlite, "OPTIONS": {}}
+
+    with pytest.raises(ValueError):
+        configure_database(POSTGRES, "bouncer")
+
+
+# ---------------------------------------------------------
+# 4. Размер пула воркера
+# ---------------------------------------------------------
+def test_default_pool_size() -> None:
+    assert default_pool_size("wsgi", threads=4) == 4
+    assert default_pool_size("wsgi", threads=0) == 1
+    assert default_pool_size("asgi", threads=1) == 10
+
+
+# ---------------------------------------------------------
+# 5. PostgreSQL применяет statement_timeout из настроек
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_server_statement_timeout() -> None:
+    if connection.vendor != "postgresql":
+        pytest.skip("серверные таймауты задаются только для PostgreSQL")
+
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW statement_timeout")
+        value = cursor.fetchone()[0]
+
+    assert value != "0"
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from main import db_router
+from main.cache import cache_config
+from main.db_router import REPLICA_DATABASE, ReplicaRouter, analytics_db
+from orders.models import Order
+from products.models import Category, Product
+
+
+def _use_replica(request: pytest.FixtureRequest, **overrides: Any) -> str:
+    """
+    Локальная замена реплики: второй алиас на ту же тестовую БД. Алиас
+    добавляется до старта тестовой транзакции, чтобы Django разрешил
+    к нему запросы; транзакционный режим — реплика как отдельное соединение
+    видит только закоммиченные данные.
+    """
+    config = {**connections["default"].settings_dict, **overrides, "TEST": {"MIRROR": "default"}}
+    connections.settings[REPLICA_DATABASE] = config
+    db_router._replica_down_until = 0.0
+
+    def remove() -> None:
+        connections[REPLICA_DATABASE].close()
+        del connections[REPLICA_DATABASE]
+        del connections.settings[REPLICA_DATABASE]
+        db_router._replica_down_until = 0.0
+
+    request.addfinalizer(remove)
+    request.applymarker(pytest.mark.django_db(transaction=True, databases=["default", REPLICA_DATABASE]))
+    request.getfixturevalue("transactional_db")
+    return REPLICA_DATABASE
+
+
+@pytest.fixture
+def replica(request: pytest.FixtureRequest) -> str:
+    return _use_replica(request)
+
+
+@pytest.fixture
+def catalog(replica: str) -> Product:
+    category = Category.objects.create(name="Солод", slug="malt")
+    return Product.objects.create(name="Pale Ale Malt", slug="pale-ale-malt", category=category, price=10, stock=5)
+
+
+# ---------------------------------------------------------
+# 1. Без реплики всё читается с основной БД
+# ---------------------------------------------------------
+def test_without_replica_reads_primary() -> None:
+    assert Product.objects.all().db == "default"
+    assert analytics_db() == "default"
+
+
+# ---------------------------------------------------------
+# 2. Каталог читается с реплики, заказы и транзакции — с основной БД
+# ---------------------------------------------------------
+def test_catalog_reads_go_to_replica(catalog: Product) -> None:
+    response = Client().get(reverse("products:product_list"))
+
+    assert response.status_code == 200
+    assert catalog.name in response.content.decode()
+    assert settings.REPLICA_PIN_COOKIE not in response.cookies
+
+    db_router._pinned.set(False)
+    assert Product.objects.all().db == REPLICA_DATABASE
+    assert Order.objects.all().db == "default"
+    with transaction.atomic():
+        assert Product.objects.all().db == "default"
+    assert ReplicaRouter().allow_migrate(REPLICA_DATABASE, "products") is False
+
+
+# ---------------------------------------------------------
+# 3. Read-your-writes: запись закрепляет клиента за основной БД
+# ---------------------------------------------------------
+def test_write_pins_client_to_primary(catalog: Product, user_fixture: Any) -> None:
+    client = Client()
+    client.force_login(user_fixture)
+
+    response = client.post(reverse("cart:add", args=[catalog.id]), {"quantity": 1})
+    assert response.cookies[settings.REPLICA_PIN_COOKIE]["max-age"] == settings.REPLICA_PIN_SECONDS
+
+    with CaptureQueriesContext(connections[REPLICA_DATABASE]) as replica_queries:
+        assert client.get(reverse("products:product_detail", args=[catalog.slug])).status_code == 200
+    assert len(replica_queries) == 0
+
+    client.cookies.pop(settings.REPLICA_PIN_COOKIE)
+    with CaptureQueriesContext(connections[REPLICA_DATABASE]) as replica_queries:
+        assert client.get(reverse("products:product_detail", args=[catalog.slug])).status_code == 200
+    assert len(replica_queries) > 0
+
+
+# ---------------------------------------------------------
+# 4. Недоступная реплика: чтение с основной БД, повтор через REPLICA_RETRY_SECONDS
+# ---------------------------------------------------------
+def test_unavailable_replica_falls_back(request: pytest.FixtureRequest) -> None:
+    if connections["default"].vendor == "sqlite":
+        _use_replica(request, NAME="/nonexistent/replica.sqlite3")
+    else:
+        _use_replica(request, HOST="127.0.0.1", PORT="1", OPTIONS={"connect_timeout": 1})
+    db_router._pinned.set(False)
+
+    assert analytics_db() == "default"
+    assert db_router._replica_down_until > 0
+    assert Product.objects.all().db == "default"
+
+
+# ---------------------------------------------------------
+# 5. Аналитика staff dashboard считается на реплике
+# ---------------------------------------------------------
+def test_dashboard_uses_replica(catalog: Product, django_user_model: Any) -> None:
+    staff = django_user_model.objects.create_user(username="staff", password="x", is_staff=True)
+    client = Client()
+    client.force_login(staff)
+    client.cookies.pop(settings.REPLICA_PIN_COOKIE, None)
+
+    with CaptureQueriesContext(connections[REPLICA_DATABASE]) as replica_queries:
+        response = client.get(reverse("staff_dashboard:home"))
+
+    assert response.status_code == 200
+    assert response.context["products_total"] == 1
+    assert any("orders_order" in query["sql"] for query in replica_queries.captured_queries)
+
+
+# ---------------------------------------------------------
+# 6. Запись в DatabaseCache и сессии не закрепляет клиента;
+#    cookie ставит только запрос, который сам писал
+# ---------------------------------------------------------
+def test_cache_writes_and_pin_cookie_do_not_pin(catalog: Product) -> None:
+    caches = {"default": cache_config("db://")}
+    with override_settings(CACHES=caches):
+        call_command("createcachetable", verbosity=0)
+        client = Client()
+
+        # Холодный кеш: GET записывает метки ETag в django_cache
+        for url in (reverse("products:product_list"), reverse("products:product_detail", args=[catalog.slug])):
+            response = client.get(url)
+            assert response.status_code == 200
+            assert settings.REPLICA_PIN_COOKIE not in response.cookies
+            assert "public" in response["Cache-Control"]
+
+        # Cookie от прежней записи: чтение с основной БД, но окно не продлевается
+        client.cookies[settings.REPLICA_PIN_COOKIE] = "1"
+        with CaptureQueriesContext(connections[REPLICA_DATABASE]) as replica_queries:
+            response = client.get(reverse("products:product_detail", args=[catalog.slug]))
+        assert len(replica_queries) == 0
+        assert settings.REPLICA_PIN_COOKIE not in response.cookies
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Callable
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from cart.models import CartItem
+from orders.models import Order, OrderItem
+from products.models import Category, Product
+from reviews.models import Review
+from staff_dashboard.views import _created_between
+
+CheckPlan = Callable[..., str]
+
+
+@pytest.fixture
+def seeded(db: Any) -> dict[str, Any]:
+    """Данные, на которых у планировщика есть выбор между индексом и полным чтением."""
+    User = get_user_model()
+    users = User.objects.bulk_create([User(username=f"user{i}") for i in range(20)])
+    category = Category.objects.create(name="Хмель", slug="hops")
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Hop {i}",
+                slug=f"hop-{i}",
+                category=category,
+                price=10 + i,
+                stock=5,
+                is_active=i % 5 != 0,
+            )
+            for i in range(200)
+        ]
+    )
+    statuses = [status for status, _ in Order.STATUS_CHOICES]
+    orders = Order.objects.bulk_create(
+        [
+            Order(user=users[i % 20], status=statuses[i % len(statuses)], total_price=10, shipping_address="—")
+            for i in range(300)
+        ]
+    )
+    OrderItem.objects.bulk_create(
+        [OrderItem(order=order, product=products[i % 200], quantity=1, price=10) for i, order in enumerate(orders)]
+    )
+    Review.objects.bulk_create(
+        [Review(user=users[i % 20], product=products[i // 20], rating=5, comment="ok") for i in range(200)]
+    )
+    CartItem.objects.bulk_create(
+        [CartItem(session_key=f"guest-{i}", product=products[i], quantity=1) for i in range(100)]
+        + [CartItem(user=users[i], product=products[i], quantity=1) for i in range(20)]
+    )
+    return {"user": users[0], "product": products[1]}
+
+
+# ---------------------------------------------------------
+# 1. Каталог: активные товары по новизне и по цене
+# ---------------------------------------------------------
+def test_catalog_uses_index(seeded: dict[str, Any], assert_index_scan: CheckPlan) -> None:
+    active = Product.objects.filter(is_active=True)
+
+    assert_index_scan(active.order_by("-created_at")[:12], "products_product")
+    assert_index_scan(active.order_by("price")[:12], "products_product")
+
+
+# ---------------------------------------------------------
+# 2. Заказы: история пользователя и выборки staff dashboard
+# ---------------------------------------------------------
+def test_orders_use_index(seeded: dict[str, Any], assert_index_scan: CheckPlan) -> None:
+    today = timezone.localdate()
+    period = _created_between(today - timedelta(days=6), today)
+
+    assert_index_scan(Order.objects.filter(user=seeded["user"]).order_by("-created_at"), "orders_order")
+    assert_index_scan(Order.objects.filter(**period), "orders_order")
+    assert_index_scan(
+        Order.objects.filter(status__in=[Order.STATUS_PENDING, Order.STATUS_PENDING_PAYMENT], **period),
+        "orders_order",
+    )
+
+
+# ---------------------------------------------------------
+# 3. Отзывы товара и проверка покупки перед отзывом
+# ---------------------------------------------------------
+def test_reviews_and_purchase_check_use_index(seeded: dict[str, Any], assert_index_scan: CheckPlan) -> None:
+    product = seeded["product"]
+
+    assert_index_scan(Review.objects.filter(product=product).order_by("-created_at"), "reviews_review")
+    assert_index_scan(
+        OrderItem.objects.filter(order__user=seeded["user"], order__status__in=["paid", "delivered"], product=product),
+        "orders_orderitem",
+    )
+
+
+# ---------------------------------------------------------
+# 4. Гостевая корзина — по частичному индексу
+# ---------------------------------------------------------
+def test_guest_cart_uses_partial_index(seeded: dict[str, Any], assert_index_scan: CheckPlan) -> None:
+    plan = assert_index_scan(CartItem.objects.filter(session_key="guest-7", user__isnull=True), "cart_cartitem")
+
+    assert "cartitem_guest_session_idx" in plan
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from django.urls import get_resolver
+
+from main.server_profile import ASGI_WORKER_CLASS, auto_profile
+from main.warmup import warm_up
+
+
+# ---------------------------------------------------------
+# 1. WSGI: 2 × CPU + 1 воркеров gthread, если хватает памяти
+# ---------------------------------------------------------
+def test_wsgi_profile_by_cpu() -> None:
+    profile = auto_profile("wsgi", cpus=4, memory_mb=8192, threads=4)
+
+    assert profile.workers == 9
+    assert profile.threads == 4
+    assert profile.worker_class == "gthread"
+
+
+# ---------------------------------------------------------
+# 2. Память ограничивает число воркеров (но не меньше одного)
+# ---------------------------------------------------------
+def test_profile_limited_by_memory() -> None:
+    assert auto_profile("wsgi", cpus=8, memory_mb=1024, worker_memory_mb=150, reserve_mb=256).workers == 5
+    assert auto_profile("wsgi", cpus=8, memory_mb=128).workers == 1
+
+
+# ---------------------------------------------------------
+# 3. ASGI: воркер на CPU, без потоков
+# ---------------------------------------------------------
+def test_asgi_profile() -> None:
+    profile = auto_profile("asgi", cpus=4, memory_mb=None, threads=8)
+
+    assert (profile.workers, profile.threads, profile.worker_class) == (4, 1, ASGI_WORKER_CLASS)
+
+
+# ---------------------------------------------------------
+# 4. Прогрев: резолвер и шаблоны, без обращений к БД
+#    (тест без django_db — запрос к БД завершился бы ошибкой)
+# ---------------------------------------------------------
+def test_warm_up_without_db() -> None:
+    urls, templates, graphql = warm_up()
+
+    assert urls == "urls" and graphql == "graphql"
+    assert int(templates.split(":")[1]) > 0
+    assert get_resolver()._populated
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.contrib.staticfiles import finders
+from django.test import Client
+
+from main.lazy import lazy_view
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+# ---------------------------------------------------------
+# 1. Старт процесса не импортирует GraphQL и генератор схемы
+# ---------------------------------------------------------
+def test_boot_does_not_import_heavy_subsystems() -> None:
+    script = (
+        "import json, os, sys\n"
+        "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings')\n"
+        "from django.core.wsgi import get_wsgi_application\n"
+        "from django.urls import get_resolver\n"
+        "get_wsgi_application()\n"
+        "get_resolver().url_patterns\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    modules = set(json.loads(output.strip().splitlines()[-1]))
+
+    for name in ("graphene", "graphene_django", "graphql", "drf_spectacular.generators", "drf_spectacular.views"):
+        assert name not in modules, name
+
+
+# ---------------------------------------------------------
+# 2. lazy_view импортирует класс один раз
+# ---------------------------------------------------------
+def test_lazy_view_loads_once() -> None:
+    view: Any = lazy_view("django.views.generic.RedirectView", url="/target/")
+
+    assert view.load() is view.load()
+    assert view.load().view_initkwargs == {"url": "/target/"}
+
+
+# ---------------------------------------------------------
+# 3. /api/schema/ отдаёт готовый файл с диска
+# ---------------------------------------------------------
+def test_schema_served_from_disk(settings: Any, tmp_path: Path) -> None:
+    (tmp_path / "schema.yaml").write_text("openapi: 3.0.3\n", encoding="utf-8")
+    (tmp_path / "schema.json").write_text('{"openapi": "3.0.3"}', encoding="utf-8")
+    settings.OPENAPI_SCHEMA_DIR = tmp_path
+    client = Client()
+
+    response = client.get("/api/schema/")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/vnd.oai.openapi"
+    assert b"".join(response.streaming_content) == b"openapi: 3.0.3\n"
+
+    response = client.get("/api/schema/", {"format": "json"})
+    assert response["Content-Type"] == "application/vnd.oai.openapi+json"
+    assert json.loads(b"".join(response.streaming_content)) == {"openapi": "3.0.3"}
+
+    assert client.post("/api/schema/").status_code == 405
+
+
+# ---------------------------------------------------------
+# 4. Без файла схема генерируется на лету
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_schema_fallback_generates(settings: Any, tmp_path: Path) -> None:
+    settings.OPENAPI_SCHEMA_DIR = tmp_path / "missing"
+
+    response = Client().get("/api/schema/", HTTP_ACCEPT="application/vnd.oai.openapi+json")
+
+    assert response.status_code == 200
+    assert "/api/products/" in json.loads(response.content)["paths"]
+
+
+# ---------------------------------------------------------
+# 5. GraphiQL и GraphQL работают без graphene_django в INSTALLED_APPS
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_graphql_loaded_on_first_request() -> None:
+    client = Client()
+
+    page = client.get("/graphql/", HTTP_ACCEPT="text/html")
+    assert page.status_code == 200
+    assert b"graphiql" in page.content.lower()
+
+    response = client.post("/graphql/", {"query": "{ __typename }"}, content_type="application/json")
+    assert response.json() == {"data": {"__typename": "Query"}}
+
+
+# ---------------------------------------------------------
+# 6. Статика GraphiQL находится без graphene_django в INSTALLED_APPS
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_graphiql_static_found() -> None:
+    assert finders.find("graphene_django/graphiql.js")
+
+    page = Client().get("/graphql/", HTTP_ACCEPT="text/html")
+    assert b"graphene_django/graphiql.js" in page.content
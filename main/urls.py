@@ -6,10 +6,10 @@ from django.urls import include, path
 from django.views.decorators.csrf import csrf_exempt
 
 # Swagger / OpenAPI
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from api.openapi import openapi_schema
 
-# GraphQL
-from graphene_django.views import GraphQLView
+# drf_spectacular и GraphQL импортируются при первом запросе (см. main/lazy.py)
+from main.lazy import lazy_view
 
 # Local views
 from users.views import account_view
@@ -42,15 +42,15 @@ urlpatterns = [
     # -------------------------------------------------
     # Swagger / OpenAPI
     # -------------------------------------------------
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", openapi_schema, name="schema"),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
     path(
         "api/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
         name="redoc",
     ),
     # -------------------------------------------------
@@ -58,7 +58,7 @@ urlpatterns = [
     # -------------------------------------------------
     path(
         "graphql/",
-        csrf_exempt(GraphQLView.as_view(graphiql=True)),
+        csrf_exempt(lazy_view("graphql_api.views.ShopGraphQLView", graphiql=True)),
         name="graphql",
     ),
 ]
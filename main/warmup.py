@@ -0,0 +1,68 @@
+"""
+Прогрев процесса после загрузки приложения (хуки gunicorn.conf.py).
+
+Без прогрева первый запрос каждого воркера платит за:
+- заполнение URL-резолвера (reverse-словари строятся лениво);
+- компиляцию шаблонов (кешируются cached-загрузчиком в памяти процесса);
+- проверку GraphQL-схемы (graphql-core валидирует её при первом запросе).
+
+С preload_app прогрев выполняется в master до fork — воркеры получают
+прогретые структуры через copy-on-write. К БД прогрев не обращается.
+
+Без preload GraphQL не прогревается (graphql=False): воркер загружает его
+лениво, при первом запросе к /graphql/ (main/lazy.py).
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import List
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+
+def warm_urls() -> None:
+    get_resolver().url_patterns
+    reverse("products:product_list")
+
+
+def warm_templates() -> int:
+    """Компилирует шаблоны из TEMPLATES[...]["DIRS"]. Возвращает число шаблонов."""
+    count = 0
+    for engine in settings.TEMPLATES:
+        for directory in map(Path, engine.get("DIRS", [])):
+            for path in sorted(directory.rglob("*.html")):
+                try:
+                    get_template(path.relative_to(directory).as_posix())
+                except (TemplateDoesNotExist, TemplateSyntaxError) as exc:
+                    logger.warning("Template warm-up skipped %s: %s", path, exc)
+                    continue
+                count += 1
+    return count
+
+
+def warm_graphql() -> None:
+    from django.urls import resolve
+    from graphene_django.settings import graphene_settings
+    from graphql import validate_schema
+
+    resolve("/graphql/").func.load()
+    validate_schema(graphene_settings.SCHEMA.graphql_schema)
+
+
+def warm_up(graphql: bool = True) -> List[str]:
+    """Прогревает процесс. Возвращает список прогретых частей (для лога)."""
+    warm_urls()
+    templates = warm_templates()
+    parts = ["urls", f"templates:{templates}"]
+
+    if graphql:
+        warm_graphql()
+        parts.append("graphql")
+    return parts
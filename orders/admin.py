@@ -3,11 +3,17 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple
 
 from django.contrib import admin
+from django.contrib.admin.utils import unquote
 from django.db.models import Count, F, QuerySet, Sum
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect
 from django.utils.html import format_html
 
-from .models import Order, OrderItem
+from main.db_router import analytics_db
+from reviews.eligibility import forget_eligibility
+
+from .export import export_response
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, OrderItemRecord
 
 
 # =====================================================================
@@ -31,19 +37,41 @@ class OrderItemInline(admin.TabularInline):
 # =====================================================================
 
 
+def _update_status(queryset: QuerySet[Order], status: str) -> None:
+    """Массовая смена статуса: update() не вызывает сигналы — кеш права на отзыв сбрасываем сами."""
+    user_ids = list(queryset.order_by().values_list("user_id", flat=True).distinct())
+    queryset.update(status=status)
+    forget_eligibility(user_ids)
+
+
 @admin.action(description="Отметить как оплаченные")
 def mark_as_paid(modeladmin: admin.ModelAdmin[Any], request: HttpRequest, queryset: QuerySet[Order]) -> None:
-    queryset.update(status=Order.STATUS_PAID)
+    _update_status(queryset, Order.STATUS_PAID)
 
 
 @admin.action(description="Отменить заказ")
 def cancel_orders(modeladmin: admin.ModelAdmin[Any], request: HttpRequest, queryset: QuerySet[Order]) -> None:
-    queryset.update(status=Order.STATUS_CANCELLED)
+    _update_status(queryset, Order.STATUS_CANCELLED)
 
 
 @admin.action(description="Отметить как отправленные")
 def mark_as_shipped(modeladmin: admin.ModelAdmin[Any], request: HttpRequest, queryset: QuerySet[Order]) -> None:
-    queryset.update(status=Order.STATUS_SHIPPED)
+    _update_status(queryset, Order.STATUS_SHIPPED)
+
+
+@admin.action(description="Выгрузить в CSV (позиции заказов)")
+def export_orders_csv(
+    modeladmin: admin.ModelAdmin[Any], request: HttpRequest, queryset: QuerySet[Order]
+) -> StreamingHttpResponse:
+    # Выгрузка — с реплики (если есть): долгое чтение не нагружает основную БД
+    return export_response(queryset.using(analytics_db()), "csv")
+
+
+@admin.action(description="Выгрузить в JSONL")
+def export_orders_jsonl(
+    modeladmin: admin.ModelAdmin[Any], request: HttpRequest, queryset: QuerySet[Order]
+) -> StreamingHttpResponse:
+    return export_response(queryset.using(analytics_db()), "jsonl")
 
 
 # =====================================================================
@@ -127,7 +155,7 @@ class OrderAdmin(admin.ModelAdmin):
         "updated_at",
     )
 
-    actions = (mark_as_paid, mark_as_shipped, cancel_orders)
+    actions = (mark_as_paid, mark_as_shipped, cancel_orders, export_orders_csv, export_orders_jsonl)
 
     # ----------------------------------------------------------------------
     # OPTIMIZED QUERYSET
@@ -141,7 +169,9 @@ class OrderAdmin(admin.ModelAdmin):
     # ----------------------------------------------------------------------
     def changelist_view(self, request: HttpRequest, extra_context: Dict[str, Any] | None = None) -> Any:
 
-        qs = self.get_queryset(request)
+        # Агрегаты — с реплики и вместе с архивом; сам список заказов админка
+        # читает с основной БД (архивные — в ArchivedOrderAdmin)
+        qs = Order.objects.with_archive().using(analytics_db())
 
         # агрегаты
         stats: Dict[str, Any] = qs.aggregate(
@@ -158,7 +188,8 @@ class OrderAdmin(admin.ModelAdmin):
         pending = qs.filter(status=Order.STATUS_PENDING).count()
 
         top_products = (
-            OrderItem.objects.values(name=F("product__name"))
+            OrderItemRecord.objects.using(analytics_db())
+            .values(name=F("product__name"))
             .annotate(total_qty=Sum("quantity"))
             .order_by("-total_qty")[:5]
         )
@@ -170,6 +201,15 @@ class OrderAdmin(admin.ModelAdmin):
 
         return super().changelist_view(request, extra_context=extra_context)
 
+    def change_view(
+        self, request: HttpRequest, object_id: str, form_url: str = "", extra_context: Dict[str, Any] | None = None
+    ) -> HttpResponse:
+        # Заказ ушёл в архив: старые ссылки ведут на его карточку в архиве
+        pk = unquote(object_id)
+        if pk.isdigit() and self.get_object(request, pk) is None and ArchivedOrder.objects.filter(pk=pk).exists():
+            return redirect("admin:orders_archivedorder_change", pk)
+        return super().change_view(request, object_id, form_url, extra_context)
+
     # ----------------------------------------------------------------------
     # UI helpers
     # ----------------------------------------------------------------------
@@ -225,3 +265,41 @@ class OrderItemAdmin(admin.ModelAdmin):
     @admin.display(description="Сумма")
     def total(self, obj: OrderItem) -> str:
         return f"{obj.quantity * obj.price:.2f}"
+
+
+# =====================================================================
+# АРХИВ ЗАКАЗОВ (только просмотр; переносит команда archive_orders)
+# =====================================================================
+
+
+class ArchivedOrderItemInline(admin.TabularInline):
+    model = ArchivedOrderItem
+    extra = 0
+    can_delete = False
+
+    fields = ("product", "quantity", "price")
+    readonly_fields = fields
+
+    def has_add_permission(self, request: HttpRequest, obj: Any = None) -> bool:
+        return False
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ("id", "full_name", "status", "payment_method", "total_price", "created_at")
+    list_filter = ("status", "payment_method")
+    search_fields = ("id", "full_name", "email", "phone", "user__username")
+    date_hierarchy = "created_at"
+    ordering = ("-created_at",)
+    list_select_related = ("user",)
+
+    inlines = [ArchivedOrderItemInline]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: Any = None) -> bool:
+        return False
+
+    def has_delete_permission(self, request: HttpRequest, obj: Any = None) -> bool:
+        return False
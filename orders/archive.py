@@ -0,0 +1,71 @@
+"""
+Архив заказов: доставленные и отменённые заказы старше
+ORDERS_ARCHIVE_AFTER_MONTHS переносятся из orders_order / orders_orderitem
+в orders_archivedorder / orders_archivedorderitem (команда archive_orders).
+
+Рабочие таблицы остаются небольшими: админка, оформление и смена статусов
+работают только с ними (Order.objects). История покупателя, аналитика и
+выгрузки читают обе таблицы через Order.objects.with_archive() —
+представления UNION ALL (OrderRecord / OrderItemRecord).
+
+Заказ переносится как есть — с тем же id и датами; пачка переносится в одной
+транзакции (вставка в архив и удаление из рабочих таблиц), так что заказ
+всегда виден ровно в одной из таблиц. Строки пачки блокируются, и статус
+проверяется ещё раз: заказ, который успели вернуть в работу, не переносится.
+"""
+
+from __future__ import annotations
+
+import calendar
+from datetime import datetime
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+
+# Заказ в финальном статусе: больше не меняется
+ARCHIVE_STATUSES = (Order.STATUS_DELIVERED, Order.STATUS_CANCELLED)
+
+CHUNK_SIZE = 1000
+
+_ORDER_FIELDS = [field.attname for field in ArchivedOrder._meta.concrete_fields]
+_ITEM_FIELDS = [field.attname for field in ArchivedOrderItem._meta.concrete_fields]
+
+
+def archive_cutoff(months: Optional[int] = None, now: Optional[datetime] = None) -> datetime:
+    """Граница архива: тот же день months календарных месяцев назад (31-е → последний день месяца)."""
+    months = settings.ORDERS_ARCHIVE_AFTER_MONTHS if months is None else months
+    now = now or timezone.now()
+    year, month = divmod(now.year * 12 + now.month - 1 - months, 12)
+    day = min(now.day, calendar.monthrange(year, month + 1)[1])
+    return now.replace(year=year, month=month + 1, day=day)
+
+
+def archivable(before: datetime) -> QuerySet[Order]:
+    """Заказы рабочей таблицы, которые переносятся в архив."""
+    return Order.objects.using(DEFAULT_DB_ALIAS).filter(status__in=ARCHIVE_STATUSES, created_at__lt=before)
+
+
+def archive_orders(order_ids: List[int], before: datetime) -> int:
+    """Переносит заказы order_ids (если их ещё можно архивировать) с позициями; число перенесённых."""
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        orders = list(archivable(before).filter(pk__in=order_ids).select_for_update().values(*_ORDER_FIELDS))
+        ids = [row["id"] for row in orders]
+        if not ids:
+            return 0
+
+        items = OrderItem.objects.using(DEFAULT_DB_ALIAS).filter(order_id__in=ids)
+        ArchivedOrder.objects.using(DEFAULT_DB_ALIAS).bulk_create(ArchivedOrder(**row) for row in orders)
+        ArchivedOrderItem.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+            ArchivedOrderItem(**row) for row in items.values(*_ITEM_FIELDS)
+        )
+
+        # Без сигналов post_delete: заказ не удаляется, а переезжает — для
+        # покупателя и права на отзыв ничего не меняется
+        items._raw_delete(DEFAULT_DB_ALIAS)
+        Order.objects.filter(pk__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
+    return len(ids)
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db import transaction
 
 from orders.models import Order
 
@@ -95,3 +96,23 @@ def notify_admin(order: Order) -> None:
         recipient_list=[admin_email],
         fail_silently=False,
     )
+
+
+def notify_order_once(order: Order) -> bool:
+    """
+    Письма покупателю и администратору — один раз на заказ.
+
+    Флаг emails_sent выставляется условным UPDATE … WHERE emails_sent = false:
+    из параллельных повторов (двойной клик, ретрай) письма отправит только
+    первый, остальные дождутся его коммита и получат 0 строк. Ошибка отправки
+    откатывает флаг — следующий запрос попробует снова.
+
+    Возвращает True, если письма отправлены этим вызовом.
+    """
+    with transaction.atomic():
+        if not Order.objects.filter(pk=order.pk, emails_sent=False).update(emails_sent=True):
+            return False
+        send_order_confirmation(order)
+        notify_admin(order)
+    order.emails_sent = True
+    return True
@@ -0,0 +1,146 @@
+"""
+Идемпотентность оформления заказа.
+
+Повтор запроса — двойной клик, повторная отправка формы, ретрай мобильного
+клиента после обрыва связи — раньше заново выполнял create_order_from_cart:
+либо второй заказ (если корзина ещё не очищена), либо транзакция с
+ожиданием блокировок и отказом «Корзина пуста».
+
+Клиент передаёт ключ: заголовок Idempotency-Key (REST API, GraphQL; у
+мутации createOrder — ещё аргумент idempotencyKey) или скрытое поле формы
+оформления. Ключ действует для клиента (пользователь или гостевая сессия)
+и точки входа (scope) IDEMPOTENCY_KEY_TTL секунд.
+
+run_once вставляет запись ключа в той же транзакции, что и заказ:
+- повтор после завершения первого запроса сразу получает его заказ;
+- одновременный повтор ждёт на уникальном индексе только этой строки
+  и тоже получает готовый заказ, не выполняя оформление;
+- если оформление не удалось, запись откатывается вместе с ним —
+  повтор с тем же ключом оформляет заново.
+
+Тот же ключ с другими данными — KeyReused. Запросы без ключа работают
+как раньше. Истёкшие ключи удаляет команда sweep_idempotency_keys.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import timedelta
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.http import HttpRequest
+from django.utils import timezone
+
+from .models import IdempotencyKey, Order
+
+SCOPE_CHECKOUT = "checkout"
+SCOPE_API = "api"
+SCOPE_GRAPHQL = "graphql"
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+MAX_KEY_LENGTH = 255
+SWEEP_BATCH_SIZE = 5000
+
+
+class KeyReused(ValidationError):
+    """Ключ уже использован этим клиентом для запроса с другими данными."""
+
+
+def request_key(request: HttpRequest) -> str:
+    """Ключ из заголовка Idempotency-Key; пустая строка — ключа нет."""
+    return request.META.get(HEADER, "").strip()
+
+
+def client_id(request: HttpRequest) -> str:
+    """Владелец ключа — как у корзины: пользователь или гостевая сессия."""
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    if not request.session.session_key:
+        request.session.save()
+    return f"session:{request.session.session_key}"
+
+
+def fingerprint(data: Mapping[str, Any]) -> str:
+    """SHA-256 данных запроса (для QueryDict — последние значения полей)."""
+    payload = json.dumps({name: data[name] for name in data}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def replay(request: HttpRequest, scope: str, key: str) -> Optional[Order]:
+    """Заказ, уже созданный клиентом по действующему ключу, или None."""
+    if not key:
+        return None
+    record = (
+        IdempotencyKey.objects.filter(client=client_id(request), scope=scope, key=key, expires_at__gt=timezone.now())
+        .select_related("order")
+        .first()
+    )
+    return record.order if record else None
+
+
+def run_once(
+    request: HttpRequest,
+    scope: str,
+    key: str,
+    data: Mapping[str, Any],
+    create: Callable[[], Order],
+) -> Tuple[Order, bool]:
+    """
+    Выполняет create() один раз на ключ; возвращает (заказ, повтор ли это).
+
+    Без ключа — просто create(). ValidationError из create() откатывает и
+    запись ключа. Исключения: KeyReused — ключ занят запросом с другими
+    данными; ValidationError — слишком длинный ключ.
+    """
+    if not key:
+        return create(), False
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(f"Ключ идемпотентности длиннее {MAX_KEY_LENGTH} символов")
+
+    client = client_id(request)
+    digest = fingerprint(data)
+    now = timezone.now()
+    keys = IdempotencyKey.objects.filter(client=client, scope=scope, key=key)
+
+    with transaction.atomic():
+        keys.filter(expires_at__lte=now).delete()
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    client=client,
+                    scope=scope,
+                    key=key,
+                    fingerprint=digest,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                )
+        except IntegrityError:
+            # Ключ занят: вставка дождалась коммита первого запроса
+            record = keys.select_related("order").get()
+            if record.fingerprint != digest:
+                raise KeyReused("Ключ идемпотентности уже использован для другого запроса")
+            if record.order is None:
+                raise ValidationError("Заказ по этому ключу больше недоступен")
+            return record.order, True
+
+        order = create()
+        record.order = order
+        record.save(update_fields=["order"])
+
+    return order, False
+
+
+def sweep(batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """Удаляет истёкшие ключи пачками (короткие DELETE по индексу expires_at); число удалённых."""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=now).order_by().values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
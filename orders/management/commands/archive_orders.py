@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.archive import CHUNK_SIZE, archivable, archive_cutoff, archive_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Переносит доставленные и отменённые заказы старше ORDERS_ARCHIVE_AFTER_MONTHS "
+        "в архив (orders/archive.py) пачками по pk. Повторный запуск переносит только "
+        "новые; прерванный можно просто запустить снова."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            help="возраст заказа в месяцах (по умолчанию ORDERS_ARCHIVE_AFTER_MONTHS)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"заказов в пачке ({CHUNK_SIZE})")
+        parser.add_argument("--dry-run", action="store_true", help="только посчитать, сколько будет перенесено")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        chunk_size: int = options["chunk_size"]
+        before = archive_cutoff(options["older_than"])
+        orders = archivable(before)
+
+        total = orders.count()
+        self.stdout.write(f"Orders created before {before:%Y-%m-%d}: {total} to archive")
+        if options["dry_run"] or not total:
+            return
+
+        moved = 0
+        last_pk = 0
+        started = time.monotonic()
+        while True:
+            # Keyset по pk: каждая пачка — короткая транзакция на основной БД
+            ids = list(orders.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                break
+            moved += archive_orders(ids, before)
+            last_pk = ids[-1]
+            self.stdout.write(f"  pk ≤ {last_pk}: {moved}/{total} archived")
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Orders archived: {moved} ({time.monotonic() - started:.1f}s)"))
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from main.db_router import analytics_db
+from orders.export import CHUNK_SIZE, FORMATS, stream_orders
+from orders.models import Order
+
+
+def _day_start(value: str) -> datetime:
+    try:
+        day = date.fromisoformat(value)
+    except ValueError as exc:
+        raise CommandError(f"Неверная дата {value!r}: ожидается ГГГГ-ММ-ДД") from exc
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+class Command(BaseCommand):
+    help = "Потоковая выгрузка заказов с позициями в CSV / JSONL — orders/export.py"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="файл выгрузки; «-» — стандартный вывод")
+        parser.add_argument("--format", choices=FORMATS, help="формат (по умолчанию — по расширению, иначе csv)")
+        parser.add_argument("--since", help="заказы с этой даты (ГГГГ-ММ-ДД), включительно")
+        parser.add_argument("--until", help="заказы по эту дату (ГГГГ-ММ-ДД), включительно")
+        parser.add_argument("--status", action="append", choices=[s for s, _ in Order.STATUS_CHOICES])
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"заказов в пачке ({CHUNK_SIZE})")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options["path"]
+        fmt = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+
+        orders = Order.objects.with_archive().using(analytics_db())
+        if options["since"]:
+            orders = orders.filter(created_at__gte=_day_start(options["since"]))
+        if options["until"]:
+            orders = orders.filter(created_at__lt=_day_start(options["until"]) + timedelta(days=1))
+        if options["status"]:
+            orders = orders.filter(status__in=options["status"])
+
+        chunks = stream_orders(orders, fmt, options["chunk_size"])
+        if path == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        started = time.monotonic()
+        lines = 0
+        with open(path, "w", encoding="utf-8", newline="") as stream:
+            for chunk in chunks:
+                stream.write(chunk)
+                lines += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"✔ Orders exported: {lines} lines → {path} ({time.monotonic() - started:.1f}s)")
+        )
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.idempotency import SWEEP_BATCH_SIZE, sweep
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет истёкшие ключи идемпотентности оформления пачками — orders/idempotency.py. "
+        "Истёкшие ключи и так не учитываются; команда только убирает строки."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SWEEP_BATCH_SIZE,
+            help=f"ключей в одном DELETE (по умолчанию {SWEEP_BATCH_SIZE})",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        started = time.monotonic()
+        deleted = sweep(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"✔ Expired idempotency keys removed: {deleted} ({time.monotonic() - started:.1f}s)")
+        )
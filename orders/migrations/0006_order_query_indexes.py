@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0005_order_emails_sent_alter_order_user"),
+        ("products", "0004_product_catalog_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # Новые индексы создаются до удаления старых, покрытых ими
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["status", "-created_at"], name="order_status_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-created_at"], name="order_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="orderitem",
+            index=models.Index(fields=["product", "order"], name="orderitem_product_order_idx"),
+        ),
+        migrations.AlterField(
+            model_name="orderitem",
+            name="product",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Товар, который был куплен.",
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="order_items",
+                to="products.product",
+                verbose_name="Товар",
+            ),
+        ),
+    ]
@@ -0,0 +1,363 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Колонки представлений «все заказы»: при изменении полей OrderBase /
+# OrderItemBase представления пересоздаются в той же миграции
+ORDER_COLUMNS = (
+    "id, user_id, session_key, status, payment_method, total_price, shipping_address, "
+    "created_at, updated_at, full_name, email, phone, comment, emails_sent"
+)
+ITEM_COLUMNS = "id, order_id, product_id, quantity, price"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0006_order_query_indexes"),
+        ("products", "0007_productimageupload"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderItemRecord",
+            fields=[
+                (
+                    "quantity",
+                    models.PositiveIntegerField(
+                        default=1, help_text="Количество единиц товара в заказе.", verbose_name="Количество"
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Цена товара на момент оформления заказа (snapshot).",
+                        max_digits=10,
+                        verbose_name="Цена на момент покупки",
+                    ),
+                ),
+                ("id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="ID")),
+            ],
+            options={
+                "verbose_name": "Позиция заказа (с архивом)",
+                "verbose_name_plural": "Позиции заказов (с архивом)",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="OrderRecord",
+            fields=[
+                (
+                    "session_key",
+                    models.CharField(
+                        blank=True,
+                        help_text="Session Key гостевого пользователя для привязки заказа.",
+                        max_length=40,
+                        null=True,
+                        verbose_name="Session Key",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Ожидает обработки"),
+                            ("pending_payment", "Ожидает оплаты"),
+                            ("paid", "Оплачено"),
+                            ("shipped", "Отправлено"),
+                            ("delivered", "Доставлено"),
+                            ("cancelled", "Отменено"),
+                        ],
+                        default="pending",
+                        help_text="Текущий статус заказа.",
+                        max_length=20,
+                        verbose_name="Статус заказа",
+                    ),
+                ),
+                (
+                    "payment_method",
+                    models.CharField(
+                        choices=[("cash", "Наличными при получении"), ("card", "Банковская карта")],
+                        default="cash",
+                        help_text="Выбранный клиентом способ оплаты.",
+                        max_length=20,
+                        verbose_name="Способ оплаты",
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Полная стоимость заказа (фиксируется при оформлении).",
+                        max_digits=10,
+                        verbose_name="Полная стоимость",
+                    ),
+                ),
+                (
+                    "shipping_address",
+                    models.TextField(
+                        blank=True,
+                        help_text="Адрес, по которому необходимо доставить заказ.",
+                        null=True,
+                        verbose_name="Адрес доставки",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Дата обновления")),
+                (
+                    "full_name",
+                    models.CharField(
+                        blank=True,
+                        help_text="ФИО клиента, оформившего заказ.",
+                        max_length=255,
+                        null=True,
+                        verbose_name="ФИО",
+                    ),
+                ),
+                (
+                    "email",
+                    models.EmailField(
+                        blank=True,
+                        help_text="Email клиента для уведомлений.",
+                        max_length=254,
+                        null=True,
+                        verbose_name="Email",
+                    ),
+                ),
+                (
+                    "phone",
+                    models.CharField(
+                        blank=True,
+                        help_text="Контактный телефон клиента.",
+                        max_length=32,
+                        null=True,
+                        verbose_name="Телефон",
+                    ),
+                ),
+                (
+                    "comment",
+                    models.TextField(
+                        blank=True, help_text="Комментарий клиента к заказу.", null=True, verbose_name="Комментарий"
+                    ),
+                ),
+                (
+                    "emails_sent",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Защита от повторной отправки писем клиенту/админу.",
+                        verbose_name="Email отправлены",
+                    ),
+                ),
+                ("id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="ID")),
+            ],
+            options={
+                "verbose_name": "Заказ (с архивом)",
+                "verbose_name_plural": "Заказы (с архивом)",
+                "ordering": ["-created_at"],
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                (
+                    "session_key",
+                    models.CharField(
+                        blank=True,
+                        help_text="Session Key гостевого пользователя для привязки заказа.",
+                        max_length=40,
+                        null=True,
+                        verbose_name="Session Key",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Ожидает обработки"),
+                            ("pending_payment", "Ожидает оплаты"),
+                            ("paid", "Оплачено"),
+                            ("shipped", "Отправлено"),
+                            ("delivered", "Доставлено"),
+                            ("cancelled", "Отменено"),
+                        ],
+                        default="pending",
+                        help_text="Текущий статус заказа.",
+                        max_length=20,
+                        verbose_name="Статус заказа",
+                    ),
+                ),
+                (
+                    "payment_method",
+                    models.CharField(
+                        choices=[("cash", "Наличными при получении"), ("card", "Банковская карта")],
+                        default="cash",
+                        help_text="Выбранный клиентом способ оплаты.",
+                        max_length=20,
+                        verbose_name="Способ оплаты",
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Полная стоимость заказа (фиксируется при оформлении).",
+                        max_digits=10,
+                        verbose_name="Полная стоимость",
+                    ),
+                ),
+                (
+                    "shipping_address",
+                    models.TextField(
+                        blank=True,
+                        help_text="Адрес, по которому необходимо доставить заказ.",
+                        null=True,
+                        verbose_name="Адрес доставки",
+                    ),
+                ),
+                (
+                    "full_name",
+                    models.CharField(
+                        blank=True,
+                        help_text="ФИО клиента, оформившего заказ.",
+                        max_length=255,
+                        null=True,
+                        verbose_name="ФИО",
+                    ),
+                ),
+                (
+                    "email",
+                    models.EmailField(
+                        blank=True,
+                        help_text="Email клиента для уведомлений.",
+                        max_length=254,
+                        null=True,
+                        verbose_name="Email",
+                    ),
+                ),
+                (
+                    "phone",
+                    models.CharField(
+                        blank=True,
+                        help_text="Контактный телефон клиента.",
+                        max_length=32,
+                        null=True,
+                        verbose_name="Телефон",
+                    ),
+                ),
+                (
+                    "comment",
+                    models.TextField(
+                        blank=True, help_text="Комментарий клиента к заказу.", null=True, verbose_name="Комментарий"
+                    ),
+                ),
+                (
+                    "emails_sent",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Защита от повторной отправки писем клиенту/админу.",
+                        verbose_name="Email отправлены",
+                    ),
+                ),
+                ("id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(verbose_name="Дата создания")),
+                ("updated_at", models.DateTimeField(verbose_name="Дата обновления")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_orders",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Архивный заказ",
+                "verbose_name_plural": "Архив заказов",
+                "ordering": ["-created_at"],
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrderItem",
+            fields=[
+                (
+                    "quantity",
+                    models.PositiveIntegerField(
+                        default=1, help_text="Количество единиц товара в заказе.", verbose_name="Количество"
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Цена товара на момент оформления заказа (snapshot).",
+                        max_digits=10,
+                        verbose_name="Цена на момент покупки",
+                    ),
+                ),
+                ("id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="orders.archivedorder",
+                        verbose_name="Заказ",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="archived_order_items",
+                        to="products.product",
+                        verbose_name="Товар",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Позиция архивного заказа",
+                "verbose_name_plural": "Позиции архивных заказов",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(fields=["user", "-created_at"], name="archorder_user_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(fields=["status", "-created_at"], name="archorder_status_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(fields=["-created_at"], name="archorder_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorderitem",
+            index=models.Index(fields=["product", "order"], name="architem_product_order_idx"),
+        ),
+        migrations.RunSQL(
+            sql=[
+                f"CREATE VIEW orders_orderrecord AS SELECT {ORDER_COLUMNS} FROM orders_order "
+                f"UNION ALL SELECT {ORDER_COLUMNS} FROM orders_archivedorder",
+                f"CREATE VIEW orders_orderitemrecord AS SELECT {ITEM_COLUMNS} FROM orders_orderitem "
+                f"UNION ALL SELECT {ITEM_COLUMNS} FROM orders_archivedorderitem",
+            ],
+            reverse_sql=[
+                "DROP VIEW orders_orderitemrecord",
+                "DROP VIEW orders_orderrecord",
+            ],
+        ),
+    ]
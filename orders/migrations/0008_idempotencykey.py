@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0007_order_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("client", models.CharField(help_text="Клиент: «user:<id>» или «session:<ключ>».", max_length=64)),
+                ("scope", models.CharField(help_text="Точка входа: checkout, api, graphql.", max_length=32)),
+                ("key", models.CharField(help_text="Ключ из заголовка Idempotency-Key или формы.", max_length=255)),
+                ("fingerprint", models.CharField(help_text="SHA-256 данных запроса.", max_length=64)),
+                ("expires_at", models.DateTimeField(help_text="После этого момента ключ не учитывается.")),
+                (
+                    "order",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        help_text="Заказ, созданный по этому ключу.",
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="orders.order",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["expires_at"], name="idempotency_expires_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("client", "scope", "key"), name="unique_idempotency_key")
+                ],
+            },
+        ),
+    ]
@@ -4,13 +4,18 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.db import models
+from django.db.models import QuerySet
 
 from products.models import Product
 
 
-class Order(models.Model):
+class OrderBase(models.Model):
     """
-    Модель заказа.
+    Поля и статусы заказа — общие для рабочей таблицы (Order), архива
+    (ArchivedOrder) и представления «все заказы» (OrderRecord).
+
+    Новое поле здесь — это колонка в обеих таблицах: в той же миграции
+    представление orders_orderrecord пересоздаётся с новым списком колонок.
     """
 
     # ---- Статусы заказа ----
@@ -30,6 +35,9 @@ class Order(models.Model):
         (STATUS_CANCELLED, "Отменено"),
     ]
 
+    # Заказ считается покупкой (можно оставить отзыв на товары из него)
+    PURCHASED_STATUSES = (STATUS_PAID, STATUS_DELIVERED)
+
     # ---- Способы оплаты ----
     PAYMENT_CASH = "cash"
     PAYMENT_CARD = "card"
@@ -39,17 +47,7 @@ class Order(models.Model):
         (PAYMENT_CARD, "Банковская карта"),
     ]
 
-    # ---- Основные поля заказа ----
-    user = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.SET_NULL,
-        related_name="orders",
-        null=True,
-        blank=True,
-        verbose_name="Пользователь",
-        help_text="Пользователь, оформивший заказ (необязательно для гостей).",
-    )
-
+    # ---- Основные поля заказа (user — в каждой модели: своя связь с пользователем) ----
     session_key = models.CharField(
         max_length=40,
         null=True,
@@ -132,8 +130,7 @@ class Order(models.Model):
     )
 
     class Meta:
-        verbose_name = "Заказ"
-        verbose_name_plural = "Заказы"
+        abstract = True
         ordering = ["-created_at"]
 
     def __str__(self) -> str:
@@ -147,26 +144,51 @@ class Order(models.Model):
         return sum(item.quantity for item in self.items.all())
 
 
-class OrderItem(models.Model):
+class OrderManager(models.Manager["Order"]):
+    def with_archive(self) -> QuerySet[OrderRecord]:
+        """
+        Рабочие и архивные заказы вместе (только чтение): история покупателя,
+        аналитика, выгрузки. Order.objects — только рабочая таблица.
+        """
+        return OrderRecord.objects.all()
+
+
+class Order(OrderBase):
     """
-    Позиция товара внутри заказа.
+    Модель заказа.
+
+    Доставленные и отменённые заказы старше ORDERS_ARCHIVE_AFTER_MONTHS
+    переносятся в архив командой archive_orders (orders/archive.py).
     """
 
-    order = models.ForeignKey(
-        Order,
-        on_delete=models.CASCADE,
-        related_name="items",
-        verbose_name="Заказ",
-        help_text="Заказ, к которому относится данная товарная позиция.",
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="orders",
+        null=True,
+        blank=True,
+        verbose_name="Пользователь",
+        help_text="Пользователь, оформивший заказ (необязательно для гостей).",
     )
 
-    product = models.ForeignKey(
-        Product,
-        on_delete=models.PROTECT,
-        related_name="order_items",
-        verbose_name="Товар",
-        help_text="Товар, который был куплен.",
-    )
+    objects = OrderManager()
+
+    class Meta(OrderBase.Meta):
+        verbose_name = "Заказ"
+        verbose_name_plural = "Заказы"
+        indexes = [
+            # История заказов пользователя
+            models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+            # Staff dashboard и админка: заказы по статусу и периоду, выручка за период
+            models.Index(fields=["status", "-created_at"], name="order_status_created_idx"),
+            models.Index(fields=["-created_at"], name="order_created_idx"),
+        ]
+
+
+class OrderItemBase(models.Model):
+    """
+    Количество и цена позиции — общие для OrderItem, ArchivedOrderItem и OrderItemRecord.
+    """
 
     quantity = models.PositiveIntegerField(
         default=1,
@@ -181,6 +203,9 @@ class OrderItem(models.Model):
         help_text="Цена товара на момент оформления заказа (snapshot).",
     )
 
+    class Meta:
+        abstract = True
+
     def __str__(self) -> str:
         return f"{self.product.name} × {self.quantity}"
 
@@ -190,3 +215,208 @@ class OrderItem(models.Model):
         Полная стоимость конкретной позиции (цена x количество).
         """
         return self.price * self.quantity
+
+
+class OrderItem(OrderItemBase):
+    """
+    Позиция товара внутри заказа.
+    """
+
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name="items",
+        verbose_name="Заказ",
+        help_text="Заказ, к которому относится данная товарная позиция.",
+    )
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.PROTECT,
+        related_name="order_items",
+        verbose_name="Товар",
+        help_text="Товар, который был куплен.",
+        # Индекс по product — префикс orderitem_product_order_idx
+        db_index=False,
+    )
+
+    class Meta:
+        indexes = [
+            # «Купил ли пользователь товар»: от товара к заказам без обращения к таблице
+            models.Index(fields=["product", "order"], name="orderitem_product_order_idx"),
+        ]
+
+
+# =====================================================================
+# АРХИВ
+# =====================================================================
+
+
+class ArchivedOrder(OrderBase):
+    """
+    Архивный заказ: доставленный или отменённый, старше ORDERS_ARCHIVE_AFTER_MONTHS.
+
+    Строка переносится из orders_order как есть — с тем же id и датами;
+    рабочие запросы (админка, оформление, статусы) архив не читают.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="archived_orders",
+        null=True,
+        blank=True,
+        verbose_name="Пользователь",
+    )
+
+    # Даты переносятся из рабочей таблицы, а не проставляются при переносе
+    created_at = models.DateTimeField(verbose_name="Дата создания")
+    updated_at = models.DateTimeField(verbose_name="Дата обновления")
+
+    class Meta(OrderBase.Meta):
+        verbose_name = "Архивный заказ"
+        verbose_name_plural = "Архив заказов"
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="archorder_user_created_idx"),
+            models.Index(fields=["status", "-created_at"], name="archorder_status_created_idx"),
+            models.Index(fields=["-created_at"], name="archorder_created_idx"),
+        ]
+
+
+class ArchivedOrderItem(OrderItemBase):
+    """
+    Позиция архивного заказа.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+
+    order = models.ForeignKey(
+        ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name="items",
+        verbose_name="Заказ",
+    )
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.PROTECT,
+        related_name="archived_order_items",
+        verbose_name="Товар",
+        db_index=False,
+    )
+
+    class Meta:
+        verbose_name = "Позиция архивного заказа"
+        verbose_name_plural = "Позиции архивных заказов"
+        indexes = [
+            models.Index(fields=["product", "order"], name="architem_product_order_idx"),
+        ]
+
+
+# =====================================================================
+# ВСЕ ЗАКАЗЫ (представления UNION ALL рабочей таблицы и архива)
+# =====================================================================
+
+
+class OrderRecord(OrderBase):
+    """
+    Заказ из рабочей таблицы или архива — Order.objects.with_archive().
+
+    Представление orders_orderrecord (миграция 0007), только для чтения.
+    Условия (user_id, created_at, status) PostgreSQL применяет к каждой
+    таблице отдельно — по её индексам.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        null=True,
+        verbose_name="Пользователь",
+    )
+
+    class Meta(OrderBase.Meta):
+        managed = False
+        verbose_name = "Заказ (с архивом)"
+        verbose_name_plural = "Заказы (с архивом)"
+
+
+class OrderItemRecord(OrderItemBase):
+    """
+    Позиция заказа из рабочей таблицы или архива (представление orders_orderitemrecord).
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+
+    order = models.ForeignKey(
+        OrderRecord,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="items",
+        verbose_name="Заказ",
+    )
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        verbose_name="Товар",
+    )
+
+    class Meta:
+        managed = False
+        verbose_name = "Позиция заказа (с архивом)"
+        verbose_name_plural = "Позиции заказов (с архивом)"
+
+
+# =====================================================================
+# КЛЮЧИ ИДЕМПОТЕНТНОСТИ ОФОРМЛЕНИЯ (orders/idempotency.py)
+# =====================================================================
+
+
+class IdempotencyKey(models.Model):
+    """
+    Ключ повторной отправки оформления заказа.
+
+    Запись создаётся в одной транзакции с заказом: повтор с тем же ключом
+    от того же клиента (client) в той же точке входа (scope) получает уже
+    созданный заказ, а не оформляет новый. Живёт IDEMPOTENCY_KEY_TTL секунд.
+    """
+
+    client = models.CharField(max_length=64, help_text="Клиент: «user:<id>» или «session:<ключ>».")
+
+    scope = models.CharField(max_length=32, help_text="Точка входа: checkout, api, graphql.")
+
+    key = models.CharField(max_length=255, help_text="Ключ из заголовка Idempotency-Key или формы.")
+
+    fingerprint = models.CharField(max_length=64, help_text="SHA-256 данных запроса.")
+
+    # Без ограничения FK: архивирование удаляет заказы через _raw_delete
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        null=True,
+        help_text="Заказ, созданный по этому ключу.",
+    )
+
+    expires_at = models.DateTimeField(help_text="После этого момента ключ не учитывается.")
+
+    class Meta:
+        indexes = [
+            # Пакетная очистка истёкших
+            models.Index(fields=["expires_at"], name="idempotency_expires_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["client", "scope", "key"], name="unique_idempotency_key"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.scope}:{self.key} → {self.order_id}"
@@ -5,9 +5,16 @@ from typing import Any, Dict, List, TypedDict
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import F
+from django.db.models.lookups import GreaterThanOrEqual
 from django.http import HttpRequest
 
-from cart.models import CartItem
+from cart.models import CartItem, StockReservation
+from cart.reservations import available_stock
+from graphql_api.caching import bump_catalog_version
+from products.edge_cache import product_urls, purge_after_commit
+from products.models import Product
+from products.versioning import bump_products
 
 from .models import Order, OrderItem
 
@@ -32,11 +39,12 @@ def create_order_from_cart(
     1. Получение session_key.
     2. Загрузка корзины (для анонимных — по session_key).
     3. Валидация формы.
-    4. Проверка остатков и создание snapshot данных.
+    4. Snapshot цен и количеств.
     5. Определение статуса заказа.
     6. Создание Order и OrderItem.
-    7. Списание товара.
-    8. Очистка корзины.
+    7. Списание товара — условным UPDATE по доступному остатку
+       (stock минус чужие активные резервы, cart/reservations.py).
+    8. Снятие резервов и очистка корзины.
 
     Возвращает:
         Order — созданный объект заказа.
@@ -55,10 +63,12 @@ def create_order_from_cart(
     # ---------------------------
     # 2. Загрузка корзины
     # ---------------------------
+    owner: Dict[str, Any]
     if request.user.is_authenticated:
-        cart_items = CartItem.objects.filter(user=request.user).select_related("product")
+        owner = {"user": request.user}
     else:
-        cart_items = CartItem.objects.filter(session_key=session_key).select_related("product")
+        owner = {"session_key": session_key, "user__isnull": True}
+    cart_items = CartItem.objects.filter(**owner).select_related("product")
 
     if not cart_items.exists():
         raise ValidationError("Корзина пуста")
@@ -74,18 +84,15 @@ def create_order_from_cart(
     payment_method: str = form_data.get("payment_method", "cash")
 
     # ---------------------------
-    # 4. Проверка остатков
+    # 4. Snapshot (остатки проверяет списание в п. 8 — без блокировки корзины)
     # ---------------------------
     total_price: Decimal = Decimal(0)
     snapshot: List[SnapshotItem] = []
 
-    for cart_item in cart_items.select_for_update():
+    for cart_item in cart_items:
         product = cart_item.product
         qty: int = cart_item.quantity
 
-        if product.stock < qty:
-            raise ValidationError("Недостаточно товара")
-
         snapshot.append(
             SnapshotItem(
                 product=product,
@@ -124,25 +131,37 @@ def create_order_from_cart(
     # ---------------------------
     # 7. Создание OrderItem
     # ---------------------------
-    for item in snapshot:
-        OrderItem.objects.create(
+    OrderItem.objects.bulk_create(
+        OrderItem(
             order=order,
             product=item["product"],
             quantity=item["qty"],
             price=item["price"],
         )
+        for item in snapshot
+    )
 
     # ---------------------------
-    # 8. Списание товара
+    # 8. Списание товара: строки товаров блокируются только здесь,
+    #    в порядке pk (без взаимных блокировок), до конца транзакции
     # ---------------------------
-    for item in snapshot:
+    for item in sorted(snapshot, key=lambda item: item["product"].pk):
         product = item["product"]
-        product.stock -= item["qty"]
-        product.save(update_fields=["stock"])
+        enough = GreaterThanOrEqual(available_stock(owner, "pk"), item["qty"])
+        if not Product.objects.filter(enough, pk=product.pk).update(stock=F("stock") - item["qty"]):
+            raise ValidationError("Недостаточно товара")
+
+    # update() не вызывает post_save: метки ETag, версия каталога GraphQL
+    # и purge прокси — как в сигналах products и graphql_api
+    slugs = [item["product"].slug for item in snapshot]
+    bump_products(slugs)
+    transaction.on_commit(bump_catalog_version)
+    purge_after_commit(list(dict.fromkeys(url for slug in slugs for url in product_urls(slug))))
 
     # ---------------------------
-    # 9. Очистка корзины
+    # 9. Снятие резервов и очистка корзины
     # ---------------------------
+    StockReservation.objects.filter(**owner).delete()
     cart_items.delete()
 
     return order
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Dict
+
+import pytest
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from graphql_api.schema import schema
+from orders.archive import archive_cutoff
+from orders.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+from reviews.eligibility import get_eligibility
+
+
+@pytest.fixture
+def orders(user_fixture: Any, product_fixture: Any) -> Dict[str, Order]:
+    """Старые доставленный / отменённый / в работе и свежий доставленный — по позиции в каждом."""
+    old = timezone.now() - timedelta(days=500)
+    created = {
+        "delivered": (Order.STATUS_DELIVERED, old),
+        "cancelled": (Order.STATUS_CANCELLED, old),
+        "shipped": (Order.STATUS_SHIPPED, old),
+        "recent": (Order.STATUS_DELIVERED, timezone.now()),
+    }
+    result: Dict[str, Order] = {}
+    for name, (status, created_at) in created.items():
+        order = Order.objects.create(user=user_fixture, status=status, total_price=200, full_name=name)
+        OrderItem.objects.create(order=order, product=product_fixture, quantity=2, price=100)
+        Order.objects.filter(pk=order.pk).update(created_at=created_at)
+        order.refresh_from_db()
+        result[name] = order
+    return result
+
+
+def _archive(*args: str) -> str:
+    out = io.StringIO()
+    call_command("archive_orders", *args, stdout=out)
+    return out.getvalue()
+
+
+# ---------------------------------------------------------
+# 1. Граница архива — календарные месяцы
+# ---------------------------------------------------------
+def test_archive_cutoff() -> None:
+    now = datetime(2026, 3, 31, 12, 0, tzinfo=dt_timezone.utc)
+
+    assert archive_cutoff(1, now) == datetime(2026, 2, 28, 12, 0, tzinfo=dt_timezone.utc)
+    assert archive_cutoff(12, now) == datetime(2025, 3, 31, 12, 0, tzinfo=dt_timezone.utc)
+    assert archive_cutoff(15, now) == datetime(2024, 12, 31, 12, 0, tzinfo=dt_timezone.utc)
+
+
+# ---------------------------------------------------------
+# 2. Перенос: только старые финальные заказы, с позициями, тем же id и датами;
+#    покупка из архива даёт право на отзыв; повторный запуск ничего не переносит
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_archive_command_moves_final_orders(orders: Dict[str, Order], user_fixture: Any, product_fixture: Any) -> None:
+    assert "2 to archive" in _archive("--dry-run")
+    assert Order.objects.count() == 4
+
+    assert "Orders archived: 2" in _archive("--chunk-size=1")
+
+    assert set(Order.objects.values_list("full_name", flat=True)) == {"shipped", "recent"}
+    assert OrderItem.objects.count() == 2
+
+    delivered = ArchivedOrder.objects.get(pk=orders["delivered"].pk)
+    assert (delivered.status, delivered.created_at, delivered.updated_at) == (
+        Order.STATUS_DELIVERED,
+        orders["delivered"].created_at,
+        orders["delivered"].updated_at,
+    )
+    assert ArchivedOrderItem.objects.filter(order__full_name="cancelled").get().total == 200
+
+    # В рабочей таблице купленного товара больше нет — только в архиве
+    Order.objects.filter(full_name="recent").update(status=Order.STATUS_CANCELLED)
+    assert get_eligibility(user_fixture).has_bought(product_fixture.pk)
+
+    assert "0 to archive" in _archive()
+    assert ArchivedOrder.objects.count() == 2
+
+    # Удаление покупателя: архивные заказы остаются, как и рабочие
+    user_fixture.delete()
+    assert ArchivedOrder.objects.filter(user__isnull=True).count() == 2
+
+
+# ---------------------------------------------------------
+# 3. Чтение с архивом: история в кабинете, API, GraphQL, право на отзыв
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_archived_orders_stay_visible(
+    orders: Dict[str, Order], user_fixture: Any, client_web: Any, client_api: Any
+) -> None:
+    _archive()
+    delivered = orders["delivered"].pk
+
+    assert Order.objects.with_archive().count() == 4
+    assert Order.objects.with_archive().get(pk=delivered).items_count == 2
+    client_web.force_login(user_fixture)
+    response = client_web.get(reverse("users:account"))
+    history = [order.pk for order in response.context["orders"]]
+    assert history[0] == orders["recent"].pk and sorted(history) == sorted(order.pk for order in orders.values())
+
+    client_api.force_authenticate(user=user_fixture)
+    response = client_api.get(f"/api/orders/{delivered}/")
+    assert response.status_code == 200
+    assert response.json()["items"][0]["quantity"] == 2
+
+    request = RequestFactory().post("/graphql/")
+    request.user = user_fixture
+    result = schema.execute(
+        "{ myOrders(first: 10) { edges { node { id status items { quantity } } } } }", context_value=request
+    )
+    assert result.errors is None, result.errors
+    nodes = [edge["node"] for edge in result.data["myOrders"]["edges"]]
+    assert len(nodes) == 4 and all(node["items"][0]["quantity"] == 2 for node in nodes)
+
+    # Архив в админке — только просмотр
+    assert not site._registry[ArchivedOrder].has_change_permission(RequestFactory().get("/"))
+
+
+# ---------------------------------------------------------
+# 4. Архивный заказ открывается по прежним ссылкам: страницы оплаты
+#    и успеха, карточка в API, админка ведёт в архив и считает его в итогах
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_archived_order_pages(
+    orders: Dict[str, Order], user_fixture: Any, client_web: Any, client_api: Any, django_user_model: Any
+) -> None:
+    _archive()
+    delivered = orders["delivered"].pk
+
+    assert client_web.get(reverse("orders:fake_payment", args=[delivered])).status_code == 200
+    assert client_web.get(reverse("orders:success", args=[delivered])).status_code == 200
+    client_api.force_authenticate(user=user_fixture)
+    assert client_api.get(f"/api/orders/{delivered}/").status_code == 200
+
+    admin_user = django_user_model.objects.create_superuser(username="boss", password="x")
+    client_web.force_login(admin_user)
+    response = client_web.get(reverse("admin:orders_order_change", args=[delivered]))
+    assert response.url == reverse("admin:orders_archivedorder_change", args=[delivered])
+    assert client_web.get(response.url).status_code == 200
+
+    response = client_web.get(reverse("admin:orders_order_changelist"))
+    assert response.context["stats"]["total_orders"] == 4
@@ -27,7 +27,7 @@ def test_fake_payment_success_sends_emails_once(client_web: Any, order_fixture:
     url = reverse("orders:fake_payment_success", kwargs={"order_id": order.id})
 
     # 1) первый вызов
-    resp1 = client_web.get(url)
+    resp1 = client_web.post(url)
     assert resp1.status_code == 302
     assert len(mail.outbox) == 2
 
@@ -36,6 +36,6 @@ def test_fake_payment_success_sends_emails_once(client_web: Any, order_fixture:
     assert order.emails_sent is True
 
     # 2) повторный вызов
-    resp2 = client_web.get(url)
+    resp2 = client_web.post(url)
     assert resp2.status_code == 302
     assert len(mail.outbox) == 2  # дублей нет
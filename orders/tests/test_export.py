@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from orders.admin import export_orders_csv
+from orders.export import CSV_FIELDS
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def orders(user_fixture: Any, product_fixture: Any) -> List[Order]:
+    """5 заказов по 2 позиции и один пустой."""
+    created = [
+        Order.objects.create(user=user_fixture, status=Order.STATUS_PAID, total_price=300, full_name=f"Buyer {i}")
+        for i in range(6)
+    ]
+    OrderItem.objects.bulk_create(
+        OrderItem(order=order, product=product_fixture, quantity=quantity, price=100)
+        for order in created[:5]
+        for quantity in (1, 2)
+    )
+    return created
+
+
+# ---------------------------------------------------------
+# 1. Команда: CSV по позициям, запросов — два на пачку
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_command_csv(tmp_path: Path, orders: List[Order]) -> None:
+    path = tmp_path / "orders.csv"
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command("export_orders", str(path), "--chunk-size=2", stdout=io.StringIO())
+
+    # 3 пачки заказов + пустая: заказы и позиции на каждую непустую
+    assert len(queries) == 3 * 2 + 1
+
+    rows = list(csv.DictReader(path.open(encoding="utf-8", newline="")))
+    assert list(rows[0]) == CSV_FIELDS
+    assert len(rows) == 5 * 2 + 1
+    assert [row["order_id"] for row in rows[:2]] == [str(orders[0].pk)] * 2
+    assert rows[1]["line_total"] == "200.00"
+    assert rows[-1]["order_id"] == str(orders[5].pk) and rows[-1]["product_id"] == ""
+
+
+# ---------------------------------------------------------
+# 2. Staff dashboard: потоковый ответ JSONL за период
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_dashboard_export_streams(client_web: Any, django_user_model: Any, orders: List[Order]) -> None:
+    Order.objects.filter(pk=orders[0].pk).update(created_at=timezone.now() - timedelta(days=60))
+    url = reverse("staff_dashboard:orders_export")
+
+    client_web.force_login(django_user_model.objects.create_user(username="staff", password="x", is_staff=True))
+    response = client_web.get(url, {"period": "30d", "format": "jsonl"})
+
+    assert isinstance(response, StreamingHttpResponse)
+    assert response["Content-Disposition"].startswith('attachment; filename="orders_')
+    lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+    assert [line["order_id"] for line in lines] == [order.pk for order in orders[1:]]
+    assert len(lines[0]["items"]) == 2
+
+    assert client_web.get(url, {"format": "xml"}).status_code == 400
+    client_web.logout()
+    assert client_web.get(url).status_code == 302
+
+
+# ---------------------------------------------------------
+# 3. Действие админки — выбранные заказы
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_admin_action(rf: Any, orders: List[Order]) -> None:
+    admin = site._registry[Order]
+    queryset = admin.get_queryset(rf.get("/")).filter(pk__in=[orders[1].pk, orders[5].pk])
+
+    response = export_orders_csv(admin, rf.post("/"), queryset)
+
+    content = b"".join(response.streaming_content).decode()
+    assert [row["order_id"] for row in csv.DictReader(io.StringIO(content))] == [str(orders[1].pk)] * 2 + [
+        str(orders[5].pk)
+    ]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, List
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from cart.models import CartItem
+from graphql_api.schema import schema
+from orders.models import IdempotencyKey, Order
+from products.models import Product
+from reviews.eligibility import get_eligibility
+
+FORM = {"full_name": "Buyer", "email": "b@b.io", "phone": "1", "shipping_address": "Street", "payment_method": "cash"}
+
+CREATE_ORDER = """
+mutation($key: String) {
+  createOrder(idempotencyKey: $key, data: {
+    fullName: "Buyer", phone: "1", shippingAddress: "Street", paymentMethod: "cash"
+  }) { ok error order { id } }
+}
+"""
+
+
+# ---------------------------------------------------------
+# 1. Форма оформления: повторная отправка ведёт к тому же заказу
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_checkout_form_resubmit(client_web: Client, user_fixture: Any, product_fixture: Product) -> None:
+    CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=2)
+    client_web.force_login(user_fixture)
+
+    key = client_web.get(reverse("orders:checkout")).context["idempotency_key"]
+    assert key
+
+    first = client_web.post(reverse("orders:checkout"), {**FORM, "idempotency_key": key})
+    second = client_web.post(reverse("orders:checkout"), {**FORM, "idempotency_key": key})
+
+    order = Order.objects.get()
+    assert first.url == second.url == reverse("orders:success", kwargs={"order_id": order.id})
+    assert Product.objects.get(pk=product_fixture.pk).stock == 8
+    assert len(mail.outbox) == 2
+
+    # Новая форма — новый ключ: корзина уже пуста
+    response = client_web.post(reverse("orders:checkout"), {**FORM, "idempotency_key": "other"})
+    assert "Корзина пуста" in response.content.decode()
+
+
+# ---------------------------------------------------------
+# 2. REST API: Idempotency-Key возвращает созданный заказ, другие данные — 422
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_api_idempotency_key(client_api: APIClient, user_fixture: Any, product_fixture: Product) -> None:
+    CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=3)
+    client_api.force_authenticate(user_fixture)
+    url = reverse("order-list")
+
+    first = client_api.post(url, FORM, format="json", HTTP_IDEMPOTENCY_KEY="retry-1")
+    second = client_api.post(url, FORM, format="json", HTTP_IDEMPOTENCY_KEY="retry-1")
+
+    assert first.status_code == second.status_code == 201
+    assert first.data["id"] == second.data["id"] == Order.objects.get().id
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+    changed = client_api.post(url, {**FORM, "phone": "2"}, format="json", HTTP_IDEMPOTENCY_KEY="retry-1")
+    assert changed.status_code == 422
+
+    # Без ключа — как раньше: новое оформление, корзина пуста
+    assert client_api.post(url, FORM, format="json").status_code == 400
+
+    # Ключи клиентов независимы
+    other = type(user_fixture).objects.create_user(username="other", password="x")
+    CartItem.objects.create(user=other, product=product_fixture, quantity=1)
+    client_api.force_authenticate(other)
+    response = client_api.post(url, FORM, format="json", HTTP_IDEMPOTENCY_KEY="retry-1")
+    assert response.status_code == 201 and Order.objects.count() == 2
+
+    # Истёкшие ключи не учитываются и удаляются командой
+    IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+    out = io.StringIO()
+    call_command("sweep_idempotency_keys", stdout=out)
+    assert "removed: 2" in out.getvalue()
+
+
+# ---------------------------------------------------------
+# 3. GraphQL createOrder: аргумент idempotencyKey
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_graphql_create_order_idempotency_key(web_session_key: str, product_fixture: Product) -> None:
+    CartItem.objects.create(session_key=web_session_key, product=product_fixture, quantity=1)
+
+    def execute() -> Any:
+        request = RequestFactory().post("/graphql/")
+        request.user = AnonymousUser()
+        request.session = SessionStore(session_key=web_session_key)
+        result = schema.execute(CREATE_ORDER, context_value=request, variables={"key": "gql-1"})
+        assert result.errors is None, result.errors
+        return result.data["createOrder"]
+
+    first, second = execute(), execute()
+    assert first["ok"] and second["ok"], (first, second)
+    assert first["order"]["id"] == second["order"]["id"]
+    assert Order.objects.count() == 1
+
+
+# ---------------------------------------------------------
+# 4. Подтверждение оплаты: только POST, повтор ничего не меняет
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_fake_payment_success_is_post_only(client_web: Client, order_fixture: Order) -> None:
+    url = reverse("orders:fake_payment_success", kwargs={"order_id": order_fixture.id})
+    assert client_web.get(url).status_code == 405
+
+    Order.objects.filter(pk=order_fixture.pk).update(status=Order.STATUS_CANCELLED)
+    assert client_web.post(url).status_code == 409
+    assert Order.objects.get(pk=order_fixture.pk).status == Order.STATUS_CANCELLED
+
+
+# ---------------------------------------------------------
+# 5. Оплата сразу даёт право на отзыв (кеш права сброшен)
+# ---------------------------------------------------------
+@pytest.mark.django_db(transaction=True)
+def test_payment_grants_review_eligibility(
+    client_web: Client, user_fixture: Any, order_item_fixture: Any, product_fixture: Product
+) -> None:
+    order = order_item_fixture.order
+    assert get_eligibility(user_fixture).purchased == frozenset()  # закешировано до оплаты
+
+    url = reverse("orders:fake_payment_success", kwargs={"order_id": order.id})
+    assert client_web.post(url).status_code == 302
+
+    assert Order.objects.get(pk=order.pk).status == Order.STATUS_PAID
+    assert get_eligibility(user_fixture).purchased == {product_fixture.pk}
+
+
+# ---------------------------------------------------------
+# 6. Оплата, которая ничего не изменила, писем не отправляет
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_fake_payment_noop_sends_no_emails(client_web: Client, order_fixture: Order) -> None:
+    url = reverse("orders:fake_payment_success", kwargs={"order_id": order_fixture.id})
+
+    for status in (Order.STATUS_CANCELLED, Order.STATUS_SHIPPED):
+        Order.objects.filter(pk=order_fixture.pk).update(status=status)
+        response = client_web.post(url)
+        assert response.status_code == 409
+        assert "Pay Now" not in response.content.decode()
+        assert Order.objects.get(pk=order_fixture.pk).status == status
+    assert len(mail.outbox) == 0
+    assert not Order.objects.get(pk=order_fixture.pk).emails_sent
+
+    # Первая оплата — письма и success; повтор — success без новых писем
+    Order.objects.filter(pk=order_fixture.pk).update(status=Order.STATUS_PENDING_PAYMENT)
+    success = reverse("orders:success", kwargs={"order_id": order_fixture.id})
+    assert client_web.post(url).url == success
+    sent = len(mail.outbox)
+    assert sent > 0 and Order.objects.get(pk=order_fixture.pk).emails_sent
+    assert client_web.post(url).url == success
+    assert len(mail.outbox) == sent
+
+    assert client_web.post(reverse("orders:fake_payment_success", kwargs={"order_id": 10**6})).status_code == 404
+
+
+# ---------------------------------------------------------
+# 7. Шторм ретраев: одновременные запросы с одним ключом — один заказ
+# ---------------------------------------------------------
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_retries_create_one_order(user_fixture: Any, product_fixture: Product) -> None:
+    if connection.vendor != "postgresql":
+        pytest.skip("параллельная запись — только на PostgreSQL")
+
+    CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=1)
+    workers = 8
+    barrier = threading.Barrier(workers)
+    ids: List[int] = []
+
+    def retry() -> None:
+        try:
+            client = APIClient()
+            client.force_authenticate(user_fixture)
+            barrier.wait()
+            response = client.post(reverse("order-list"), FORM, format="json", HTTP_IDEMPOTENCY_KEY="storm")
+            assert response.status_code == 201, response.content
+            ids.append(json.loads(response.content)["id"])
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(workers) as pool:
+        for future in [pool.submit(retry) for _ in range(workers)]:
+            future.result()
+
+    assert Order.objects.count() == 1
+    assert ids == [Order.objects.get().id] * workers
+    assert Product.objects.get(pk=product_fixture.pk).stock == 9
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import uuid
 from typing import TYPE_CHECKING, Any, Dict
 
 from django.core.exceptions import ValidationError
 from django.db.models import QuerySet
 from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
 from django.shortcuts import redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_POST
 
 from cart.models import CartItem
+from cart.services import CartService
+from reviews.eligibility import forget_eligibility
 
-from .email_services import notify_admin, send_order_confirmation
+from . import idempotency
+from .email_services import notify_order_once
 from .forms import CheckoutForm
-from .models import Order
+from .models import Order, OrderRecord
 from .services import create_order_from_cart
 
 if TYPE_CHECKING:
@@ -27,6 +33,14 @@ def checkout_view(request: HttpRequest) -> HttpResponse:
     """
     Основная страница оформления заказа.
     Если выбран метод 'card' → перенаправляем на fake-payment.
+
+    Открытие страницы резервирует товары корзины на STOCK_RESERVATION_TTL
+    (CartService.reserve): пока покупатель заполняет форму, их не раскупят.
+    Повторное открытие действующий резерв не продлевает.
+
+    Форма несёт ключ идемпотентности (скрытое поле idempotency_key):
+    повторная отправка той же формы ведёт к уже созданному заказу
+    (orders/idempotency.py), а не оформляет его заново.
     """
 
     # --- 1. Session key ---
@@ -38,7 +52,7 @@ def checkout_view(request: HttpRequest) -> HttpResponse:
     if request.user.is_authenticated:
         cart_items: QuerySet[CartItem] = CartItem.objects.filter(user=request.user).select_related("product")
     else:
-        cart_items = CartItem.objects.filter(session_key=session_key).select_related("product")
+        cart_items = CartItem.objects.filter(session_key=session_key, user__isnull=True).select_related("product")
 
     cart_total = sum(item.total_price for item in cart_items)
 
@@ -62,20 +76,29 @@ def checkout_view(request: HttpRequest) -> HttpResponse:
 
         form = CheckoutForm(initial=initial_data)
 
-        return render(
-            request,
-            "orders/checkout.html",
-            {
-                "form": form,
-                "cart_items": cart_items,
-                "cart_total": cart_total,
-            },
-        )
+        context: Dict[str, Any] = {
+            "form": form,
+            "cart_items": cart_items,
+            "cart_total": cart_total,
+            "idempotency_key": uuid.uuid4().hex,
+        }
+        try:
+            CartService(request).reserve()
+        except ValidationError as e:
+            context["error"] = e.messages[0]
+
+        return render(request, "orders/checkout.html", context)
 
     # ==================================================================
     # POST
     # ==================================================================
     form = CheckoutForm(request.POST)
+    key: str = request.POST.get("idempotency_key", "")
+
+    # Повтор уже выполненной отправки (двойной клик, «назад» и снова «оформить»)
+    done = idempotency.replay(request, idempotency.SCOPE_CHECKOUT, key)
+    if done is not None:
+        return _order_redirect(done)
 
     # Корзина пуста
     if not cart_items.exists():
@@ -86,6 +109,7 @@ def checkout_view(request: HttpRequest) -> HttpResponse:
                 "form": form,
                 "cart_items": cart_items,
                 "cart_total": cart_total,
+                "idempotency_key": key,
                 "error": "Корзина пуста",
             },
         )
@@ -99,28 +123,25 @@ def checkout_view(request: HttpRequest) -> HttpResponse:
                 "form": form,
                 "cart_items": cart_items,
                 "cart_total": cart_total,
+                "idempotency_key": key,
             },
         )
 
     # Создание заказа
     try:
-        order = create_order_from_cart(request, form.cleaned_data)
-
-        payment_method: str | None = form.cleaned_data.get("payment_method")
-
-        # --- Если карта → имитация оплаты
-        if payment_method == "card":
-            return redirect("orders:fake_payment", order_id=order.id)
+        order, _ = idempotency.run_once(
+            request,
+            idempotency.SCOPE_CHECKOUT,
+            key,
+            form.cleaned_data,
+            lambda: create_order_from_cart(request, form.cleaned_data),
+        )
 
-        # Защита от повторной отправки писем (двойной клик/повторный POST)
-        if not order.emails_sent:
-            send_order_confirmation(order)
-            notify_admin(order)
-            order.emails_sent = True
-            order.save(update_fields=["emails_sent"])
+        # Оплата картой — письма после оплаты (fake_payment_success)
+        if order.payment_method != Order.PAYMENT_CARD:
+            notify_order_once(order)
 
-        # --- Обычная success-страница
-        return redirect("orders:success", order_id=order.id)
+        return _order_redirect(order)
 
     except ValidationError as e:
         return render(
@@ -130,6 +151,7 @@ def checkout_view(request: HttpRequest) -> HttpResponse:
                 "form": form,
                 "cart_items": cart_items,
                 "cart_total": cart_total,
+                "idempotency_key": key,
                 "error": str(e),
             },
         )
@@ -142,11 +164,19 @@ def checkout_view(request: HttpRequest) -> HttpResponse:
                 "form": form,
                 "cart_items": cart_items,
                 "cart_total": cart_total,
+                "idempotency_key": key,
                 "error": "Ошибка оформления заказа. Попробуйте позднее.",
             },
         )
 
 
+def _order_redirect(order: Order) -> HttpResponseRedirect:
+    """Куда ведёт оформленный заказ: неоплаченная карта → имитация оплаты, иначе success."""
+    if order.status == Order.STATUS_PENDING_PAYMENT:
+        return redirect("orders:fake_payment", order_id=order.id)
+    return redirect("orders:success", order_id=order.id)
+
+
 # ======================================================================
 # FAKE PAYMENT PAGE
 # ======================================================================
@@ -157,9 +187,10 @@ def fake_payment_view(request: HttpRequest, order_id: int) -> HttpResponse:
     Здесь НЕ меняем статус и НЕ отправляем письма - избегаем дубли/paid раньше времени.
     """
 
+    # Заказ мог уже уйти в архив (orders/archive.py) — ищем вместе с ним
     try:
-        order = Order.objects.get(id=order_id)
-    except Order.DoesNotExist:
+        order = Order.objects.with_archive().get(id=order_id)
+    except OrderRecord.DoesNotExist:
         raise Http404("Order not found")
 
     return render(request, "orders/fake_payment.html", {"order_id": order.id})
@@ -168,30 +199,43 @@ def fake_payment_view(request: HttpRequest, order_id: int) -> HttpResponse:
 # ======================================================================
 # FAKE PAYMENT SUCCESS
 # ======================================================================
-def fake_payment_success(request: HttpRequest, order_id: int) -> HttpResponseRedirect:
+@require_POST
+def fake_payment_success(request: HttpRequest, order_id: int) -> HttpResponse:
     """
     После псевдо-оплаты:
     - статус заказа становится paid
     - отправляется email клиенту и админу
     - перевод на success
+
+    Только POST (GET — 405: префетч ссылок и повтор страницы ничего не
+    меняют). Статус меняется условным UPDATE только из ожидающих; письма
+    и переход на success — только если оплату отметил этот запрос.
+    Повтор для уже оплаченного заказа ведёт на success без писем,
+    для отправленного / отменённого / архивного — страница оплаты
+    с ошибкой (409) и без кнопки оплаты.
     """
 
+    # Заказ мог уже уйти в архив — ищем вместе с ним
     try:
-        order = Order.objects.get(id=order_id)
-        # статус paid (точка "успешной оплаты")
-        if order.status != Order.STATUS_PAID:
-            order.status = Order.STATUS_PAID
-            order.save(update_fields=["status"])
-        # защита от повторной отправки писем
-        if not order.emails_sent:
-            send_order_confirmation(order)
-            notify_admin(order)
-            order.emails_sent = True
-            order.save(update_fields=["emails_sent"])
-
-    except Order.DoesNotExist:
+        record = Order.objects.with_archive().get(id=order_id)
+    except OrderRecord.DoesNotExist:
         raise Http404("Order not found")
 
+    # статус paid (точка "успешной оплаты"); отправленный/отменённый заказ не трогаем
+    paid = Order.objects.filter(pk=order_id, status__in=[Order.STATUS_PENDING, Order.STATUS_PENDING_PAYMENT]).update(
+        status=Order.STATUS_PAID, updated_at=timezone.now()
+    )
+    if not paid:
+        if record.status == Order.STATUS_PAID:
+            return redirect("orders:success", order_id=order_id)
+        context = {"order_id": order_id, "error": f"Заказ не ожидает оплаты: {record.get_status_display()}."}
+        return render(request, "orders/fake_payment.html", context, status=409)
+
+    order = Order.objects.get(pk=order_id)
+    # update() не вызывает post_save: право на отзыв сбрасываем как сигналы reviews
+    forget_eligibility([order.user_id])
+    notify_order_once(order)
+
     return redirect("orders:success", order_id=order_id)
 
 
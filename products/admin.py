@@ -3,11 +3,19 @@ from __future__ import annotations
 from typing import Any
 
 from django.contrib import admin
+from django.db import transaction
 from django.db.models import QuerySet
 from django.http import HttpRequest
+from django.utils import timezone
 from django.utils.html import format_html
 
-from .models import Category, Product, ProductSpecification
+from graphql_api.caching import bump_catalog_version
+
+from .edge_cache import product_urls, purge_after_commit
+from .image_queue import enqueue, latest_upload, take_upload
+from .images import thumbnail_url
+from .models import Category, Product, ProductImageUpload, ProductSpecification
+from .versioning import bump_products
 
 # ============================================================
 # INLINE: Характеристики товара
@@ -47,13 +55,27 @@ class CategoryAdmin(admin.ModelAdmin):
 # ============================================================
 
 
+def set_active(queryset: QuerySet[Product], is_active: bool) -> None:
+    """
+    Массовое включение / выключение товаров. update() не вызывает post_save:
+    метки ETag, версия каталога GraphQL и purge прокси — как в сигналах
+    products и graphql_api.
+    """
+    with transaction.atomic():
+        slugs = list(queryset.values_list("slug", flat=True))
+        queryset.update(is_active=is_active, updated_at=timezone.now())
+        bump_products(slugs)
+        transaction.on_commit(bump_catalog_version)
+        purge_after_commit(list(dict.fromkeys(url for slug in slugs for url in product_urls(slug))))
+
+
 @admin.action(description="Сделать активными")
 def activate_products(
     modeladmin: admin.ModelAdmin[Any],
     request: HttpRequest,
     queryset: QuerySet[Product],
 ) -> None:
-    queryset.update(is_active=True)
+    set_active(queryset, True)
 
 
 @admin.action(description="Сделать неактивными")
@@ -62,7 +84,7 @@ def deactivate_products(
     request: HttpRequest,
     queryset: QuerySet[Product],
 ) -> None:
-    queryset.update(is_active=False)
+    set_active(queryset, False)
 
 
 # ============================================================
@@ -90,7 +112,7 @@ class ProductAdmin(admin.ModelAdmin):
     search_fields = ("name", "description", "short_description", "tags")
 
     prepopulated_fields = {"slug": ("name",)}
-    readonly_fields = ("created_at", "updated_at", "preview_image")
+    readonly_fields = ("created_at", "updated_at", "preview_image", "image_status")
 
     inlines = [ProductSpecificationInline]
 
@@ -112,7 +134,7 @@ class ProductAdmin(admin.ModelAdmin):
             },
         ),
         ("Описание", {"fields": ("short_description", "description")}),
-        ("Изображение", {"fields": ("image", "preview_image")}),
+        ("Изображение", {"fields": ("image", "preview_image", "image_status")}),
         ("SEO / Теги", {"fields": ("tags",)}),
         ("Служебные поля", {"fields": ("created_at", "updated_at")}),
     )
@@ -126,7 +148,8 @@ class ProductAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="width:50px;height:50px;' 'object-fit:cover;border-radius:4px;" />',
-                obj.image.url,
+                # Производная под HiDPI (2×), а не оригинал на сотни КБ
+                thumbnail_url(obj, 100),
             )
         return "-"
 
@@ -135,10 +158,29 @@ class ProductAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="width:200px;border-radius:6px;" />',
-                obj.image.url,
+                thumbnail_url(obj, 400),
             )
         return "(Нет изображения)"
 
+    @admin.display(description="Обработка изображения")
+    def image_status(self, obj: Product) -> str:
+        upload = latest_upload(obj)
+        if upload is None:
+            return "-"
+        if upload.status == ProductImageUpload.STATUS_FAILED:
+            return f"{upload.get_status_display()}: {upload.error}"
+        return upload.get_status_display()
+
+    # ============================================================
+    # SAVE: новое изображение — в очередь обработки (image_queue.py)
+    # ============================================================
+
+    def save_model(self, request: HttpRequest, obj: Product, form: Any, change: bool) -> None:
+        upload = take_upload(form)
+        super().save_model(request, obj, form, change)
+        if upload is not None:
+            enqueue(obj, upload)
+
     # ============================================================
     # OPTIMIZED QUERYSET
     # ============================================================
@@ -0,0 +1,443 @@
+"""
+Массовый импорт и экспорт каталога: CSV и JSONL (команды catalog_import /
+catalog_export).
+
+Одна строка — один товар:
+
+    slug, name, category, category_name, short_description, description,
+    unit, price, old_price, stock, is_active, tags, specifications
+
+- товар ищется по slug (пустой — slugify(name)), существующий обновляется;
+- category — slug категории, отсутствующая создаётся с именем category_name
+  (или slug); существующие категории не переименовываются;
+- tags строятся из short_description, как в Product.save; колонка tags
+  используется, если описание тегов не дало;
+- specifications — JSON: {"Имя": "Значение", ...} или
+  [{"name": ..., "value": ...}, ...]; характеристики товара заменяются целиком.
+
+Обновляются только поля из колонок файла (для JSONL — ключи первой записи),
+остальные поля существующих товаров не меняются.
+
+Файл читается потоково, записи идут пачками: на пачку — upsert товаров
+одним bulk_create(update_conflicts=True), пересоздание характеристик и
+по одному запросу на slug → id. Память не зависит от размера файла.
+Пачка — отдельная транзакция: прерванный импорт можно просто повторить.
+
+bulk_create не вызывает сигналы: после пачки метки ETag товаров обновляются
+одной записью в кеш (versioning.bump_products), версия каталога GraphQL
+увеличивается (graphql_api.caching.bump_catalog_version), у прокси
+сбрасываются списки каталога; карточки товаров истекают по s-maxage
+(edge_cache.py).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from itertools import chain, islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_slug
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.text import slugify
+
+from graphql_api.caching import bump_catalog_version
+
+from .edge_cache import product_urls, purge_after_commit
+from .models import Category, Product, ProductSpecification
+from .tokenizer import generate_tags_batch
+from .versioning import bump_categories, bump_products
+
+FIELDS = [
+    "slug",
+    "name",
+    "category",
+    "category_name",
+    "short_description",
+    "description",
+    "unit",
+    "price",
+    "old_price",
+    "stock",
+    "is_active",
+    "tags",
+    "specifications",
+]
+
+FORMATS = ("csv", "jsonl")
+
+BATCH_SIZE = 1000
+
+# Колонка файла → поля товара, которые она обновляет
+_COLUMN_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "name": ("name",),
+    "category": ("category",),
+    "short_description": ("short_description", "tags"),
+    "description": ("description",),
+    "unit": ("unit",),
+    "price": ("price",),
+    "old_price": ("old_price",),
+    "stock": ("stock",),
+    "is_active": ("is_active",),
+    "tags": ("tags",),
+}
+
+_TRUE = {"1", "true", "yes", "on", "y"}
+_FALSE = {"0", "false", "no", "off", "n"}
+
+
+class RowError(ValueError):
+    """Строка файла не может быть импортирована."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"строка {line}: {message}")
+        self.line = line
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Не удалось определить формат по имени {path!r}: укажите --format csv|jsonl")
+
+
+# ======================================================================
+# ЧТЕНИЕ
+# ======================================================================
+# Запись CSV — словарь, JSONL — строка файла (разбирается в parse_row:
+# битая строка пропускается, как и любая другая ошибочная запись)
+Record = Union[Dict[str, Any], str]
+
+
+def _read_csv(stream: IO[str]) -> Tuple[List[str], Iterator[Tuple[int, Record]]]:
+    reader = csv.DictReader(stream)
+
+    def records() -> Iterator[Tuple[int, Record]]:
+        for record in reader:
+            yield reader.line_num, record
+
+    return list(reader.fieldnames or []), records()
+
+
+def _read_jsonl(stream: IO[str]) -> Tuple[List[str], Iterator[Tuple[int, Record]]]:
+    lines = ((line, text) for line, text in enumerate(stream, start=1) if text.strip())
+    first = next(lines, None)
+    if first is None:
+        return [], iter(())
+    try:
+        columns = list(_decode_json(*first))
+    except RowError:
+        columns = []
+    return columns, chain([first], lines)
+
+
+def read_rows(stream: IO[str], fmt: str) -> Tuple[List[str], Iterator[Tuple[int, Record]]]:
+    """
+    Колонки файла (для JSONL — ключи первой записи) и записи с номерами
+    строк — по одной, без чтения файла целиком.
+    """
+    return _read_csv(stream) if fmt == "csv" else _read_jsonl(stream)
+
+
+# ======================================================================
+# РАЗБОР ЗАПИСИ
+# ======================================================================
+def _decode_json(line: int, text: str) -> Dict[str, Any]:
+    try:
+        record = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise RowError(line, f"неверный JSON: {exc.msg}") from exc
+    if not isinstance(record, dict):
+        raise RowError(line, "ожидается JSON-объект")
+    return record
+
+
+def _max_length(name: str) -> int:
+    return int(getattr(Product._meta.get_field(name), "max_length"))
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _decimal(line: int, name: str, value: Any, required: bool = False) -> Optional[Decimal]:
+    text = _text(value)
+    if not text:
+        if required:
+            raise RowError(line, f"{name}: обязательное поле")
+        return None
+    try:
+        number = Decimal(text)
+    except InvalidOperation as exc:
+        raise RowError(line, f"{name}: не число ({text!r})") from exc
+    if not number.is_finite() or number < 0:
+        raise RowError(line, f"{name}: недопустимое значение ({text!r})")
+    return number
+
+
+def _bool(line: int, value: Any, default: bool) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = _text(value).lower()
+    if not text:
+        return default
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise RowError(line, f"is_active: не булево значение ({value!r})")
+
+
+def _specifications(line: int, value: Any) -> List[Tuple[str, str]]:
+    if isinstance(value, str):
+        if not value.strip():
+            return []
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError as exc:
+            raise RowError(line, f"specifications: неверный JSON: {exc.msg}") from exc
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        return [(_text(name), _text(spec)) for name, spec in value.items()]
+    if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+        return [(_text(item.get("name")), _text(item.get("value"))) for item in value]
+    raise RowError(line, "specifications: ожидается объект или список {name, value}")
+
+
+@dataclass
+class CatalogRow:
+    line: int
+    slug: str
+    category: str
+    category_name: str
+    values: Dict[str, Any]
+    specifications: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def parse_row(line: int, record: Record) -> CatalogRow:
+    """Проверяет запись и приводит значения к типам полей товара."""
+    if isinstance(record, str):
+        record = _decode_json(line, record)
+
+    name = _text(record.get("name"))
+    if not name:
+        raise RowError(line, "name: обязательное поле")
+
+    slug_length = _max_length("slug")
+    slug = _text(record.get("slug")) or slugify(name)[:slug_length].strip("-")
+    try:
+        validate_slug(slug)
+    except ValidationError as exc:
+        raise RowError(line, f"slug: недопустимое значение ({slug!r})") from exc
+    if len(slug) > slug_length:
+        raise RowError(line, f"slug: длиннее {slug_length} символов")
+
+    category = _text(record.get("category"))
+    if not category:
+        raise RowError(line, "category: обязательное поле")
+
+    short_description = _text(record.get("short_description")) or None
+    stock_text = _text(record.get("stock")) or "0"
+    if not stock_text.isdigit():
+        raise RowError(line, f"stock: не целое неотрицательное число ({stock_text!r})")
+
+    values: Dict[str, Any] = {
+        "name": name,
+        "short_description": short_description,
+        "description": _text(record.get("description")),
+        "unit": _text(record.get("unit")) or None,
+        "price": _decimal(line, "price", record.get("price"), required=True),
+        "old_price": _decimal(line, "old_price", record.get("old_price")),
+        "stock": int(stock_text),
+        "is_active": _bool(line, record.get("is_active"), default=True),
+        # Заменяются тегами из описания в CatalogImporter (пачкой)
+        "tags": _text(record.get("tags")),
+    }
+    for column in ("name", "short_description", "unit", "tags"):
+        limit = _max_length(column)
+        if values[column] and len(values[column]) > limit:
+            raise RowError(line, f"{column}: длиннее {limit} символов")
+
+    return CatalogRow(
+        line=line,
+        slug=slug,
+        category=category,
+        category_name=_text(record.get("category_name")),
+        values=values,
+        specifications=_specifications(line, record.get("specifications")),
+    )
+
+
+# ======================================================================
+# ИМПОРТ
+# ======================================================================
+@dataclass
+class ImportStats:
+    created: int = 0
+    updated: int = 0
+    categories_created: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def skipped(self) -> int:
+        return len(self.errors)
+
+
+class CatalogImporter:
+    """
+    Upsert товаров пачками. columns — колонки файла: определяют, какие
+    поля существующих товаров обновляются и заменяются ли характеристики.
+    """
+
+    def __init__(self, columns: Iterable[str], batch_size: int = BATCH_SIZE) -> None:
+        columns = set(columns)
+        self.batch_size = batch_size
+        self.update_fields = sorted(
+            {name for column in columns & set(_COLUMN_FIELDS) for name in _COLUMN_FIELDS[column]} | {"updated_at"}
+        )
+        self.replace_specifications = "specifications" in columns
+        self.stats = ImportStats()
+        self._categories: Dict[str, int] = dict(
+            Category.objects.using(DEFAULT_DB_ALIAS).values_list("slug", "pk")  # type: ignore[arg-type]
+        )
+
+    def run(self, records: Iterable[Tuple[int, Record]]) -> ImportStats:
+        iterator = iter(records)
+        while batch := list(islice(iterator, self.batch_size)):
+            self.import_batch(batch)
+        return self.stats
+
+    def _parse(self, batch: List[Tuple[int, Record]]) -> List[CatalogRow]:
+        rows: Dict[str, CatalogRow] = {}
+        for line, record in batch:
+            try:
+                row = parse_row(line, record)
+            except RowError as exc:
+                self.stats.errors.append(str(exc))
+                continue
+            # Повтор slug в пачке: побеждает последняя строка
+            # (ON CONFLICT не обновляет одну строку дважды)
+            rows.pop(row.slug, None)
+            rows[row.slug] = row
+
+        # Как Product.save: теги из описания, иначе — заданные в файле
+        parsed: List[CatalogRow] = []
+        limit = _max_length("tags")
+        for row, tags in zip(rows.values(), generate_tags_batch(r.values["short_description"] for r in rows.values())):
+            row.values["tags"] = tags or row.values["tags"]
+            if len(row.values["tags"]) > limit:
+                self.stats.errors.append(str(RowError(row.line, f"tags: длиннее {limit} символов")))
+                continue
+            parsed.append(row)
+        return parsed
+
+    def _ensure_categories(self, rows: List[CatalogRow]) -> None:
+        missing: Dict[str, str] = {}
+        for row in rows:
+            if row.category not in self._categories:
+                missing.setdefault(row.category, row.category_name or row.category)
+        if not missing:
+            return
+
+        Category.objects.bulk_create(
+            [Category(slug=slug, name=name) for slug, name in missing.items()],
+            ignore_conflicts=True,
+        )
+        self._categories.update(
+            Category.objects.using(DEFAULT_DB_ALIAS)
+            .filter(slug__in=list(missing))
+            .values_list("slug", "pk")  # type: ignore[arg-type]
+        )
+        self.stats.categories_created += len(missing)
+        transaction.on_commit(bump_categories)
+
+    def import_batch(self, batch: List[Tuple[int, Record]]) -> None:
+        rows = self._parse(batch)
+        if not rows:
+            return
+
+        slugs = [row.slug for row in rows]
+        with transaction.atomic():
+            self._ensure_categories(rows)
+            existing: Set[str] = set(
+                Product.objects.using(DEFAULT_DB_ALIAS).filter(slug__in=slugs).values_list("slug", flat=True)
+            )
+            Product.objects.bulk_create(
+                [Product(slug=row.slug, category_id=self._categories[row.category], **row.values) for row in rows],
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=self.update_fields,
+            )
+
+            if self.replace_specifications:
+                ids = dict(
+                    Product.objects.using(DEFAULT_DB_ALIAS)
+                    .filter(slug__in=slugs)
+                    .values_list("slug", "pk")  # type: ignore[arg-type]
+                )
+                # Без сигналов post_delete на каждую характеристику: метки и
+                # purge обновляются ниже одним вызовом на пачку
+                ProductSpecification.objects.filter(product_id__in=ids.values())._raw_delete(DEFAULT_DB_ALIAS)
+                ProductSpecification.objects.bulk_create(
+                    ProductSpecification(product_id=ids[row.slug], name=name, value=value)
+                    for row in rows
+                    for name, value in row.specifications
+                )
+
+            transaction.on_commit(lambda: bump_products(slugs))
+            transaction.on_commit(bump_catalog_version)
+            purge_after_commit(product_urls(""))
+
+        self.stats.updated += len(existing)
+        self.stats.created += len(rows) - len(existing)
+
+
+# ======================================================================
+# ЭКСПОРТ
+# ======================================================================
+def export_rows(queryset: Any = None, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+    """Записи каталога в формате импорта; товары читаются порциями."""
+    if queryset is None:
+        queryset = Product.objects.all()
+    queryset = queryset.select_related("category").prefetch_related("specifications").order_by("pk")
+
+    for product in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            "slug": product.slug,
+            "name": product.name,
+            "category": product.category.slug,
+            "category_name": product.category.name,
+            "short_description": product.short_description or "",
+            "description": product.description,
+            "unit": product.unit or "",
+            "price": str(product.price),
+            "old_price": "" if product.old_price is None else str(product.old_price),
+            "stock": product.stock,
+            "is_active": product.is_active,
+            "tags": product.tags,
+            "specifications": [{"name": s.name, "value": s.value} for s in product.specifications.all()],
+        }
+
+
+def write_rows(stream: IO[str], rows: Iterable[Dict[str, Any]], fmt: str) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            row["is_active"] = int(row["is_active"])
+            row["specifications"] = json.dumps(row["specifications"], ensure_ascii=False)
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,237 @@
+"""
+Интеграция с кеширующим прокси (nginx proxy_cache).
+
+1. Заголовки. Декоратор edge_cache помечает GET-ответы каталога:
+   - запрос без сессии и без Authorization (аноним без корзины) →
+     Cache-Control: public, max-age=0, s-maxage=N и X-Accel-Expires: N —
+     nginx держит ответ N секунд, браузер каждый раз переспрашивает
+     (дёшево — ETag, см. versioning.py);
+   - иначе → Cache-Control: private, прокси такой ответ не сохраняет.
+   Ответ, выставляющий cookie, публичным не бывает.
+
+2. Purge. При записи Product / Category (products/signals.py) после
+   коммита вызывается purger из settings.EDGE_CACHE["PURGER"]:
+   - NullPurger — ничего не делает (по умолчанию);
+   - FilePurger — дописывает URL в файл (для тестов и внешних скриптов);
+   - HttpPurger — перезапрашивает URL через nginx с заголовком
+     X-Cache-Refresh, nginx обновляет запись кеша (nginx.conf).
+   Списки с query string не перечислить — они истекают по s-maxage.
+
+   Purge идёт в пуле потоков процесса (PURGE_WORKERS), а не в запросе:
+   HttpPurger ходит через nginx в те же воркеры gunicorn, и оформление
+   заказа ждало бы свои purge-запросы (с одним воркером — каждый до
+   PURGE_TIMEOUT). PURGE_WORKERS = 0 — сразу после коммита в том же
+   потоке (тесты).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, cast
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "MAX_AGE": 30,
+    "PURGER": "products.edge_cache.NullPurger",
+    "PURGE_FILE": "",
+    "PURGE_BASE_URL": "http://nginx",
+    "PURGE_TIMEOUT": 2,
+    "PURGE_WORKERS": 0,
+}
+
+# Атрибут запроса: ответ может попасть в общий кеш (шаблоны не выводят CSRF-токен)
+EDGE_CACHEABLE_ATTR = "edge_cacheable"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def get_edge_setting(name: str) -> Any:
+    """Значение из settings.EDGE_CACHE (или значение по умолчанию)."""
+    configured: Dict[str, Any] = getattr(settings, "EDGE_CACHE", {})
+    return configured.get(name, DEFAULT_SETTINGS[name])
+
+
+# ======================================================================
+# ЗАГОЛОВКИ
+# ======================================================================
+def is_edge_cacheable(request: HttpRequest) -> bool:
+    """
+    Аноним без сессии: корзина и вход всегда создают сессию,
+    поэтому проверка cookie не требует обращения к БД.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and "HTTP_AUTHORIZATION" not in request.META
+    )
+
+
+def _patch_edge_headers(request: HttpRequest, cacheable: bool, response: HttpResponse) -> HttpResponse:
+    if request.method not in ("GET", "HEAD"):
+        return response
+
+    if cacheable and response.status_code in (200, 304, 404) and not response.cookies:
+        max_age = get_edge_setting("MAX_AGE")
+        patch_cache_control(response, public=True, max_age=0, s_maxage=max_age)
+        response["X-Accel-Expires"] = str(max_age)
+    else:
+        patch_cache_control(response, private=True)
+    return response
+
+
+def edge_cache(view_func: Callable[..., Any]) -> Callable[..., Any]:
+    """Выставляет Cache-Control для прокси (см. описание модуля). Поддерживает async-представления."""
+
+    if iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def async_wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            cacheable = is_edge_cacheable(request)
+            setattr(request, EDGE_CACHEABLE_ATTR, cacheable)
+            response = await view_func(request, *args, **kwargs)
+            return _patch_edge_headers(request, cacheable, response)
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        cacheable = is_edge_cacheable(request)
+        setattr(request, EDGE_CACHEABLE_ATTR, cacheable)
+        response = view_func(request, *args, **kwargs)
+        return _patch_edge_headers(request, cacheable, response)
+
+    return wrapper
+
+
+# ======================================================================
+# PURGERS
+# ======================================================================
+class Purger(Protocol):
+    def purge(self, urls: Iterable[str]) -> None:
+        """Инвалидирует закешированные ответы по путям urls."""
+
+
+class NullPurger:
+    """Прокси не настроен — инвалидировать нечего."""
+
+    def purge(self, urls: Iterable[str]) -> None:
+        return None
+
+
+class FilePurger:
+    """Дописывает пути в файл, по одному на строку."""
+
+    def __init__(self, path: str = "") -> None:
+        self.path = Path(path or get_edge_setting("PURGE_FILE"))
+
+    def purge(self, urls: Iterable[str]) -> None:
+        with self.path.open("a", encoding="utf-8") as fh:
+            for url in urls:
+                fh.write(url + "\n")
+
+    def read(self) -> List[str]:
+        if not self.path.exists():
+            return []
+        return self.path.read_text(encoding="utf-8").splitlines()
+
+
+class HttpPurger:
+    """
+    Перезапрашивает пути через nginx в обход кеша (X-Cache-Refresh: 1).
+    nginx хранит HTML и JSON отдельно (ключ учитывает Accept) — обновляем оба.
+    """
+
+    ACCEPT_VARIANTS = ("text/html", "application/json")
+
+    def __init__(self, base_url: str = "", timeout: float = 0) -> None:
+        self.base_url = (base_url or get_edge_setting("PURGE_BASE_URL")).rstrip("/")
+        self.timeout = timeout or get_edge_setting("PURGE_TIMEOUT")
+
+    def purge(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            for accept in self.ACCEPT_VARIANTS:
+                request = urllib.request.Request(
+                    self.base_url + url,
+                    headers={"X-Cache-Refresh": "1", "Accept": accept},
+                )
+                try:
+                    with urllib.request.urlopen(request, timeout=self.timeout):
+                        pass
+                except OSError as exc:
+                    # Недоступный прокси не должен ломать сохранение товара
+                    logger.warning("Edge cache purge failed for %s: %s", url, exc)
+
+
+def get_purger() -> Purger:
+    return cast(Purger, import_string(get_edge_setting("PURGER"))())
+
+
+# ======================================================================
+# URL ДЛЯ ИНВАЛИДАЦИИ
+# ======================================================================
+def product_urls(slug: str) -> List[str]:
+    urls = [reverse("products:product_list"), reverse("product-list")]
+    if slug:
+        urls += [
+            reverse("products:product_detail", args=[slug]),
+            reverse("product-detail", kwargs={"slug": slug}),
+        ]
+    return urls
+
+
+def category_urls(pk: int) -> List[str]:
+    return [
+        reverse("products:product_list"),
+        reverse("category-list"),
+        reverse("category-detail", kwargs={"pk": pk}),
+    ]
+
+
+def _pool() -> ThreadPoolExecutor:
+    """Пул текущего процесса (после fork потоки родителя в воркере не существуют)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=get_edge_setting("PURGE_WORKERS"),
+                thread_name_prefix="edge-purge",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _purge(urls: List[str]) -> None:
+    try:
+        get_purger().purge(urls)
+    except Exception:
+        logger.exception("Edge cache purge failed")
+
+
+def purge(urls: List[str]) -> None:
+    """Инвалидация в пуле потоков (PURGE_WORKERS = 0 — сразу в текущем потоке)."""
+    if get_edge_setting("PURGE_WORKERS") <= 0:
+        get_purger().purge(urls)
+        return
+    _pool().submit(_purge, urls)
+
+
+def purge_after_commit(urls: List[str]) -> None:
+    """Инвалидация после коммита: прокси не должен успеть закешировать старые данные."""
+    transaction.on_commit(lambda: purge(urls))
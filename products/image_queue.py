@@ -0,0 +1,170 @@
+"""
+Очередь обработки изображений товаров, загруженных персоналом
+(staff dashboard и админка).
+
+Запрос только сохраняет файл как есть в staging/products/ и создаёт
+ProductImageUpload; тяжёлая часть идёт после коммита в пуле потоков
+процесса (settings.PRODUCT_IMAGES["WORKERS"]):
+
+    1. задание атомарно переводится pending -> processing (его берёт один поток);
+    2. оригинал нормализуется (images.normalize_original): поворот по EXIF,
+       метаданные удаляются, длинная сторона не больше MAX_SIDE, пережатие;
+    3. результат становится изображением товара — post_save строит
+       производные (products/signals.py), метки кеша и purge — как обычно;
+    4. задание -> done, файл из staging удаляется; ошибка -> failed с текстом.
+
+До конца обработки товар показывает прежнее изображение, статус виден
+в форме товара. Задания, не дошедшие до пула (перезапуск процесса),
+дообрабатывает команда process_image_uploads.
+
+WORKERS = 0 — задание выполняется сразу после коммита в том же потоке
+(тесты, отладка).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from .images import normalize_original
+from .models import Product, ProductImageUpload
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+# ======================================================================
+# ПОСТАНОВКА В ОЧЕРЕДЬ (запрос)
+# ======================================================================
+def take_upload(form: Any) -> Optional[UploadedFile]:
+    """
+    Забирает новый файл изображения из валидной ModelForm товара: в модель
+    возвращается прежнее изображение, файл отдаётся для enqueue.
+    Очистка поля («Clear») и форма без файла — None, сохранение как обычно.
+    """
+    upload = form.cleaned_data.get("image")
+    if not isinstance(upload, UploadedFile):
+        return None
+    # construct_instance уже подставил файл в модель; initial — прежний FieldFile
+    previous = form.initial.get("image")
+    form.instance.image = previous.name if previous else None
+    return upload
+
+
+def enqueue(product: Product, upload: UploadedFile) -> ProductImageUpload:
+    """
+    Сохраняет файл в staging и ставит задание в очередь после коммита.
+    Ещё не начатые задания товара заменяются новым.
+    """
+    for stale in product.image_uploads.filter(status=ProductImageUpload.STATUS_PENDING):
+        _finish(stale, ProductImageUpload.STATUS_FAILED, "Заменено более новой загрузкой.")
+
+    job = ProductImageUpload.objects.create(product=product, staged=upload)
+    transaction.on_commit(lambda: submit(job.pk))
+    return job
+
+
+def latest_upload(product: Optional[Product]) -> Optional[ProductImageUpload]:
+    """Последняя загрузка товара — для статуса в форме."""
+    if product is None or product.pk is None:
+        return None
+    return product.image_uploads.order_by("-created_at", "-id").first()
+
+
+# ======================================================================
+# ПУЛ ПОТОКОВ
+# ======================================================================
+def _pool() -> ThreadPoolExecutor:
+    """
+    Пул текущего процесса. Создаётся при первом задании: после fork
+    (gunicorn --preload) потоки родителя в воркере не существуют.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PRODUCT_IMAGES["WORKERS"],
+                thread_name_prefix="product-images",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _run_in_thread(pk: int) -> None:
+    try:
+        run_job(pk)
+    except Exception:
+        logger.exception("Сбой обработчика загрузки изображения %s", pk)
+    finally:
+        # Соединения потока пула сами не закрываются
+        connections.close_all()
+
+
+def submit(pk: int) -> None:
+    if settings.PRODUCT_IMAGES["WORKERS"] <= 0:
+        run_job(pk)
+        return
+    _pool().submit(_run_in_thread, pk)
+
+
+# ======================================================================
+# ОБРАБОТКА
+# ======================================================================
+def _claim(pk: int, statuses: tuple[str, ...] = (ProductImageUpload.STATUS_PENDING,)) -> bool:
+    """Атомарный захват задания: из нескольких потоков / процессов выигрывает один."""
+    return bool(
+        ProductImageUpload.objects.filter(pk=pk, status__in=statuses).update(
+            status=ProductImageUpload.STATUS_PROCESSING, updated_at=timezone.now()
+        )
+    )
+
+
+def _finish(job: ProductImageUpload, status: str, error: str = "") -> None:
+    if job.staged:
+        job.staged.delete(save=False)
+    ProductImageUpload.objects.filter(pk=job.pk).update(
+        status=status, error=error, staged=job.staged.name or "", updated_at=timezone.now()
+    )
+
+
+def run_job(pk: int, statuses: tuple[str, ...] = (ProductImageUpload.STATUS_PENDING,)) -> bool:
+    """
+    Обрабатывает задание pk, если удалось его захватить. True — изображение
+    товара заменено. statuses — из каких статусов задание можно взять
+    (команда process_image_uploads забирает и зависшие processing).
+    """
+    if not _claim(pk, statuses):
+        return False
+
+    job = ProductImageUpload.objects.select_related("product").get(pk=pk)
+    try:
+        with job.staged.open("rb") as staged:
+            data = staged.read()
+        content, extension = normalize_original(data)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError, ValueError) as exc:
+        logger.warning("Загрузка изображения %s не обработана: %s", pk, exc)
+        _finish(job, ProductImageUpload.STATUS_FAILED, f"Не удалось прочитать изображение: {exc}")
+        return False
+
+    product = job.product
+    stem = posixpath.splitext(posixpath.basename(job.staged.name))[0]
+    product.image.save(f"{stem}.{extension}", ContentFile(content), save=False)
+    # Только изображение: правки карточки, сделанные за время обработки, не затираются
+    product.save(update_fields=["image", "updated_at"])
+
+    _finish(job, ProductImageUpload.STATUS_DONE)
+    return True
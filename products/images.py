@@ -0,0 +1,244 @@
+"""
+Производные изображения товаров: несколько ширин в AVIF / WebP и в формате
+оригинала (JPEG, для изображений с прозрачностью — PNG).
+
+Производные лежат рядом с оригиналом, имя содержит хеш содержимого
+оригинала (и параметров кодирования) и ширину:
+products/citra_hops.3f9c2a1b7d4e.640w.webp — новое изображение получает
+новые имена, старые URL можно кешировать навсегда.
+Список производных хранится в Product.image_variants (манифест):
+
+    {
+        "source": "products/citra_hops.jpg",   # оригинал, по которому построены
+        "hash": "3f9c2a1b7d4e",
+        "width": 1600, "height": 1200,
+        "variants": {"webp": {"320": "products/…320w.webp", …}, "jpeg": {…}},
+    }
+
+Манифест строится при сохранении товара с новым изображением
+(products/signals.py) и командой build_product_images для уже загруженных.
+Пока манифест не соответствует текущему изображению, шаблоны, API и админка
+отдают оригинал.
+
+Ширины, форматы и качество — settings.PRODUCT_IMAGES. Форматы, которые
+не поддерживает установленный Pillow (AVIF без libavif), пропускаются.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import posixpath
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+# Формат Pillow, расширение и MIME-тип
+FORMATS: Dict[str, Tuple[str, str, str]] = {
+    "avif": ("AVIF", "avif", "image/avif"),
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "png": ("PNG", "png", "image/png"),
+}
+
+# Порядок <source> в <picture>: браузер берёт первый поддерживаемый
+MODERN_FORMATS = ("avif", "webp")
+
+
+def enabled_formats() -> List[str]:
+    """Современные форматы из настроек, которые умеет кодировать Pillow."""
+    return [name for name in settings.PRODUCT_IMAGES["FORMATS"] if name in MODERN_FORMATS and features.check(name)]
+
+
+# ======================================================================
+# ПОСТРОЕНИЕ
+# ======================================================================
+def _widths(source_width: int) -> List[int]:
+    """Ширины производных не больше оригинала; узкий оригинал — одна ширина."""
+    widths = [width for width in settings.PRODUCT_IMAGES["WIDTHS"] if width < source_width]
+    largest = max(settings.PRODUCT_IMAGES["WIDTHS"])
+    if source_width <= largest:
+        widths.append(source_width)
+    return sorted(set(widths))
+
+
+def _encode(image: Image.Image, fmt: str, original: bool = False) -> bytes:
+    pil_format = FORMATS[fmt][0]
+    quality = settings.PRODUCT_IMAGES["QUALITY"]
+    options: Dict[str, Any] = {"quality": quality["original"] if original else quality.get(fmt, 80)}
+    if fmt == "jpeg":
+        options.update(optimize=True, progressive=True)
+    elif fmt == "png":
+        options = {"optimize": True}
+    elif fmt == "webp":
+        options["method"] = 4
+
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def _digest(data: bytes) -> str:
+    """Хеш оригинала и параметров кодирования: после смены QUALITY имена новые."""
+    quality = repr(sorted(settings.PRODUCT_IMAGES["QUALITY"].items())).encode("ascii")
+    return hashlib.sha256(data + quality).hexdigest()[:12]
+
+
+def _variant_name(source: str, digest: str, width: int, fmt: str) -> str:
+    directory, filename = posixpath.split(source)
+    stem = filename.rsplit(".", 1)[0]
+    return posixpath.join(directory, f"{stem}.{digest}.{width}w.{FORMATS[fmt][1]}")
+
+
+def _decode(data: bytes) -> Tuple[Image.Image, str]:
+    """Изображение с применённым поворотом по EXIF и формат, в котором его хранить."""
+    with Image.open(io.BytesIO(data)) as opened:
+        image = ImageOps.exif_transpose(opened)
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB"), "png" if has_alpha else "jpeg"
+
+
+def normalize_original(data: bytes) -> Tuple[bytes, str]:
+    """
+    Оригинал для хранения: поворот по EXIF применён, метаданные (EXIF, GPS)
+    удалены, длинная сторона не больше MAX_SIDE, пережат в JPEG (PNG при
+    прозрачности). Возвращает содержимое и расширение файла.
+    """
+    image, fmt = _decode(data)
+    max_side = settings.PRODUCT_IMAGES["MAX_SIDE"]
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    return _encode(image, fmt, original=True), FORMATS[fmt][1]
+
+
+def build_variants(storage: Storage, source: str, data: bytes) -> Dict[str, Any]:
+    """
+    Строит производные изображения data (оригинал с именем source) и
+    возвращает манифест. Поворот по EXIF применяется, метаданные в
+    производные не попадают. Ошибка декодирования — UnidentifiedImageError.
+    """
+    digest = _digest(data)
+    image, fallback = _decode(data)
+
+    variants: Dict[str, Dict[str, str]] = {}
+    for width in _widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in [*enabled_formats(), fallback]:
+            name = _variant_name(source, digest, width, fmt)
+            # Имя определяется содержимым оригинала: готовый файл не пересоздаём
+            if not storage.exists(name):
+                saved = storage.save(name, ContentFile(_encode(resized, fmt)))
+                if saved != name:
+                    logger.warning("Производная сохранена под другим именем: %s -> %s", name, saved)
+                    name = saved
+            variants.setdefault(fmt, {})[str(width)] = name
+
+    return {"source": source, "hash": digest, "width": image.width, "height": image.height, "variants": variants}
+
+
+def manifest_files(manifest: Dict[str, Any]) -> List[str]:
+    return [name for sizes in manifest.get("variants", {}).values() for name in sizes.values()]
+
+
+def delete_variants(storage: Storage, manifest: Dict[str, Any], keep: Iterable[str] = ()) -> None:
+    """Удаляет файлы производных манифеста (кроме keep)."""
+    keep = set(keep)
+    for name in manifest_files(manifest):
+        if name not in keep:
+            storage.delete(name)
+
+
+def process_product_image(product: Product) -> Optional[Dict[str, Any]]:
+    """
+    Строит манифест для текущего изображения товара и сохраняет его.
+    Производные прежнего изображения удаляются. Битый или отсутствующий
+    файл — манифест очищается, страницы отдают оригинал.
+    """
+    previous: Dict[str, Any] = product.image_variants or {}
+    manifest: Dict[str, Any] = {}
+
+    if product.image:
+        storage = product.image.storage
+        try:
+            with storage.open(product.image.name, "rb") as source:
+                data = source.read()
+            manifest = build_variants(storage, product.image.name, data)
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+            logger.exception("Не удалось построить производные изображения товара %s", product.pk)
+            manifest = {}
+
+    if previous:
+        delete_variants(product.image.storage, previous, keep=manifest_files(manifest))
+
+    Product.objects.filter(pk=product.pk).update(image_variants=manifest)
+    product.image_variants = manifest
+    return manifest or None
+
+
+def is_stale(product: Product) -> bool:
+    """Манифест не соответствует текущему изображению (или его нет)."""
+    source = (product.image_variants or {}).get("source")
+    return bool(product.image) and source != product.image.name
+
+
+# ======================================================================
+# ЧТЕНИЕ: srcset для шаблонов, карта вариантов для API
+# ======================================================================
+def variant_urls(product: Product) -> Dict[str, Dict[int, str]]:
+    """URL производных по формату и ширине; пусто, если манифест устарел."""
+    if not product.image or is_stale(product):
+        return {}
+    storage = product.image.storage
+    return {
+        fmt: {int(width): storage.url(name) for width, name in sorted(sizes.items(), key=lambda item: int(item[0]))}
+        for fmt, sizes in product.image_variants["variants"].items()
+    }
+
+
+def srcset(urls: Dict[int, str]) -> str:
+    return ", ".join(f"{url} {width}w" for width, url in sorted(urls.items()))
+
+
+def fallback_format(urls: Dict[str, Dict[int, str]]) -> Optional[str]:
+    return next((fmt for fmt in urls if fmt not in MODERN_FORMATS), None)
+
+
+def picture(product: Product) -> Dict[str, Any]:
+    """
+    Данные для <picture>: <source> современных форматов и <img> в формате
+    оригинала. Без производных — только src оригинала.
+    """
+    urls = variant_urls(product)
+    fallback = fallback_format(urls)
+    if fallback is None:
+        return {"sources": [], "src": product.image.url if product.image else None, "srcset": ""}
+
+    manifest = product.image_variants
+    fallback_urls = urls[fallback]
+    return {
+        "sources": [{"type": FORMATS[fmt][2], "srcset": srcset(urls[fmt])} for fmt in MODERN_FORMATS if fmt in urls],
+        # src — наибольшая производная: для браузеров без srcset
+        "src": fallback_urls[max(fallback_urls)],
+        "srcset": srcset(fallback_urls),
+        "width": manifest["width"],
+        "height": manifest["height"],
+    }
+
+
+def thumbnail_url(product: Product, min_width: int) -> Optional[str]:
+    """Наименьшая производная не уже min_width (WebP, если есть) — превью в админке."""
+    urls = variant_urls(product)
+    fmt = "webp" if "webp" in urls else fallback_format(urls)
+    if fmt is None:
+        return product.image.url if product.image else None
+    widths = sorted(urls[fmt])
+    width = next((width for width in widths if width >= min_width), widths[-1])
+    return urls[fmt][width]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from products.models import Product
+from products.tokenizer import generate_tags_batch
+from products.versioning import bump_products
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает теги товаров (products/tokenizer.py) пачками по pk и записывает "
+        "только изменившиеся. Повторный запуск ничего не меняет; прерванный — "
+        "продолжается с --after-pk."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--chunk-size", type=int, default=2000, help="товаров в пачке (по умолчанию 2000)")
+        parser.add_argument("--after-pk", type=int, default=0, help="начать с товаров с pk больше указанного")
+        parser.add_argument("--dry-run", action="store_true", help="только посчитать, что изменится")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        chunk_size: int = options["chunk_size"]
+        last_pk: int = options["after_pk"]
+        dry_run: bool = options["dry_run"]
+
+        # Чтение — с основной БД: теги сравниваются с тем, что будет записано
+        products = Product.objects.using(DEFAULT_DB_ALIAS)
+        total = products.filter(pk__gt=last_pk).count()
+        checked = updated = 0
+        started = time.monotonic()
+
+        try:
+            while True:
+                # Keyset по pk: каждая пачка — отдельный короткий запрос и
+                # отдельная запись, прогресс не теряется при прерывании
+                chunk = list(
+                    products.filter(pk__gt=last_pk)
+                    .only("pk", "slug", "short_description", "tags")
+                    .order_by("pk")[:chunk_size]
+                )
+                if not chunk:
+                    break
+
+                changed = []
+                # Как Product.save: пустой результат теги не затирает
+                for product, tags in zip(chunk, generate_tags_batch(p.short_description for p in chunk)):
+                    if tags and tags != product.tags:
+                        product.tags = tags
+                        changed.append(product)
+
+                if changed and not dry_run:
+                    # updated_at не трогаем: у товара изменились только теги
+                    Product.objects.db_manager(DEFAULT_DB_ALIAS).bulk_update(changed, ["tags"])
+                    bump_products(product.slug for product in changed)
+
+                last_pk = chunk[-1].pk
+                checked += len(chunk)
+                updated += len(changed)
+                self.stdout.write(f"  pk ≤ {last_pk}: {checked}/{total} checked, {updated} changed")
+        except KeyboardInterrupt:
+            self.stderr.write(self.style.WARNING(f"Прервано. Продолжить: --after-pk {last_pk}"))
+            raise
+
+        verb = "would change" if dry_run else "changed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✔ Product tags checked: {checked}, {verb}: {updated} ({time.monotonic() - started:.1f}s)"
+            )
+        )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from products.images import is_stale, process_product_image
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = "Строит производные изображений товаров (размеры, WebP / AVIF) — products/images.py"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="перестроить и товары с актуальным манифестом (после смены PRODUCT_IMAGES)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        built = failed = 0
+        for product in Product.objects.exclude(image="").exclude(image__isnull=True).order_by("pk").iterator():
+            if not options["force"] and not is_stale(product):
+                continue
+            if process_product_image(product):
+                built += 1
+            else:
+                failed += 1
+                self.stderr.write(self.style.WARNING(f"✘ {product.slug}: изображение не прочитано"))
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Product images built: {built}, failed: {failed}"))
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from products.catalog_io import FORMATS, detect_format, export_rows, write_rows
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = "Экспорт каталога в CSV / JSONL (формат catalog_import) — products/catalog_io.py"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="файл CSV / JSONL; «-» — стандартный вывод")
+        parser.add_argument("--format", choices=FORMATS, help="формат файла (по умолчанию — по расширению)")
+        parser.add_argument("--active-only", action="store_true", help="только активные товары")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options["path"]
+        try:
+            fmt = detect_format(path, options["format"] or ("jsonl" if path == "-" else None))
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        queryset = Product.objects.filter(is_active=True) if options["active_only"] else Product.objects.all()
+        if path == "-":
+            write_rows(self.stdout, export_rows(queryset), fmt)
+            return
+
+        with open(path, "w", encoding="utf-8", newline="") as stream:
+            count = write_rows(stream, export_rows(queryset), fmt)
+        self.stdout.write(self.style.SUCCESS(f"✔ Products exported: {count} → {path}"))
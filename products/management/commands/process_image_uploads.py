@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Q
+from django.utils import timezone
+
+from products.image_queue import run_job
+from products.models import ProductImageUpload
+
+
+class Command(BaseCommand):
+    help = (
+        "Обрабатывает загрузки изображений товаров, не дошедшие до пула потоков "
+        "(перезапуск процесса) — products/image_queue.py"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--stuck-after",
+            type=int,
+            default=15,
+            help="через сколько минут задание в статусе processing считается зависшим (по умолчанию 15)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stuck_before = timezone.now() - timedelta(minutes=options["stuck_after"])
+        pending = Q(status=ProductImageUpload.STATUS_PENDING)
+        stuck = Q(status=ProductImageUpload.STATUS_PROCESSING, updated_at__lt=stuck_before)
+        statuses = (ProductImageUpload.STATUS_PENDING, ProductImageUpload.STATUS_PROCESSING)
+
+        done = failed = 0
+        for job in ProductImageUpload.objects.filter(pending | stuck).order_by("created_at", "pk").iterator():
+            if run_job(job.pk, statuses):
+                done += 1
+            else:
+                failed += 1
+                self.stderr.write(self.style.WARNING(f"✘ upload {job.pk}: не обработано"))
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Image uploads processed: {done}, failed: {failed}"))
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    """Рейтинг существующих товаров по их отзывам (как reviews.ratings.refresh_ratings)."""
+    Product = apps.get_model("products", "Product")
+    Review = apps.get_model("reviews", "Review")
+
+    def aggregate(expression):
+        subquery = (
+            Review.objects.filter(product=OuterRef("pk"))
+            .order_by()
+            .values("product")
+            .annotate(value=expression)
+            .values("value")
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    Product.objects.update(rating_count=aggregate(Count("id")), rating_sum=aggregate(Sum("rating")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_product_catalog_indexes"),
+        ("reviews", "0003_review_review_product_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
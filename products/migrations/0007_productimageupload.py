@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0006_product_image_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductImageUpload",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("staged", models.FileField(max_length=255, upload_to="staging/products/")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В очереди"),
+                            ("processing", "Обрабатывается"),
+                            ("done", "Готово"),
+                            ("failed", "Ошибка"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="image_uploads", to="products.product"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Product Image Upload",
+                "verbose_name_plural": "Product Image Uploads",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import re
-from typing import Any, Set
+from typing import Any
 
 from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from .tokenizer import generate_tags
+
 
 class Category(models.Model):
     """
@@ -71,6 +72,8 @@ class Product(models.Model):
     )
 
     image = models.ImageField(upload_to="products/", blank=True, null=True)
+    # Манифест производных изображения: размеры и форматы (products/images.py)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     stock = models.PositiveIntegerField(default=0)
 
@@ -80,6 +83,11 @@ class Product(models.Model):
         help_text="Separated keywords",
     )
 
+    # Рейтинг по отзывам: хранится в строке товара, пересчитывается при
+    # изменении отзывов (reviews/ratings.py) — карточка не агрегирует отзывы
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -87,6 +95,12 @@ class Product(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Product"
         verbose_name_plural = "Products"
+        indexes = [
+            # Каталог: активные товары по новизне и по цене. Частичные индексы:
+            # скрытые товары в них не попадают
+            models.Index(fields=["-created_at"], condition=models.Q(is_active=True), name="product_active_created_idx"),
+            models.Index(fields=["price"], condition=models.Q(is_active=True), name="product_active_price_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -100,41 +114,9 @@ class Product(models.Model):
             self.slug = slugify(self.name)
 
         # Генерация тегов
-        if self.short_description:
-            text: str = self.short_description.lower()
-            text = re.sub(r"[^a-zA-Zа-яА-Я0-9 ]+", " ", text)
-            words = text.split()
-
-            stop_words: Set[str] = {
-                "the",
-                "and",
-                "or",
-                "for",
-                "with",
-                "from",
-                "made",
-                "of",
-                "to",
-                "a",
-                "in",
-                "on",
-                "at",
-                "is",
-                "this",
-                "an",
-                "и",
-                "для",
-                "под",
-                "над",
-                "при",
-                "из",
-                "от",
-                "до",
-            }
-
-            tags_set: Set[str] = {w for w in words if len(w) > 2 and w not in stop_words}
-            if tags_set:
-                self.tags = ", ".join(sorted(tags_set))
+        tags = generate_tags(self.short_description)
+        if tags:
+            self.tags = tags
 
         super().save(*args, **kwargs)
 
@@ -153,6 +135,13 @@ class Product(models.Model):
             return int(100 - (self.price / self.old_price * 100))
         return 0
 
+    @property
+    def average_rating(self) -> float:
+        """Средняя оценка по отзывам (0 — отзывов нет)."""
+        if not self.rating_count:
+            return 0.0
+        return self.rating_sum / self.rating_count
+
 
 class ProductSpecification(models.Model):
     """
@@ -174,3 +163,49 @@ class ProductSpecification(models.Model):
 
     def __str__(self) -> str:
         return f"{self.name}: {self.value}"
+
+
+class ProductImageUpload(models.Model):
+    """
+    Загруженное изображение товара в очереди обработки (products/image_queue.py).
+
+    Файл лежит в закрытом каталоге staging/ до обработки: EXIF удаляется,
+    оригинал пережимается, строятся производные — после этого он становится
+    изображением товара. До того товар показывает прежнее изображение.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "В очереди"),
+        (STATUS_PROCESSING, "Обрабатывается"),
+        (STATUS_DONE, "Готово"),
+        (STATUS_FAILED, "Ошибка"),
+    ]
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="image_uploads",
+    )
+    staged = models.FileField(upload_to="staging/products/", max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Product Image Upload"
+        verbose_name_plural = "Product Image Uploads"
+
+    def __str__(self) -> str:
+        return f"{self.product_id}: {self.get_status_display()}"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (self.STATUS_PENDING, self.STATUS_PROCESSING)
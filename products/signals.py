@@ -2,27 +2,67 @@ from __future__ import annotations
 
 from typing import Any
 
-from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import Product
+from reviews.models import Review
 
+from .edge_cache import category_urls, product_urls, purge_after_commit
+from .images import delete_variants, is_stale, process_product_image
+from .models import Category, Product, ProductSpecification
+from .versioning import bump_categories, bump_product, forget_product
 
-@receiver(post_migrate)
-def generate_tags_after_migrate(sender: type[AppConfig], **kwargs: Any) -> None:
+
+# ======================================================================
+# ИЗМЕНЕНИЯ КАТАЛОГА: метки для ETag (versioning.py) и purge прокси (edge_cache.py)
+# ======================================================================
+@receiver(post_save, sender=Product)
+def on_product_saved(sender: type[Product], instance: Product, **kwargs: Any) -> None:
+    bump_product(instance.slug)
+    purge_after_commit(product_urls(instance.slug))
+
+
+@receiver(post_delete, sender=Product)
+def on_product_deleted(sender: type[Product], instance: Product, **kwargs: Any) -> None:
+    forget_product(instance.slug)
+    purge_after_commit(product_urls(instance.slug))
+
+
+# ======================================================================
+# ПРОИЗВОДНЫЕ ИЗОБРАЖЕНИЙ (images.py)
+# ======================================================================
+@receiver(post_save, sender=Product)
+def on_product_image_saved(sender: type[Product], instance: Product, **kwargs: Any) -> None:
     """
-    Генерация тегов для товаров после применения миграций.
-    Запускается только для приложения `products`.
+    Новое или удалённое изображение — перестраиваем манифест производных.
+    loaddata (raw) пропускаем: производные строит build_product_images.
     """
+    if kwargs.get("raw"):
+        return
+    if is_stale(instance) or (not instance.image and instance.image_variants):
+        process_product_image(instance)
+
+
+@receiver(post_delete, sender=Product)
+def on_product_image_deleted(sender: type[Product], instance: Product, **kwargs: Any) -> None:
+    if instance.image_variants:
+        delete_variants(instance.image.storage, instance.image_variants)
+
 
-    # Сигнал вызывается для каждого приложения — фильтруем.
-    if sender.label != "products":
-        return None
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def on_category_changed(sender: type[Category], instance: Category, **kwargs: Any) -> None:
+    bump_categories()
+    purge_after_commit(category_urls(instance.pk))
 
-    # Перебираем товары и пересохраняем для автогенерации тегов.
-    for product in Product.objects.all():
-        # вызывает пересчёт тегов в модели.
-        product.save(update_fields=None)
 
-    return None
+@receiver(post_save, sender=ProductSpecification)
+@receiver(post_delete, sender=ProductSpecification)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def on_product_content_changed(sender: type, instance: ProductSpecification | Review, **kwargs: Any) -> None:
+    """Характеристики и отзывы входят в карточку товара."""
+    product = Product.objects.filter(pk=instance.product_id).only("slug").first()
+    if product is not None:
+        bump_product(product.slug)
+        purge_after_commit(product_urls(product.slug))
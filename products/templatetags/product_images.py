@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from django import template
+
+from products.images import picture
+from products.models import Product
+
+register = template.Library()
+
+
+@register.inclusion_tag("products/picture.html")
+def product_picture(product: Product, sizes: str, css_class: str = "", loading: str = "lazy") -> Dict[str, Any]:
+    """
+    <picture> изображения товара: AVIF / WebP / оригинал со srcset
+    (products/images.py). sizes — ширина изображения в макете, браузер
+    выбирает по ней производную нужной ширины.
+
+        {% product_picture product "(max-width: 600px) 100vw, 300px" "product-card__image" %}
+    """
+    return {"product": product, "sizes": sizes, "css_class": css_class, "loading": loading, **picture(product)}
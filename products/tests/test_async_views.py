@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Iterator
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve, reverse
+
+from cart.models import CartItem
+from products.models import Product
+
+READ_URLS = ("products:product_list", "products:product_detail", "cart:detail", "reviews:list")
+API_URLS = ("product-list", "category-list")
+
+
+def _reload_urls() -> None:
+    # Представления выбираются при импорте URLconf по settings.SERVER_MODE
+    for name in ("products.urls", "cart.urls", "reviews.urls", "api.urls", settings.ROOT_URLCONF):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+@pytest.fixture(autouse=True)
+def asgi_mode(settings: Any) -> Iterator[None]:
+    """Тесты модуля идут в режиме SERVER_MODE=asgi; после — URLconf снова WSGI."""
+    settings.SERVER_MODE = "asgi"
+    _reload_urls()
+    yield
+    settings.SERVER_MODE = "wsgi"
+    _reload_urls()
+
+
+def _get(client: AsyncClient, url: str, **extra: Any) -> Any:
+    # Запрос проходит через ASGIHandler: sync-ORM в event loop дал бы SynchronousOnlyOperation
+    return async_to_sync(client.get)(url, **extra)
+
+
+# ---------------------------------------------------------
+# 1. Под ASGI каталог, карточка, корзина, отзывы и списки API — async,
+#    под WSGI — синхронные (без async_to_sync на каждый запрос)
+# ---------------------------------------------------------
+def test_views_follow_server_mode() -> None:
+    def resolved(name: str) -> Any:
+        args = ["any"] if name in ("products:product_detail", "reviews:list") else []
+        return resolve(reverse(name, args=args)).func
+
+    for name in READ_URLS + API_URLS:
+        assert iscoroutinefunction(resolved(name)), name
+
+    settings.SERVER_MODE = "wsgi"
+    _reload_urls()
+    for name in READ_URLS + API_URLS:
+        assert not iscoroutinefunction(resolved(name)), name
+
+
+# ---------------------------------------------------------
+# 2. Каталог: фильтр и пагинация через async ORM
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_async_catalog_pagination(product_fixture: Any) -> None:
+    for i in range(12):
+        Product.objects.create(
+            name=f"Hop {i}",
+            slug=f"hop-{i}",
+            category=product_fixture.category,
+            price=10,
+            stock=5,
+        )
+    client = AsyncClient()
+
+    response = _get(client, reverse("products:product_list"), data={"page": 2})
+    assert response.status_code == 200
+    assert response.context["is_paginated"] is True
+    assert response.context["paginator"].count == 13
+    assert len(response.context["products"]) == 1
+
+    response = _get(client, reverse("products:product_list"), data={"q": "Hop 3"})
+    assert [p.slug for p in response.context["products"]] == ["hop-3"]
+
+    assert _get(client, reverse("products:product_list"), data={"page": 9}).status_code == 404
+
+
+# ---------------------------------------------------------
+# 3. Карточка товара: отзывы и 304 под ASGI
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_async_product_detail(product_fixture: Any, review_fixture: Any) -> None:
+    client = AsyncClient()
+    url = reverse("products:product_detail", args=[product_fixture.slug])
+
+    response = _get(client, url)
+    assert response.status_code == 200
+    assert review_fixture.comment in response.content.decode()
+    assert response.context["reviews_count"] == 1
+
+    assert _get(client, url, headers={"if-none-match": response["ETag"]}).status_code == 304
+    assert _get(client, reverse("products:product_detail", args=["missing"])).status_code == 404
+
+
+# ---------------------------------------------------------
+# 4. Корзина авторизованного пользователя
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_async_cart_detail(user_fixture: Any, product_fixture: Any) -> None:
+    CartItem.objects.create(user=user_fixture, product=product_fixture, quantity=3)
+    client = AsyncClient()
+    client.force_login(user_fixture)
+
+    response = _get(client, reverse("cart:detail"))
+
+    assert response.status_code == 200
+    assert product_fixture.name in response.content.decode()
+    assert response.context["total"] == float(product_fixture.price * 3)
+
+
+# ---------------------------------------------------------
+# 5. API: список товаров с поиском и вложенной категорией
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_async_api_list(product_fixture: Any) -> None:
+    client = AsyncClient()
+
+    response = _get(
+        client, "/api/products/", data={"search": product_fixture.name}, headers={"accept": "application/json"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["slug"] for item in data] == [product_fixture.slug]
+    assert data[0]["category"]["id"] == product_fixture.category_id
+    assert _get(client, "/api/categories/", headers={"accept": "application/json"}).status_code == 200
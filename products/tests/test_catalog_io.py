@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from products.catalog_io import CatalogImporter, read_rows
+from products.models import Category, Product, ProductSpecification
+
+CSV = """slug,name,category,category_name,short_description,price,old_price,stock,is_active,specifications
+citra,Citra Hops,hops,Hops,Citrus hops for IPA and pale ale,12.50,,100,1,"{""Alpha acid"": ""12%""}"
+,Pilsner Malt,malt,Malt,,3,4,50,0,
+broken,Broken,hops,,,not-a-price,,1,1,
+"""
+
+
+def _import(tmp_path: Path, name: str, content: str, *args: Any) -> str:
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    out = io.StringIO()
+    call_command("catalog_import", str(path), *args, stdout=out, stderr=io.StringIO())
+    return out.getvalue()
+
+
+# ---------------------------------------------------------
+# 1. CSV: новые товары и категории, slug и теги, характеристики, ошибки строк
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_import_csv(tmp_path: Path) -> None:
+    output = _import(tmp_path, "catalog.csv", CSV)
+
+    assert "created 2, updated 0, skipped 1, new categories 2" in output
+    citra = Product.objects.get(slug="citra")
+    assert citra.category.name == "Hops"
+    assert citra.tags == "ale, citrus, hops, ipa, pale"
+    assert list(citra.specifications.values_list("name", "value")) == [("Alpha acid", "12%")]
+
+    malt = Product.objects.get(slug="pilsner-malt")
+    assert (malt.is_active, malt.old_price, malt.stock) == (False, 4, 50)
+
+
+# ---------------------------------------------------------
+# 2. Повторный импорт JSONL: upsert только переданных полей, замена характеристик
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_upsert_updates_only_given_columns(tmp_path: Path, product_fixture: Any) -> None:
+    ProductSpecification.objects.create(product=product_fixture, name="Old", value="spec")
+    created_at = product_fixture.created_at
+    record = {"slug": product_fixture.slug, "category": "test-category", "specifications": {"Weight": "1 kg"}}
+    content = "\n".join(
+        [
+            json.dumps({**record, "name": "Renamed", "price": "150"}),
+            json.dumps({**record, "name": "Renamed twice", "price": "160", "specifications": {"Weight": "2 kg"}}),
+            "{not json",
+        ]
+    )
+
+    output = _import(tmp_path, "catalog.jsonl", content)
+
+    assert "created 0, updated 1, skipped 1" in output
+    product = Product.objects.get(pk=product_fixture.pk)
+    assert (product.name, product.price) == ("Renamed twice", 160)
+    # Колонок stock / description в файле нет — значения прежние
+    assert (product.stock, product.description, product.created_at) == (10, "Описание товара", created_at)
+    assert list(product.specifications.values_list("name", "value")) == [("Weight", "2 kg")]
+
+
+# ---------------------------------------------------------
+# 3. Экспорт → импорт: тот же каталог; число запросов не зависит от числа строк
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_export_import_roundtrip(tmp_path: Path, category_fixture: Category) -> None:
+    Product.objects.bulk_create(
+        Product(name=f"Item {i}", slug=f"item-{i}", description="-", price=i + 1, category=category_fixture)
+        for i in range(30)
+    )
+    ProductSpecification.objects.create(product=Product.objects.get(slug="item-3"), name="Color", value="Amber")
+    path = tmp_path / "export.csv"
+
+    call_command("catalog_export", str(path), stdout=io.StringIO())
+    exported = path.read_text(encoding="utf-8")
+    Product.objects.all().delete()
+
+    with path.open(encoding="utf-8", newline="") as stream:
+        columns, records = read_rows(stream, "csv")
+        with CaptureQueriesContext(connection) as queries:
+            stats = CatalogImporter(columns, batch_size=10).run(records)
+
+    assert (stats.created, stats.skipped) == (30, 0)
+    assert len(queries) <= 3 * 8
+    assert Product.objects.get(slug="item-3").specifications.get().value == "Amber"
+
+    call_command("catalog_export", str(path), stdout=io.StringIO())
+    assert path.read_text(encoding="utf-8") == exported
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+
+from graphql_api.caching import get_catalog_version
+from products.admin import deactivate_products
+from products.edge_cache import FilePurger
+from products.models import Category, Product
+from products.versioning import aproduct_stamp, product_stamp
+from reviews.models import Review
+
+
+def _etag(client: Any, url: str, **headers: Any) -> str:
+    # Первый запрос выдаёт CSRF-cookie, она входит в ETag HTML-страниц
+    client.get(url, **headers)
+    response = client.get(url, **headers)
+    assert response.status_code == 200
+    etag: str = response["ETag"]
+    return etag
+
+
+# ---------------------------------------------------------
+# 1. Карточка товара: повторный запрос → 304
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_product_detail_not_modified(client_web: Any, product_fixture: Any) -> None:
+    url = reverse("products:product_detail", args=[product_fixture.slug])
+    etag = _etag(client_web, url)
+
+    response = client_web.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+# ---------------------------------------------------------
+# 2. Изменение товара или нового отзыва меняет ETag
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_product_detail_etag_changes_on_write(client_web: Any, product_fixture: Any, user_fixture: Any) -> None:
+    url = reverse("products:product_detail", args=[product_fixture.slug])
+    etag = _etag(client_web, url)
+
+    product_fixture.price = 99
+    product_fixture.save()
+    assert client_web.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    etag = _etag(client_web, url)
+    Review.objects.create(product=product_fixture, user=user_fixture, rating=4, comment="ok")
+    assert client_web.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+# ---------------------------------------------------------
+# 3. Для авторизованных страница персональная — без валидаторов
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_product_detail_no_etag_for_authenticated(client_web: Any, product_fixture: Any, user_fixture: Any) -> None:
+    client_web.force_login(user_fixture)
+
+    response = client_web.get(reverse("products:product_detail", args=[product_fixture.slug]))
+
+    assert response.status_code == 200
+    assert not response.has_header("ETag")
+
+
+# ---------------------------------------------------------
+# 4. Каталог: 304 до изменения категории
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_product_list_not_modified(client_web: Any, product_fixture: Any, category_fixture: Any) -> None:
+    url = reverse("products:product_list")
+    etag = _etag(client_web, url)
+
+    assert client_web.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    category_fixture.name = "Renamed"
+    category_fixture.save()
+    assert client_web.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+# ---------------------------------------------------------
+# 5. API: список товаров и категорий отвечают 304
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_api_not_modified(client: Any, product_fixture: Any) -> None:
+    for url in ("/api/products/", f"/api/products/{product_fixture.slug}/", "/api/categories/"):
+        response = client.get(url, HTTP_ACCEPT="application/json")
+        assert response.status_code == 200
+        assert response.has_header("Last-Modified")
+
+        response = client.get(url, HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+
+    Category.objects.create(name="New", slug="new")
+    response = client.get("/api/categories/", HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200
+
+
+# ---------------------------------------------------------
+# 6. Холодный кеш меток: метка восстанавливается из БД (с отзывами)
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_stamps_recomputed_on_cold_cache(client_web: Any, product_fixture: Any, user_fixture: Any) -> None:
+    Review.objects.create(product=product_fixture, user=user_fixture, rating=5, comment="cold")
+    detail = reverse("products:product_detail", args=[product_fixture.slug])
+    api_detail = f"/api/products/{product_fixture.slug}/"
+
+    for url, headers in (
+        (detail, {}),
+        (reverse("products:product_list"), {}),
+        (api_detail, {"HTTP_ACCEPT": "application/json"}),
+    ):
+        cache.clear()
+        client_web.get(url, **headers)
+        cache.clear()
+        response = client_web.get(url, **headers)
+        assert response.status_code == 200, url
+
+        cache.clear()
+        assert client_web.get(url, HTTP_IF_NONE_MATCH=response["ETag"], **headers).status_code == 304, url
+        cache.clear()
+        assert client_web.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"], **headers).status_code == 304, url
+
+    cache.clear()
+    assert async_to_sync(aproduct_stamp)(product_fixture.slug) == product_stamp(product_fixture.slug)
+
+
+# ---------------------------------------------------------
+# 7. Массовое выключение товаров в админке меняет ETag,
+#    версию каталога GraphQL и очищает прокси
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_admin_bulk_action_bumps_stamps(
+    client_web: Any, settings: Any, tmp_path: Path, product_fixture: Any, django_capture_on_commit_callbacks: Any
+) -> None:
+    purge_file = tmp_path / "purge.log"
+    settings.EDGE_CACHE = {"PURGER": "products.edge_cache.FilePurger", "PURGE_FILE": str(purge_file)}
+    url = reverse("products:product_list")
+    etag = _etag(client_web, url)
+    version = get_catalog_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        deactivate_products(site._registry[Product], RequestFactory().post("/admin/"), Product.objects.all())
+
+    response = client_web.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert product_fixture.name not in response.content.decode()
+    assert get_catalog_version() > version
+    assert reverse("products:product_detail", args=[product_fixture.slug]) in FilePurger(str(purge_file)).read()
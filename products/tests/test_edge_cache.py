@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Iterable, List
+
+import pytest
+from django.conf import settings
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from products.edge_cache import FilePurger, purge_after_commit
+
+
+# ---------------------------------------------------------
+# 1. Аноним без сессии: публичный ответ без CSRF-cookie
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_anonymous_detail_is_public(client_web: Any, product_fixture: Any) -> None:
+    response = client_web.get(reverse("products:product_detail", args=[product_fixture.slug]))
+
+    assert response.status_code == 200
+    assert "public" in response["Cache-Control"]
+    assert "s-maxage=" in response["Cache-Control"]
+    assert response["X-Accel-Expires"]
+    assert settings.CSRF_COOKIE_NAME not in response.cookies
+    assert "data-csrf-from-cookie" in response.content.decode()
+
+
+# ---------------------------------------------------------
+# 2. Сессия (корзина) — ответ персональный
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_session_bypasses_edge_cache(client_web: Any, product_fixture: Any) -> None:
+    client_web.post(reverse("cart:add", args=[product_fixture.id]), {"quantity": 1})
+
+    response = client_web.get(reverse("products:product_detail", args=[product_fixture.slug]))
+
+    assert "private" in response["Cache-Control"]
+    assert "data-csrf-from-cookie" not in response.content.decode()
+
+
+# ---------------------------------------------------------
+# 3. API: публично для анонима, приватно с токеном
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_api_cache_headers(client: Any, product_fixture: Any, user_fixture: Any) -> None:
+    token = AccessToken.for_user(user_fixture)
+
+    assert "public" in client.get("/api/products/")["Cache-Control"]
+    assert "private" in client.get("/api/products/", HTTP_AUTHORIZATION=f"Bearer {token}")["Cache-Control"]
+
+
+# ---------------------------------------------------------
+# 4. Форма из закешированной страницы: токен берётся из cookie
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_cart_add_with_token_from_cookie(product_fixture: Any) -> None:
+    browser = Client(enforce_csrf_checks=True)
+
+    response = browser.get(reverse("products:csrf_cookie"))
+    assert response.status_code == 204
+    token = response.cookies[settings.CSRF_COOKIE_NAME].value
+
+    response = browser.post(
+        reverse("cart:add", args=[product_fixture.id]),
+        {"quantity": 1, "csrfmiddlewaretoken": token},
+    )
+    assert response.status_code == 302
+
+
+# ---------------------------------------------------------
+# 5. Запись товара/категории → purge затронутых URL после коммита
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_purge_on_product_and_category_save(
+    settings: Any,
+    tmp_path: Path,
+    product_fixture: Any,
+    category_fixture: Any,
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    purge_file = tmp_path / "purge.log"
+    settings.EDGE_CACHE = {"PURGER": "products.edge_cache.FilePurger", "PURGE_FILE": str(purge_file)}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product_fixture.price = 42
+        product_fixture.save()
+        category_fixture.save()
+
+    purged = FilePurger(str(purge_file)).read()
+    assert reverse("products:product_detail", args=[product_fixture.slug]) in purged
+    assert f"/api/products/{product_fixture.slug}/" in purged
+    assert f"/api/categories/{category_fixture.pk}/" in purged
+
+
+class BlockingPurger:
+    """Purger, который ждёт release — как HttpPurger, ждущий занятый воркер."""
+
+    release = threading.Event()
+    done = threading.Event()
+    purged: List[str] = []
+
+    def purge(self, urls: Iterable[str]) -> None:
+        self.release.wait(5)
+        self.purged.extend(urls)
+        self.done.set()
+
+
+# ---------------------------------------------------------
+# 6. Purge не задерживает запрос: выполняется в пуле потоков
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_purge_runs_off_request_path(settings: Any, django_capture_on_commit_callbacks: Any) -> None:
+    settings.EDGE_CACHE = {"PURGER": f"{__name__}.BlockingPurger", "PURGE_WORKERS": 1}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        purge_after_commit(["/"])
+
+    # Коммит завершён, а purge ещё ждёт — запрос его не ждал
+    assert not BlockingPurger.done.is_set()
+    BlockingPurger.release.set()
+    assert BlockingPurger.done.wait(5)
+    assert BlockingPurger.purged == ["/"]
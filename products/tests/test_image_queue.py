@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.contrib.admin.sites import site
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+
+from products import image_queue
+from products.models import Product, ProductImageUpload
+from staff_dashboard.forms import ProductAdminForm
+
+
+def _camera_jpeg(width: int = 2400, height: int = 1600) -> SimpleUploadedFile:
+    """«Фото с камеры»: ориентация, модель камеры и GPS в EXIF."""
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x0110] = "Test Camera"
+    exif[0x8825] = {1: "N", 2: (55.0, 45.0, 0.0)}
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (90, 140, 60)).save(buffer, "JPEG", quality=100, exif=exif)
+    return SimpleUploadedFile("camera.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.fixture
+def queue_settings(settings: Any, tmp_path: Path) -> Path:
+    settings.MEDIA_ROOT = tmp_path
+    settings.PRODUCT_IMAGES = {**settings.PRODUCT_IMAGES, "MAX_SIDE": 1000, "WORKERS": 0}
+    return tmp_path
+
+
+@pytest.fixture
+def staff_client(client_web: Any, django_user_model: Any) -> Any:
+    staff = django_user_model.objects.create_user(username="staff", password="x", is_staff=True)
+    client_web.force_login(staff)
+    return client_web
+
+
+def _form_data(product: Product) -> dict[str, Any]:
+    return {
+        "name": product.name,
+        "description": product.description,
+        "unit": product.unit or "",
+        "price": product.price,
+        "category": product.category_id,
+        "stock": product.stock,
+        "is_active": "on",
+        "image": _camera_jpeg(),
+    }
+
+
+# ---------------------------------------------------------
+# 1. Запрос только ставит задание; обработка — EXIF, размер, производные
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_staff_upload_processed_after_commit(
+    queue_settings: Path,
+    staff_client: Any,
+    product_fixture: Any,
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    url = reverse("staff_dashboard:product_edit", args=[product_fixture.pk])
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = staff_client.post(url, _form_data(product_fixture))
+    assert response.status_code == 302
+
+    product_fixture.refresh_from_db()
+    job = ProductImageUpload.objects.get(product=product_fixture)
+    assert not product_fixture.image
+    assert job.status == ProductImageUpload.STATUS_PENDING
+    assert job.staged.name.startswith("staging/products/")
+    assert staff_client.get(url).context["image_upload"] == job
+
+    for callback in callbacks:
+        callback()
+
+    product_fixture.refresh_from_db()
+    job.refresh_from_db()
+    assert job.status == ProductImageUpload.STATUS_DONE
+    assert not job.staged
+    assert not any((queue_settings / "staging" / "products").iterdir())
+
+    with Image.open(queue_settings / product_fixture.image.name) as original:
+        assert original.size == (667, 1000)
+        assert not original.getexif()
+    assert product_fixture.image_variants["source"] == product_fixture.image.name
+
+
+# ---------------------------------------------------------
+# 2. Нечитаемый файл — failed с текстом ошибки в форме
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_failed_upload_shown_on_form(queue_settings: Path, staff_client: Any, product_fixture: Any) -> None:
+    job = ProductImageUpload.objects.create(product=product_fixture, staged=ContentFile(b"not an image", "broken.jpg"))
+
+    assert image_queue.run_job(job.pk) is False
+    assert image_queue.run_job(job.pk) is False
+
+    job.refresh_from_db()
+    assert job.status == ProductImageUpload.STATUS_FAILED
+    assert "Не удалось прочитать изображение" in job.error
+
+    html = staff_client.get(reverse("staff_dashboard:product_edit", args=[product_fixture.pk])).content.decode()
+    assert 'data-status="failed"' in html
+
+
+# ---------------------------------------------------------
+# 3. Админка: то же через save_model; новое задание заменяет ожидающее
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_admin_save_enqueues(
+    rf: Any,
+    queue_settings: Path,
+    product_fixture: Any,
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    older = ProductImageUpload.objects.create(product=product_fixture, staged=_camera_jpeg())
+    data = _form_data(product_fixture)
+    form = ProductAdminForm({k: v for k, v in data.items() if k != "image"}, {"image": data["image"]})
+    form.instance = product_fixture
+    assert form.is_valid(), form.errors
+
+    with django_capture_on_commit_callbacks(execute=True):
+        site._registry[Product].save_model(rf.post("/"), product_fixture, form, change=True)
+
+    older.refresh_from_db()
+    assert older.status == ProductImageUpload.STATUS_FAILED
+    latest = image_queue.latest_upload(product_fixture)
+    assert latest is not None and latest.status == ProductImageUpload.STATUS_DONE
+    assert Product.objects.get(pk=product_fixture.pk).image.name.endswith(".jpg")
+
+
+# ---------------------------------------------------------
+# 4. Пул потоков и команда дообработки
+# ---------------------------------------------------------
+@pytest.mark.django_db(transaction=True)
+def test_worker_pool_and_recovery_command(
+    queue_settings: Path,
+    settings: Any,
+    monkeypatch: Any,
+    product_fixture: Any,
+) -> None:
+    settings.PRODUCT_IMAGES = {**settings.PRODUCT_IMAGES, "WORKERS": 1}
+    monkeypatch.setattr(image_queue, "_executor", None)
+    job = ProductImageUpload.objects.create(product=product_fixture, staged=_camera_jpeg(800, 600))
+
+    image_queue.submit(job.pk)
+    # Пул из одного потока: пустая задача завершится после обработки
+    image_queue._pool().submit(lambda: None).result(timeout=60)
+
+    job.refresh_from_db()
+    assert job.status == ProductImageUpload.STATUS_DONE
+
+    orphan = ProductImageUpload.objects.create(product=product_fixture, staged=_camera_jpeg(800, 600))
+    call_command("process_image_uploads", stdout=io.StringIO())
+
+    orphan.refresh_from_db()
+    assert orphan.status == ProductImageUpload.STATUS_DONE
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.urls import reverse
+from PIL import Image
+
+from graphql_api.schema import schema
+from products.images import FORMATS, enabled_formats, thumbnail_url
+from products.models import Product
+
+
+def _jpeg(width: int = 1600, height: int = 1200, orientation: int = 1) -> SimpleUploadedFile:
+    """JPEG с EXIF (ориентация и модель камеры)."""
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x0110] = "Test Camera"
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 40)).save(buffer, "JPEG", quality=95, exif=exif)
+    return SimpleUploadedFile("hops.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.fixture
+def media(settings: Any, tmp_path: Path) -> Path:
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def product_with_image(db: Any, media: Path, category_fixture: Any) -> Product:
+    return Product.objects.create(
+        name="Citra Hops",
+        slug="citra-hops",
+        description="Хмель",
+        price=10,
+        category=category_fixture,
+        image=_jpeg(),
+    )
+
+
+# ---------------------------------------------------------
+# 1. Производные строятся при загрузке: ширины, форматы, имена с хешем
+# ---------------------------------------------------------
+def test_variants_built_on_upload(product_with_image: Product, media: Path) -> None:
+    manifest = Product.objects.get(pk=product_with_image.pk).image_variants
+
+    assert manifest["source"] == product_with_image.image.name
+    assert set(manifest["variants"]) == {*enabled_formats(), "jpeg"}
+    assert "webp" in manifest["variants"]
+    assert list(manifest["variants"]["jpeg"]) == ["160", "320", "640", "1280"]
+
+    name = manifest["variants"]["webp"]["320"]
+    assert name.endswith(f".{manifest['hash']}.320w.webp")
+    with Image.open(media / name) as variant:
+        assert variant.size == (320, 240)
+        assert not variant.getexif()
+
+    original_size = (media / product_with_image.image.name).stat().st_size
+    assert (media / name).stat().st_size * 10 < original_size
+
+
+# ---------------------------------------------------------
+# 2. EXIF-ориентация применяется, узкий оригинал не растягивается
+# ---------------------------------------------------------
+def test_orientation_and_small_source(db: Any, media: Path, category_fixture: Any) -> None:
+    product = Product.objects.create(
+        name="Saaz", slug="saaz", description="-", price=1, category=category_fixture, image=_jpeg(300, 200, 6)
+    )
+
+    manifest = product.image_variants
+    assert (manifest["width"], manifest["height"]) == (200, 300)
+    assert list(manifest["variants"]["jpeg"]) == ["160", "200"]
+
+
+# ---------------------------------------------------------
+# 3. <picture> со srcset в каталоге, превью в админке — производная
+# ---------------------------------------------------------
+def test_picture_in_templates(client_web: Any, product_with_image: Product) -> None:
+    html = client_web.get(reverse("products:product_list")).content.decode()
+
+    assert '<source type="image/webp"' in html
+    assert ".320w.webp 320w" in html
+    assert ".160w.jpg 160w" in html
+    assert str(thumbnail_url(product_with_image, 100)).endswith(".160w.webp")
+
+
+# ---------------------------------------------------------
+# 4. Карта вариантов в REST API и GraphQL
+# ---------------------------------------------------------
+def test_variants_in_api(client_api: Any, product_with_image: Product) -> None:
+    data = client_api.get(f"/api/products/{product_with_image.slug}/").json()
+    assert data["image_variants"]["webp"]["640"].startswith("http://testserver/media/products/")
+
+    request = RequestFactory().post("/graphql/")
+    request.user = AnonymousUser()
+    result = schema.execute(
+        '{ product(slug: "citra-hops") { imageVariants { format width url } } }', context_value=request
+    )
+    assert result.errors is None
+    variants = result.data["product"]["imageVariants"]
+    assert {"format": "jpeg", "width": 1280} in [{"format": v["format"], "width": v["width"]} for v in variants]
+
+
+# ---------------------------------------------------------
+# 5. Замена и удаление изображения убирают старые производные
+# ---------------------------------------------------------
+def test_old_variants_removed(product_with_image: Product, media: Path) -> None:
+    old_files = [name for sizes in product_with_image.image_variants["variants"].values() for name in sizes.values()]
+
+    product_with_image.image = _jpeg(800, 600)
+    product_with_image.save()
+    assert not any((media / name).exists() for name in old_files)
+    assert max(map(int, product_with_image.image_variants["variants"]["jpeg"])) == 800
+
+    new_files = [name for sizes in product_with_image.image_variants["variants"].values() for name in sizes.values()]
+    product_with_image.delete()
+    assert not any((media / name).exists() for name in new_files)
+
+
+# ---------------------------------------------------------
+# 6. Без производных — оригинал; команда строит недостающие
+# ---------------------------------------------------------
+def test_stale_manifest_falls_back_and_command_rebuilds(product_with_image: Product) -> None:
+    Product.objects.filter(pk=product_with_image.pk).update(image_variants={})
+    product = Product.objects.get(pk=product_with_image.pk)
+    assert thumbnail_url(product, 100) == product.image.url
+
+    call_command("build_product_images", stdout=io.StringIO())
+
+    product.refresh_from_db()
+    assert product.image_variants["source"] == product.image.name
+    assert FORMATS["webp"][1] in str(thumbnail_url(product, 100))
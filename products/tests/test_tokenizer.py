@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import io
+from typing import Any, Optional
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from products.models import Product
+from products.tokenizer import generate_tags, generate_tags_batch
+
+TEXTS: list[Optional[str]] = [
+    "Citrus hops for IPA and pale ale",
+    "Ароматный свежий солод — для светлого пива!",
+    "Two\nlines, with   spaces\r\nand CRLF",
+    None,
+    "",
+    "of the and",
+    "Солод: pilsner/vienna 3.5 EBC",
+]
+
+
+# ---------------------------------------------------------
+# 1. Пачка даёт те же теги, что и поштучная генерация
+# ---------------------------------------------------------
+def test_batch_matches_single() -> None:
+    assert generate_tags_batch(TEXTS) == [generate_tags(text) for text in TEXTS]
+    assert generate_tags_batch([]) == []
+    assert generate_tags(TEXTS[0]) == "ale, citrus, hops, ipa, pale"
+    assert generate_tags(TEXTS[2]) == "crlf, lines, spaces, two"
+    assert generate_tags(TEXTS[5]) == ""
+
+
+# ---------------------------------------------------------
+# 2. Команда пересчёта: пачками, только изменившиеся, без updated_at;
+#    повторный запуск ничего не меняет, --after-pk продолжает
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_backfill_command(category_fixture: Any) -> None:
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"Item {i}",
+            slug=f"item-{i}",
+            short_description="Citrus hops for IPA",
+            tags="citrus, hops, ipa" if i % 2 else "stale",
+            description="-",
+            price=1,
+            category=category_fixture,
+        )
+        for i in range(10)
+    )
+    pks = sorted(Product.objects.values_list("pk", flat=True))
+    untouched = Product.objects.get(slug="item-0").updated_at
+
+    out = io.StringIO()
+    call_command("backfill_product_tags", "--chunk-size=4", f"--after-pk={pks[3]}", stdout=out)
+    assert "checked: 6, changed: 3" in out.getvalue()
+    assert Product.objects.filter(tags="stale").count() == 2
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command("backfill_product_tags", "--chunk-size=4", stdout=out)
+    assert "checked: 10, changed: 2" in out.getvalue()
+    # count, 3 пачки по чтению и bulk_update (в транзакции)
+    assert len(queries) <= 1 + 3 * 5
+
+    assert set(Product.objects.values_list("tags", flat=True)) == {"citrus, hops, ipa"}
+    assert Product.objects.get(pk=products[0].pk).updated_at == untouched
+
+    call_command("backfill_product_tags", stdout=out)
+    assert "checked: 10, changed: 0" in out.getvalue()
@@ -0,0 +1,75 @@
+"""
+Теги товара из короткого описания: слова длиннее двух букв без стоп-слов,
+по алфавиту через запятую («ale, citrus, hops, ipa, pale»).
+
+Одно описание — generate_tags (Product.save), пачка — generate_tags_batch
+(импорт каталога, пересчёт тегов): пачка приводится к нижнему регистру и
+чистится регулярным выражением за один вызов на весь текст пачки, а не
+на каждый товар.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import FrozenSet, Iterable, List, Optional
+
+# Всё, кроме букв, цифр и пробела, — разделитель слов. Перевод строки
+# сохраняется: по нему пачка делится обратно на описания
+_NON_WORD = re.compile(r"[^a-zA-Zа-яА-Я0-9 \n]+")
+
+MIN_LENGTH = 3
+
+STOP_WORDS: FrozenSet[str] = frozenset(
+    {
+        "the",
+        "and",
+        "or",
+        "for",
+        "with",
+        "from",
+        "made",
+        "of",
+        "to",
+        "a",
+        "in",
+        "on",
+        "at",
+        "is",
+        "this",
+        "an",
+        "и",
+        "для",
+        "под",
+        "над",
+        "при",
+        "из",
+        "от",
+        "до",
+    }
+)
+
+
+def _tags(words: List[str]) -> str:
+    return ", ".join(sorted({word for word in words if len(word) >= MIN_LENGTH and word not in STOP_WORDS}))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Слова описания в нижнем регистре (с повторами и стоп-словами)."""
+    if not text:
+        return []
+    return _NON_WORD.sub(" ", text.lower().replace("\n", " ")).split()
+
+
+def generate_tags(text: Optional[str]) -> str:
+    """Теги одного описания; пустая строка — тегов нет."""
+    return _tags(tokenize(text))
+
+
+def generate_tags_batch(texts: Iterable[Optional[str]]) -> List[str]:
+    """Теги для каждого описания пачки — в том же порядке."""
+    texts = list(texts)
+    if not texts:
+        return []
+    # Перевод строки внутри описания — обычный разделитель слов
+    blob = "\n".join((text or "").replace("\n", " ") for text in texts)
+    return [_tags(line.split()) for line in _NON_WORD.sub(" ", blob.lower()).split("\n")]
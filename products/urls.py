@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path
 
-from products.views import ProductDetailView, ProductListView
+from products.views import AsyncProductDetailView, AsyncProductListView, ProductDetailView, ProductListView, csrf_cookie
 
 app_name = "products"
 
+# Async-варианты — только под ASGI: под WSGI их пришлось бы выполнять через async_to_sync
+asgi = settings.SERVER_MODE == "asgi"
+list_view = AsyncProductListView if asgi else ProductListView
+detail_view = AsyncProductDetailView if asgi else ProductDetailView
+
 urlpatterns = [
-    path("", ProductListView.as_view(), name="product_list"),
-    path("products/<slug:slug>/", ProductDetailView.as_view(), name="product_detail"),
+    path("", list_view.as_view(), name="product_list"),
+    path("products/<slug:slug>/", detail_view.as_view(), name="product_detail"),
+    path("csrf/", csrf_cookie, name="csrf_cookie"),
 ]
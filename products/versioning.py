@@ -0,0 +1,262 @@
+"""
+Метки изменений каталога для условных HTTP-запросов (ETag / Last-Modified).
+
+Метка — время последнего изменения, хранится в кеше:
+- catalog          — любой товар, категория или характеристика;
+- categories       — любая категория (входит в карточку товара и API);
+- product:<slug>   — товар, его характеристики и отзывы.
+
+Сигналы (products/signals.py) обновляют метки при записи, поэтому
+проверка If-None-Match / If-Modified-Since стоит одно обращение к кешу.
+При промахе кеша метка восстанавливается из max(updated_at) одним запросом
+к основной БД: метка с отстающей реплики закешировалась бы без срока.
+
+Массовые QuerySet.update() сигналов не вызывают — после них метки
+нужно обновить вручную (bump_catalog / bump_product).
+
+Для async-представлений (ASGI) есть варианты с префиксом «a»: кеш и
+восстановление метки идут через async-API кеша и ORM, а async_condition
+заменяет django.views.decorators.http.condition.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+from functools import wraps
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Max
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import Category, Product
+
+CACHE_KEY_PREFIX = "catalog:stamp:"
+
+# Метка «изменений не было» — для пустого каталога
+EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _get_stamp(name: str, compute: Callable[[], Optional[datetime.datetime]]) -> Optional[datetime.datetime]:
+    key = CACHE_KEY_PREFIX + name
+    stamp: Optional[datetime.datetime] = cache.get(key)
+    if stamp is None:
+        stamp = compute()
+        if stamp is None:
+            return None
+        # add, а не set: не затираем метку, обновлённую параллельной записью
+        cache.add(key, stamp, None)
+    return stamp
+
+
+async def _aget_stamp(
+    name: str, compute: Callable[[], Awaitable[Optional[datetime.datetime]]]
+) -> Optional[datetime.datetime]:
+    key = CACHE_KEY_PREFIX + name
+    stamp: Optional[datetime.datetime] = await cache.aget(key)
+    if stamp is None:
+        stamp = await compute()
+        if stamp is None:
+            return None
+        await cache.aadd(key, stamp, None)
+    return stamp
+
+
+def _bump(name: str) -> None:
+    cache.set(CACHE_KEY_PREFIX + name, timezone.now(), None)
+
+
+# ======================================================================
+# МЕТКИ
+# ======================================================================
+def catalog_stamp() -> datetime.datetime:
+    def compute() -> datetime.datetime:
+        products = Product.objects.using(DEFAULT_DB_ALIAS).aggregate(last=Max("updated_at"))["last"]
+        categories = categories_stamp()
+        return max(products, categories) if products else categories
+
+    return _get_stamp("catalog", compute) or EPOCH
+
+
+def categories_stamp() -> datetime.datetime:
+    def compute() -> datetime.datetime:
+        return Category.objects.using(DEFAULT_DB_ALIAS).aggregate(last=Max("updated_at"))["last"] or EPOCH
+
+    return _get_stamp("categories", compute) or EPOCH
+
+
+def product_stamp(slug: str) -> Optional[datetime.datetime]:
+    """
+    Метка товара (с учётом категорий). None — товара нет,
+    условная обработка не выполняется (view сам вернёт 404).
+    """
+
+    def compute() -> Optional[datetime.datetime]:
+        row = (
+            Product.objects.using(DEFAULT_DB_ALIAS)
+            .filter(slug=slug)
+            .aggregate(
+                updated=Max("updated_at"),
+                reviewed=Max("review__created_at"),
+            )
+        )
+        if row["updated"] is None:
+            return None
+        return max(filter(None, (row["updated"], row["reviewed"])))
+
+    stamp = _get_stamp(f"product:{slug}", compute)
+    if stamp is None:
+        return None
+    return max(stamp, categories_stamp())
+
+
+# --- async-варианты (те же ключи кеша и те же запросы) ---
+
+
+async def acatalog_stamp() -> datetime.datetime:
+    async def compute() -> datetime.datetime:
+        products = (await Product.objects.using(DEFAULT_DB_ALIAS).aaggregate(last=Max("updated_at")))["last"]
+        categories = await acategories_stamp()
+        return max(products, categories) if products else categories
+
+    return await _aget_stamp("catalog", compute) or EPOCH
+
+
+async def acategories_stamp() -> datetime.datetime:
+    async def compute() -> datetime.datetime:
+        return (await Category.objects.using(DEFAULT_DB_ALIAS).aaggregate(last=Max("updated_at")))["last"] or EPOCH
+
+    return await _aget_stamp("categories", compute) or EPOCH
+
+
+async def aproduct_stamp(slug: str) -> Optional[datetime.datetime]:
+    async def compute() -> Optional[datetime.datetime]:
+        row = (
+            await Product.objects.using(DEFAULT_DB_ALIAS)
+            .filter(slug=slug)
+            .aaggregate(
+                updated=Max("updated_at"),
+                reviewed=Max("review__created_at"),
+            )
+        )
+        if row["updated"] is None:
+            return None
+        return max(filter(None, (row["updated"], row["reviewed"])))
+
+    stamp = await _aget_stamp(f"product:{slug}", compute)
+    if stamp is None:
+        return None
+    return max(stamp, await acategories_stamp())
+
+
+def bump_catalog() -> None:
+    _bump("catalog")
+
+
+def bump_categories() -> None:
+    _bump("categories")
+    _bump("catalog")
+
+
+def bump_product(slug: str) -> None:
+    _bump(f"product:{slug}")
+    _bump("catalog")
+
+
+def bump_products(slugs: Iterable[str]) -> None:
+    """Метки нескольких товаров одной записью в кеш (массовый импорт)."""
+    now = timezone.now()
+    cache.set_many({CACHE_KEY_PREFIX + f"product:{slug}": now for slug in slugs}, None)
+    _bump("catalog")
+
+
+def forget_product(slug: str) -> None:
+    """Товар удалён: метку убираем, чтобы на его URL не отвечать 304."""
+    cache.delete(CACHE_KEY_PREFIX + f"product:{slug}")
+    _bump("catalog")
+
+
+# ======================================================================
+# ETAG
+# ======================================================================
+def make_etag(stamp: Optional[datetime.datetime], *parts: str) -> Optional[str]:
+    """ETag из метки и дополнительных признаков варианта ответа."""
+    if stamp is None:
+        return None
+    source = ":".join((stamp.isoformat(), *parts))
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+
+
+def api_variant(request: HttpRequest) -> str:
+    """Признак варианта ответа API: JSON и browsable API — разные представления."""
+    return request.META.get("HTTP_ACCEPT", "") + "|" + request.GET.get("format", "")
+
+
+def page_variant(request: HttpRequest) -> Optional[str]:
+    """
+    Признак варианта HTML-страницы. Для авторизованных пользователей
+    страница персональная — условную обработку не выполняем (None).
+
+    Для анонимов в ETag входит CSRF-cookie: токен в формах страницы
+    действителен только с той cookie, с которой страница была отрисована.
+    """
+    if request.user.is_authenticated:
+        return None
+    return request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+
+
+async def apage_variant(request: HttpRequest) -> Optional[str]:
+    """page_variant для async-представлений: пользователь читается через request.auser()."""
+    user = await request.auser()
+    if user.is_authenticated:
+        return None
+    return request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+
+
+# ======================================================================
+# CONDITIONAL GET ДЛЯ ASYNC-ПРЕДСТАВЛЕНИЙ
+# ======================================================================
+AsyncEtagFunc = Callable[..., Awaitable[Optional[str]]]
+AsyncLastModifiedFunc = Callable[..., Awaitable[Optional[datetime.datetime]]]
+
+
+def async_condition(
+    etag_func: Optional[AsyncEtagFunc] = None,
+    last_modified_func: Optional[AsyncLastModifiedFunc] = None,
+) -> Callable[[Callable[..., Awaitable[HttpResponse]]], Callable[..., Awaitable[HttpResponse]]]:
+    """
+    Аналог condition() для async-представлений. Встроенный декоратор
+    вызывает etag_func синхронно — в event loop это запрос к БД при
+    промахе кеша меток. Здесь etag_func / last_modified_func — корутины.
+    """
+
+    def decorator(view_func: Callable[..., Awaitable[HttpResponse]]) -> Callable[..., Awaitable[HttpResponse]]:
+        @wraps(view_func)
+        async def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            last_modified: Optional[int] = None
+            if last_modified_func and (dt := await last_modified_func(request, *args, **kwargs)):
+                last_modified = int(dt.timestamp())
+
+            etag = await etag_func(request, *args, **kwargs) if etag_func else None
+            etag = quote_etag(etag) if etag is not None else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+            return response
+
+        return wrapper
+
+    return decorator
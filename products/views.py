@@ -1,18 +1,36 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict
-
-from django.db.models import Avg, Count, Q, QuerySet
-from django.http import HttpRequest, HttpResponse
+import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q, QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+from django.shortcuts import aget_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import condition
 from django.views.generic import DetailView
 from django_filters.views import FilterView
 
-from orders.models import OrderItem
+from reviews.eligibility import ReviewEligibility, aget_eligibility, get_eligibility
 from reviews.forms import ReviewForm
-from reviews.models import Review
+from reviews.pagination import ReviewPage, areview_page, page_url, review_page
 
+from .edge_cache import edge_cache
 from .filter import ProductFilter
 from .models import Category, Product
+from .versioning import (
+    acatalog_stamp,
+    apage_variant,
+    aproduct_stamp,
+    async_condition,
+    catalog_stamp,
+    make_etag,
+    page_variant,
+    product_stamp,
+)
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractUser as UserType
@@ -20,11 +38,81 @@ else:
     UserType = Any
 
 
+# -------------------------------------------------------------------------
+#  CONDITIONAL GET (ETag / Last-Modified по меткам каталога)
+# -------------------------------------------------------------------------
+
+
+def list_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[datetime.datetime]:
+    return catalog_stamp() if page_variant(request) is not None else None
+
+
+def list_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+    variant = page_variant(request)
+    return make_etag(catalog_stamp(), variant) if variant is not None else None
+
+
+def detail_last_modified(request: HttpRequest, slug: str, **kwargs: Any) -> Optional[datetime.datetime]:
+    return product_stamp(slug) if page_variant(request) is not None else None
+
+
+def detail_etag(request: HttpRequest, slug: str, **kwargs: Any) -> Optional[str]:
+    variant = page_variant(request)
+    return make_etag(product_stamp(slug), variant) if variant is not None else None
+
+
+# Те же функции для async-представлений (ASGI): кеш и ORM через async-API
+
+
+async def alist_last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[datetime.datetime]:
+    return await acatalog_stamp() if await apage_variant(request) is not None else None
+
+
+async def alist_etag(request: HttpRequest, *args: Any, **kwargs: Any) -> Optional[str]:
+    variant = await apage_variant(request)
+    return make_etag(await acatalog_stamp(), variant) if variant is not None else None
+
+
+async def adetail_last_modified(request: HttpRequest, slug: str, **kwargs: Any) -> Optional[datetime.datetime]:
+    return await aproduct_stamp(slug) if await apage_variant(request) is not None else None
+
+
+async def adetail_etag(request: HttpRequest, slug: str, **kwargs: Any) -> Optional[str]:
+    variant = await apage_variant(request)
+    return make_etag(await aproduct_stamp(slug), variant) if variant is not None else None
+
+
+# -------------------------------------------------------------------------
+#  ОБЩИЕ ЧАСТИ КОНТЕКСТА
+# -------------------------------------------------------------------------
+
+
+def root_categories() -> QuerySet[Category]:
+    return Category.objects.filter(parent__isnull=True).exclude(slug="default")
+
+
+def product_tags() -> QuerySet[Product, str]:
+    return Product.objects.exclude(tags__exact="").values_list("tags", flat=True).distinct()
+
+
+def keywords_list(tag_strings: Iterable[str]) -> List[str]:
+    """Keywords (SEO): теги товаров через «,» или «;», без повторов."""
+    keywords_set: set[str] = set()
+    for tag_string in tag_strings:
+        for kw in tag_string.replace(";", ",").split(","):
+            kw = kw.strip().lower()
+            if kw:
+                keywords_set.add(kw)
+    return sorted(keywords_set)
+
+
 # -------------------------------------------------------------------------
 #  PRODUCT LIST VIEW
 # -------------------------------------------------------------------------
 
 
+@method_decorator(edge_cache, name="get")
+@method_decorator(condition(etag_func=list_etag, last_modified_func=list_last_modified), name="get")
 class ProductListView(FilterView):
     """
     Каталог товаров: фильтры, поиск, сортировка, пагинация.
@@ -61,28 +149,85 @@ class ProductListView(FilterView):
 
         return queryset
 
+    def get_current_params(self) -> str:
+        """Параметры запроса без page — для пагинации."""
+        params = self.request.GET.copy()
+        params.pop("page", None)
+        return params.urlencode()
+
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context: Dict[str, Any] = super().get_context_data(**kwargs)
 
         # Список корневых категорий
-        context["categories"] = Category.objects.filter(parent__isnull=True).exclude(slug="default")
+        context["categories"] = root_categories()
 
         # Keywords (SEO)
-        keywords_set: set[str] = set()
-        tags_qs = Product.objects.exclude(tags__exact="").values_list("tags", flat=True).distinct()
+        context["keywords_list"] = keywords_list(product_tags())
 
-        for tag_string in tags_qs:
-            for kw in tag_string.replace(";", ",").split(","):
-                kw = kw.strip().lower()
-                if kw:
-                    keywords_set.add(kw)
+        context["current_params"] = self.get_current_params()
 
-        context["keywords_list"] = sorted(keywords_set)
+        return context
 
-        # Параметры запроса без page — для пагинации
-        params = self.request.GET.copy()
-        params.pop("page", None)
-        context["current_params"] = params.urlencode()
+
+@method_decorator(edge_cache, name="get")
+@method_decorator(async_condition(etag_func=alist_etag, last_modified_func=alist_last_modified), name="get")
+class AsyncProductListView(ProductListView):
+    """
+    ProductListView для ASGI (SERVER_MODE=asgi, см. products/urls.py).
+
+    Запросы к БД идут через async ORM и не занимают поток, пока клиент ждёт
+    ответа. Шаблон получает уже выбранные списки; TemplateResponse
+    рендерится обработчиком Django. Под WSGI async-представление
+    выполнялось бы через async_to_sync — там работает ProductListView.
+    """
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.filterset = self.get_filterset(self.get_filterset_class())
+
+        if not self.filterset.is_bound or self.filterset.is_valid() or not self.get_strict():
+            self.object_list = self.filterset.qs
+        else:
+            self.object_list = self.filterset.queryset.none()
+
+        context = await self.aget_context_data(filter=self.filterset)
+        return self.render_to_response(context)
+
+    async def apaginate_queryset(self, queryset: QuerySet[Product]) -> Tuple[Paginator, Page, List[Product]]:
+        """
+        paginate_queryset() через async ORM: COUNT — acount(),
+        страница выбирается async-итерацией. Неверный номер страницы — 404.
+        """
+        paginator = self.get_paginator(queryset, self.paginate_by, allow_empty_first_page=self.get_allow_empty())
+        # count — cached_property: подставляем посчитанное значение, Paginator не пойдёт в БД сам
+        paginator.__dict__["count"] = await queryset.acount()
+
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            number = paginator.num_pages if page_number == "last" else int(page_number)
+            page = paginator.page(number)
+        except (ValueError, InvalidPage) as exc:
+            raise Http404("Страница не найдена.") from exc
+
+        products = [product async for product in page.object_list]
+        page.object_list = products
+        return paginator, page, products
+
+    async def aget_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        paginator, page, products = await self.apaginate_queryset(self.object_list)
+
+        context: Dict[str, Any] = {
+            "view": self,
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "object_list": products,
+            self.context_object_name: products,
+            **kwargs,
+        }
+
+        context["categories"] = [category async for category in root_categories()]
+        context["keywords_list"] = keywords_list([tag_string async for tag_string in product_tags()])
+        context["current_params"] = self.get_current_params()
 
         return context
 
@@ -92,6 +237,8 @@ class ProductListView(FilterView):
 # -------------------------------------------------------------------------
 
 
+@method_decorator(edge_cache, name="get")
+@method_decorator(condition(etag_func=detail_etag, last_modified_func=detail_last_modified), name="get")
 class ProductDetailView(DetailView):
     """
     Детальная страница товара: характеристики, отзывы, рейтинг.
@@ -114,66 +261,82 @@ class ProductDetailView(DetailView):
         request: HttpRequest,
         *args: Any,
         **kwargs: Any,
-    ) -> HttpResponse:
+    ) -> Any:
         # Если extra_context передан — забираем invalid_form
         if hasattr(self, "extra_context") and self.extra_context:
             self.invalid_form = self.extra_context.get("invalid_form")
         return super().dispatch(request, *args, **kwargs)
 
-    # --- Проверки (купил товар + писал раньше отзыв) ---
-
-    def user_has_bought(self, product: Product, user: UserType) -> bool:
-        """
-        Проверка: купил ли пользователь товар.
-        Статусы: paid или delivered.
-        """
-        if not getattr(user, "is_authenticated", False):
-            return False
-
-        return OrderItem.objects.filter(
-            order__user=user,
-            order__status__in=["paid", "delivered"],
-            product=product,
-        ).exists()
-
-    def user_already_reviewed(self, product: Product, user: UserType) -> bool:
-        """Проверка: писал ли пользователь отзыв ранее."""
-        if not getattr(user, "is_authenticated", False):
-            return False
-
-        return Review.objects.filter(
-            user=user,
-            product=product,
-        ).exists()
-
     # --- Контекст страницы ---
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context: Dict[str, Any] = super().get_context_data(**kwargs)
 
         product: Product = self.object
-        user: UserType = self.request.user
 
         # Характеристики товара
         context["specifications"] = product.specifications.all()
 
-        # Все отзывы
-        reviews_qs = product.reviews.select_related("user").order_by("-created_at")
-        context["reviews"] = reviews_qs
+        self.add_reviews_context(context, review_page(product.pk), get_eligibility(self.request.user))
 
-        # Агрегация по отзывам
-        agg = reviews_qs.aggregate(avg_rating=Avg("rating"), count=Count("id"))
-        context["average_rating"] = agg["avg_rating"] or 0
-        context["reviews_count"] = agg["count"] or 0
+        return context
+
+    def add_reviews_context(self, context: Dict[str, Any], page: ReviewPage, eligibility: ReviewEligibility) -> None:
+        """Отзывы, рейтинг, право на отзыв и форма — общие для sync- и async-представления."""
+        product: Product = self.object
 
-        # Проверки
-        has_bought = self.user_has_bought(product, user)
-        already_reviewed = self.user_already_reviewed(product, user)
+        # Первая страница отзывов, следующие подгружаются фрагментом (reviews:list)
+        context["reviews"] = page.reviews
+        context["reviews_next_url"] = page_url(product.slug, page.next_cursor)
 
-        context["can_review"] = has_bought and not already_reviewed
-        context["already_reviewed"] = already_reviewed
+        # Рейтинг хранится в строке товара (reviews/ratings.py)
+        context["average_rating"] = product.average_rating
+        context["reviews_count"] = product.rating_count
+
+        # Право на отзыв (купил товар + ещё не писал): поиск в закешированных множествах
+        context["can_review"] = eligibility.can_review(product.pk)
+        context["already_reviewed"] = eligibility.already_reviewed(product.pk)
 
         # Форма: пустая или с ошибками
         context["review_form"] = self.invalid_form if self.invalid_form else ReviewForm()
 
+
+@method_decorator(edge_cache, name="get")
+@method_decorator(async_condition(etag_func=adetail_etag, last_modified_func=adetail_last_modified), name="get")
+class AsyncProductDetailView(ProductDetailView):
+    """
+    ProductDetailView для ASGI (см. AsyncProductListView).
+    """
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.object = await aget_object_or_404(self.get_queryset(), slug=self.kwargs[self.slug_url_kwarg])
+        context = await self.aget_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        # Контекст DetailView (без выборок ProductDetailView.get_context_data)
+        context: Dict[str, Any] = super(ProductDetailView, self).get_context_data(**kwargs)
+
+        product: Product = self.object
+        user: UserType = await self.request.auser()
+
+        context["specifications"] = [spec async for spec in product.specifications.all()]
+
+        self.add_reviews_context(context, await areview_page(product.pk), await aget_eligibility(user))
+
         return context
+
+
+# -------------------------------------------------------------------------
+#  CSRF COOKIE
+# -------------------------------------------------------------------------
+
+
+@never_cache
+@ensure_csrf_cookie
+def csrf_cookie(request: HttpRequest) -> HttpResponse:
+    """
+    Выдаёт CSRF-cookie. Страницы из кеша прокси не содержат токена —
+    js/csrf_cookie.js берёт его из cookie перед отправкой формы.
+    """
+    return HttpResponse(status=204)
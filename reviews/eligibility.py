@@ -0,0 +1,128 @@
+"""
+Право оставить отзыв: купленные пользователем товары и его отзывы.
+
+Оставить отзыв можно на купленный товар (заказ в статусе из
+Order.PURCHASED_STATUSES, в том числе перенесённый в архив), один раз.
+Оба множества id товаров читаются одним запросом (UNION) и кешируются на
+пользователя, поэтому проверка для карточки товара или целого списка —
+поиск в множестве, без запросов на каждый товар.
+
+Ключ сбрасывается сигналами (reviews/signals.py) при сохранении и удалении
+заказа и отзыва — сразу и ещё раз после коммита, чтобы параллельный запрос
+не закешировал состояние до коммита. Массовые QuerySet.update() заказов
+сигналов не вызывают — после них вызывается forget_eligibility вручную
+(действия админки заказов).
+
+Множества читаются с основной БД: после покупки или отзыва реплика может
+отставать, а закешированное устаревшее значение жило бы до сброса.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import CharField, QuerySet, Value
+
+from orders.models import ArchivedOrderItem, Order, OrderItem
+
+from .models import Review
+
+CACHE_KEY_PREFIX = "reviews:eligibility:"
+
+_PURCHASED = "purchased"
+_REVIEWED = "reviewed"
+
+
+@dataclass(frozen=True)
+class ReviewEligibility:
+    purchased: FrozenSet[int] = frozenset()
+    reviewed: FrozenSet[int] = frozenset()
+
+    def has_bought(self, product_id: int) -> bool:
+        return product_id in self.purchased
+
+    def already_reviewed(self, product_id: int) -> bool:
+        return product_id in self.reviewed
+
+    def can_review(self, product_id: int) -> bool:
+        return self.has_bought(product_id) and not self.already_reviewed(product_id)
+
+
+# Анонимный пользователь: ничего не покупал и не может оставить отзыв
+NOBODY = ReviewEligibility()
+
+
+def _cache_key(user_id: int) -> str:
+    return f"{CACHE_KEY_PREFIX}{user_id}"
+
+
+def _user_id(user: Any) -> Optional[int]:
+    if not getattr(user, "is_authenticated", False):
+        return None
+    return int(user.pk)
+
+
+def _rows(user_id: int) -> QuerySet[Any, Any]:
+    """(product_id, вид) купленных и отрецензированных товаров одним запросом."""
+    purchased, archived = (
+        model.objects.using(DEFAULT_DB_ALIAS)
+        .filter(order__user_id=user_id, order__status__in=Order.PURCHASED_STATUSES)
+        .order_by()
+        .values_list("product_id", Value(_PURCHASED, output_field=CharField()))
+        for model in (OrderItem, ArchivedOrderItem)
+    )
+    reviewed = (
+        Review.objects.using(DEFAULT_DB_ALIAS)
+        .filter(user_id=user_id)
+        .order_by()
+        .values_list("product_id", Value(_REVIEWED, output_field=CharField()))
+    )
+    return purchased.union(archived, reviewed)
+
+
+def _build(rows: Iterable[tuple[int, str]]) -> ReviewEligibility:
+    purchased: set[int] = set()
+    reviewed: set[int] = set()
+    for product_id, kind in rows:
+        (purchased if kind == _PURCHASED else reviewed).add(product_id)
+    return ReviewEligibility(frozenset(purchased), frozenset(reviewed))
+
+
+def get_eligibility(user: Any) -> ReviewEligibility:
+    user_id = _user_id(user)
+    if user_id is None:
+        return NOBODY
+
+    key = _cache_key(user_id)
+    eligibility: Optional[ReviewEligibility] = cache.get(key)
+    if eligibility is None:
+        eligibility = _build(_rows(user_id))
+        cache.set(key, eligibility, settings.REVIEW_ELIGIBILITY_CACHE_TIMEOUT)
+    return eligibility
+
+
+async def aget_eligibility(user: Any) -> ReviewEligibility:
+    """get_eligibility для async-представлений: тот же ключ кеша и тот же запрос."""
+    user_id = _user_id(user)
+    if user_id is None:
+        return NOBODY
+
+    key = _cache_key(user_id)
+    eligibility: Optional[ReviewEligibility] = await cache.aget(key)
+    if eligibility is None:
+        eligibility = _build([row async for row in _rows(user_id)])
+        await cache.aset(key, eligibility, settings.REVIEW_ELIGIBILITY_CACHE_TIMEOUT)
+    return eligibility
+
+
+def forget_eligibility(user_ids: Iterable[Optional[int]]) -> None:
+    """Сбрасывает закешированные множества пользователей (сейчас и после коммита)."""
+    keys = [_cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_product_catalog_indexes"),
+        ("reviews", "0002_review_rating_between_1_and_5"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(fields=["product", "-created_at"], name="review_product_created_idx"),
+        ),
+    ]
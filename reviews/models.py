@@ -48,6 +48,10 @@ class Review(models.Model):
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
         ordering = ["-created_at"]
+        indexes = [
+            # Отзывы на карточке товара, новые сверху
+            models.Index(fields=["product", "-created_at"], name="review_product_created_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(fields=["user", "product"], name="unique_user_product_review"),
             models.CheckConstraint(
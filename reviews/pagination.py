@@ -0,0 +1,66 @@
+"""
+Лента отзывов товара постранично: новые сверху, keyset-курсор (main/keyset.py).
+
+Первая страница встраивается в карточку товара, следующие отдаёт
+reviews.views.product_reviews (HTML-фрагмент, подгружается кнопкой
+«Show more»). Выборка страницы идёт по индексу (product, -created_at) —
+её стоимость не зависит ни от числа отзывов, ни от номера страницы.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from django.db.models import QuerySet
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from main.keyset import after_filter, decode_cursor, encode_cursor
+
+from .models import Review
+
+REVIEWS_PAGE_SIZE = 6
+
+# pk — последним полем: порядок однозначен при одинаковом created_at
+ORDERING = ("-created_at", "-id")
+
+
+@dataclass
+class ReviewPage:
+    reviews: List[Review] = field(default_factory=list)
+    # Курсор следующей страницы; None — отзывов больше нет
+    next_cursor: Optional[str] = None
+
+
+def _page_queryset(product_id: int, after: Optional[str]) -> QuerySet[Review]:
+    """
+    Отзывы страницы плюс один лишний — он показывает, есть ли следующая.
+    Неверный курсор — InvalidCursor.
+    """
+    queryset = Review.objects.filter(product_id=product_id).select_related("user").order_by(*ORDERING)
+    if after:
+        queryset = queryset.filter(after_filter(ORDERING, decode_cursor(after, ORDERING, Review)))
+    return queryset[: REVIEWS_PAGE_SIZE + 1]
+
+
+def _page(rows: List[Review]) -> ReviewPage:
+    if len(rows) <= REVIEWS_PAGE_SIZE:
+        return ReviewPage(rows)
+    reviews = rows[:REVIEWS_PAGE_SIZE]
+    return ReviewPage(reviews, encode_cursor(reviews[-1], ORDERING))
+
+
+def review_page(product_id: int, after: Optional[str] = None) -> ReviewPage:
+    return _page(list(_page_queryset(product_id, after)))
+
+
+async def areview_page(product_id: int, after: Optional[str] = None) -> ReviewPage:
+    return _page([review async for review in _page_queryset(product_id, after)])
+
+
+def page_url(slug: str, cursor: Optional[str]) -> Optional[str]:
+    """URL фрагмента со следующей страницей отзывов (None — страниц больше нет)."""
+    if cursor is None:
+        return None
+    return reverse("reviews:list", args=[slug]) + "?" + urlencode({"after": cursor})
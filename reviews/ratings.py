@@ -0,0 +1,39 @@
+"""
+Хранимый рейтинг товара: Product.rating_count и Product.rating_sum.
+
+Карточка товара, списки и API читают рейтинг из строки товара — время
+ответа не зависит от числа отзывов. Значения пересчитываются одним
+UPDATE с подзапросами по отзывам товара при каждом сохранении или
+удалении отзыва (reviews/signals.py). Пересчёт, а не инкремент: так
+учитывается и изменение оценки, а параллельные отзывы не теряются.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from products.models import Product
+
+from .models import Review
+
+
+def _aggregate(aggregate: Any) -> Coalesce:
+    """Подзапрос по отзывам товара из внешнего UPDATE; без отзывов — 0."""
+    subquery = (
+        Review.objects.filter(product=OuterRef("pk"))
+        .order_by()
+        .values("product")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def refresh_ratings(product_ids: Iterable[int]) -> None:
+    Product.objects.filter(pk__in=list(product_ids)).update(
+        rating_count=_aggregate(Count("id")),
+        rating_sum=_aggregate(Sum("rating")),
+    )
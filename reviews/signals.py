@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from orders.models import Order
+
+from .eligibility import forget_eligibility
+from .models import Review
+from .ratings import refresh_ratings
+
+
+# ======================================================================
+# ПРАВО НА ОТЗЫВ: сброс кеша пользователя (eligibility.py)
+# ======================================================================
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def on_purchase_or_review_changed(sender: type, instance: Order | Review, **kwargs: Any) -> None:
+    """Смена статуса заказа или новый / удалённый отзыв меняют множества пользователя."""
+    forget_eligibility([instance.user_id])
+
+
+# ======================================================================
+# ХРАНИМЫЙ РЕЙТИНГ ТОВАРА (ratings.py)
+# ======================================================================
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def on_review_changed(sender: type[Review], instance: Review, **kwargs: Any) -> None:
+    refresh_ratings([instance.product_id])
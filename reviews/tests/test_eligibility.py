@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from orders.admin import mark_as_paid
+from orders.models import Order, OrderItem
+from reviews.eligibility import NOBODY, get_eligibility
+from reviews.models import Review
+
+
+# ---------------------------------------------------------
+# 1. Множества строятся одним запросом, повтор — из кеша
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_eligibility_single_query_then_cached(
+    user_fixture: Any,
+    paid_order_item_fixture: Any,
+    product_fixture: Any,
+) -> None:
+    with CaptureQueriesContext(connection) as queries:
+        eligibility = get_eligibility(user_fixture)
+    assert len(queries) == 1
+
+    assert eligibility.has_bought(product_fixture.pk)
+    assert eligibility.can_review(product_fixture.pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert get_eligibility(user_fixture) == eligibility
+    assert len(queries) == 0
+
+    assert get_eligibility(None) is NOBODY
+
+
+# ---------------------------------------------------------
+# 2. Отзыв и смена статуса заказа сбрасывают кеш
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_eligibility_invalidated_by_signals(
+    user_fixture: Any,
+    order_item_fixture: Any,
+    product_fixture: Any,
+) -> None:
+    order = order_item_fixture.order
+    assert not get_eligibility(user_fixture).has_bought(product_fixture.pk)
+
+    order.status = Order.STATUS_DELIVERED
+    order.save(update_fields=["status"])
+    assert get_eligibility(user_fixture).can_review(product_fixture.pk)
+
+    Review.objects.create(user=user_fixture, product=product_fixture, rating=4, comment="Хорошо")
+    eligibility = get_eligibility(user_fixture)
+    assert eligibility.already_reviewed(product_fixture.pk)
+    assert not eligibility.can_review(product_fixture.pk)
+
+
+# ---------------------------------------------------------
+# 3. Массовое действие админки тоже сбрасывает кеш
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_eligibility_invalidated_by_admin_action(
+    rf: Any,
+    user_fixture: Any,
+    order_item_fixture: Any,
+    product_fixture: Any,
+) -> None:
+    assert not get_eligibility(user_fixture).has_bought(product_fixture.pk)
+
+    mark_as_paid(site._registry[Order], rf.post("/"), Order.objects.filter(pk=order_item_fixture.order_id))
+
+    assert get_eligibility(user_fixture).has_bought(product_fixture.pk)
+
+
+# ---------------------------------------------------------
+# 4. Карточка товара: право на отзыв без запросов к заказам
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_product_detail_uses_cached_eligibility(
+    client_web: Any,
+    user_fixture: Any,
+    paid_order_item_fixture: Any,
+    product_fixture: Any,
+) -> None:
+    client_web.force_login(user_fixture)
+    get_eligibility(user_fixture)
+    url = reverse("products:product_detail", args=[product_fixture.slug])
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client_web.get(url)
+
+    assert response.context["can_review"] is True
+    assert not any(OrderItem._meta.db_table in query["sql"] for query in queries.captured_queries)
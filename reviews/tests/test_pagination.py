@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, List
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from reviews.models import Review
+from reviews.pagination import REVIEWS_PAGE_SIZE
+
+
+def _create_reviews(product: Any, count: int) -> List[Review]:
+    User = get_user_model()
+    users = User.objects.bulk_create([User(username=f"reviewer{i}") for i in range(count)])
+    return [
+        Review.objects.create(user=user, product=product, rating=1 + i % 5, comment=f"Отзыв {i}")
+        for i, user in enumerate(users)
+    ]
+
+
+# ---------------------------------------------------------
+# 1. Карточка: первая страница отзывов и рейтинг из строки товара
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_detail_shows_first_page(client_web: Any, product_fixture: Any) -> None:
+    _create_reviews(product_fixture, REVIEWS_PAGE_SIZE + 2)
+
+    response = client_web.get(reverse("products:product_detail", args=[product_fixture.slug]))
+    context = response.context
+
+    assert len(context["reviews"]) == REVIEWS_PAGE_SIZE
+    assert context["reviews"][0].comment == f"Отзыв {REVIEWS_PAGE_SIZE + 1}"
+    assert context["reviews_next_url"].startswith(reverse("reviews:list", args=[product_fixture.slug]))
+    assert context["reviews_count"] == REVIEWS_PAGE_SIZE + 2
+    assert b"data-reviews-more" in response.content
+
+
+# ---------------------------------------------------------
+# 2. Фрагменты по курсору: все отзывы ровно по одному разу
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_fragments_walk_all_reviews(client_web: Any, product_fixture: Any) -> None:
+    reviews = _create_reviews(product_fixture, REVIEWS_PAGE_SIZE * 2 + 1)
+    # Одинаковое время у соседних отзывов: порядок задаёт id
+    Review.objects.filter(pk__in=[r.pk for r in reviews]).update(created_at=reviews[0].created_at)
+
+    url = client_web.get(reverse("products:product_detail", args=[product_fixture.slug])).context["reviews_next_url"]
+    seen: List[int] = []
+    while url:
+        response = client_web.get(url)
+        assert response.status_code == 200
+        seen.extend(review.pk for review in response.context["reviews"])
+        url = response.context["reviews_next_url"]
+
+    assert sorted(seen) == sorted(r.pk for r in reviews[:-REVIEWS_PAGE_SIZE])
+    assert len(seen) == len(set(seen))
+
+
+# ---------------------------------------------------------
+# 3. Неверный курсор и неизвестный товар
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_fragment_errors(client_web: Any, product_fixture: Any) -> None:
+    url = reverse("reviews:list", args=[product_fixture.slug])
+
+    assert client_web.get(url, {"after": "not-a-cursor"}).status_code == 400
+    # Подделанные значения полей сортировки — тоже 400, а не ошибка БД
+    for values in (["garbage", 1], ["2024-01-01T00:00:00+00:00", "x"], [None, 1], [[1], 1], ["2024-01-01", 1e999]):
+        payload = json.dumps({"o": ["-created_at", "-id"], "v": values})
+        forged = base64.urlsafe_b64encode(payload.encode()).decode()
+        assert client_web.get(url, {"after": forged}).status_code == 400, values
+    assert client_web.get(reverse("reviews:list", args=["missing"])).status_code == 404
+    assert client_web.post(url).status_code == 405
+
+
+# ---------------------------------------------------------
+# 4. Хранимый рейтинг пересчитывается при изменении отзывов
+# ---------------------------------------------------------
+@pytest.mark.django_db
+def test_stored_rating_follows_reviews(review_fixture: Any, product_fixture: Any) -> None:
+    product_fixture.refresh_from_db()
+    assert (product_fixture.rating_count, product_fixture.average_rating) == (1, 5)
+
+    other = _create_reviews(product_fixture, 1)[0]
+    review_fixture.rating = 3
+    review_fixture.save()
+    product_fixture.refresh_from_db()
+    assert (product_fixture.rating_count, product_fixture.rating_sum) == (2, 3 + other.rating)
+
+    Review.objects.filter(pk=other.pk).get().delete()
+    review_fixture.delete()
+    product_fixture.refresh_from_db()
+    assert (product_fixture.rating_count, product_fixture.average_rating) == (0, 0)
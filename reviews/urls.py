@@ -1,9 +1,14 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import add_review
+from .views import add_review, aproduct_reviews, product_reviews
 
 app_name = "reviews"
 
+# Async-вариант фрагмента отзывов — только под ASGI (см. products/urls.py)
+reviews_view = aproduct_reviews if settings.SERVER_MODE == "asgi" else product_reviews
+
 urlpatterns = [
+    path("<slug:slug>/", reviews_view, name="list"),
     path("<slug:slug>/add/", add_review, name="add"),
 ]
@@ -1,30 +1,33 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import get_object_or_404, redirect
+from django.http import HttpResponseBadRequest
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.views.decorators.http import condition, require_safe
 
-from orders.models import Order
+from main.keyset import InvalidCursor
 from products.models import Product
+from products.versioning import aproduct_stamp, async_condition, make_etag, product_stamp
 from products.views import ProductDetailView
 
+from .eligibility import get_eligibility
 from .forms import ReviewForm
-from .models import Review
+from .pagination import areview_page, page_url, review_page
 
 
 @login_required
 def add_review(request, slug):
     product = get_object_or_404(Product, slug=slug)
 
-    # Покупка
-    has_bought = Order.objects.filter(
-        user=request.user, items__product=product, status__in=["paid", "delivered"]
-    ).exists()
+    eligibility = get_eligibility(request.user)
 
-    if not has_bought:
+    # Покупка
+    if not eligibility.has_bought(product.pk):
         messages.error(request, "Можно оставить отзыв только после покупки.")
         return redirect("products:product_detail", slug=slug)
 
     # Один отзыв
-    if Review.objects.filter(user=request.user, product=product).exists():
+    if eligibility.already_reviewed(product.pk):
         messages.error(request, "Вы уже оставили отзыв.")
         return redirect("products:product_detail", slug=slug)
 
@@ -45,3 +48,45 @@ def add_review(request, slug):
         return view(request, slug=slug)
 
     return redirect("products:product_detail", slug=slug)
+
+
+def reviews_etag(request, slug):
+    # Метка товара меняется и при добавлении / удалении отзыва
+    return make_etag(product_stamp(slug), request.GET.get("after", ""))
+
+
+async def areviews_etag(request, slug):
+    return make_etag(await aproduct_stamp(slug), request.GET.get("after", ""))
+
+
+@require_safe
+@condition(etag_func=reviews_etag)
+def product_reviews(request, slug):
+    """
+    Следующая страница отзывов товара — HTML-фрагмент для карточки товара
+    (static/js/reviews_more.js). Страница задаётся курсором ?after=.
+    """
+    product = get_object_or_404(Product.objects.only("pk", "slug"), slug=slug)
+
+    try:
+        page = review_page(product.pk, request.GET.get("after"))
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor.")
+
+    context = {"reviews": page.reviews, "reviews_next_url": page_url(product.slug, page.next_cursor)}
+    return TemplateResponse(request, "reviews/review_page.html", context)
+
+
+@require_safe
+@async_condition(etag_func=areviews_etag)
+async def aproduct_reviews(request, slug):
+    """product_reviews для ASGI (SERVER_MODE=asgi, см. reviews/urls.py)."""
+    product = await aget_object_or_404(Product.objects.only("pk", "slug"), slug=slug)
+
+    try:
+        page = await areview_page(product.pk, request.GET.get("after"))
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid cursor.")
+
+    context = {"reviews": page.reviews, "reviews_next_url": page_url(product.slug, page.next_cursor)}
+    return TemplateResponse(request, "reviews/review_page.html", context)
@@ -0,0 +1,256 @@
+"""
+Бенчмарк конфигураций Gunicorn: RPS, задержка и память процессов.
+
+Для каждой конфигурации запускает `gunicorn -c gunicorn.conf.py` со своим
+набором переменных окружения, ждёт готовности, даёт нагрузку (потоки +
+keep-alive соединения http.client) и снимает память master + воркеров из /proc:
+- RSS — сумма по процессам (общие страницы считаются в каждом);
+- PSS — общие страницы делятся между процессами: честная оценка выигрыша
+  от preload_app (copy-on-write).
+
+Запуск из корня проекта, нужна БД с каталогом (DATABASE_URL или POSTGRES_*):
+
+    python scripts/bench_gunicorn.py --duration 20 --concurrency 32 --path / --path /api/products/
+    python scripts/bench_gunicorn.py --config sync-1 --config production
+
+Соединения с PostgreSQL (DB_CONNECTION_MODE, main/database.py): конфигурации
+db-* отличаются только режимом соединений; на p99 видна цена открытия
+соединения (TCP + аутентификация) в режиме direct:
+
+    python scripts/bench_gunicorn.py --config db-direct --config db-persistent --config db-pool
+
+Только Linux (/proc).
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+CONFIGS: Dict[str, Dict[str, str]] = {
+    # Исходная конфигурация: 1 sync-воркер
+    "sync-1": {"GUNICORN_PROFILE": "default", "SERVER_MODE": "wsgi"},
+    "production": {"GUNICORN_PROFILE": "production", "SERVER_MODE": "wsgi"},
+    "production-no-preload": {"GUNICORN_PROFILE": "production", "SERVER_MODE": "wsgi", "GUNICORN_PRELOAD": "0"},
+    "asgi-production": {"GUNICORN_PROFILE": "production", "SERVER_MODE": "asgi"},
+    "db-direct": {"GUNICORN_PROFILE": "production", "SERVER_MODE": "wsgi", "DB_CONNECTION_MODE": "direct"},
+    "db-persistent": {"GUNICORN_PROFILE": "production", "SERVER_MODE": "wsgi", "DB_CONNECTION_MODE": "persistent"},
+    "db-pool": {"GUNICORN_PROFILE": "production", "SERVER_MODE": "wsgi", "DB_CONNECTION_MODE": "pool"},
+    "asgi-db-pool": {"GUNICORN_PROFILE": "production", "SERVER_MODE": "asgi", "DB_CONNECTION_MODE": "pool"},
+}
+
+
+@dataclass
+class LoadResult:
+    requests: int = 0
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    workers: int
+    boot_seconds: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    errors: int
+    rss_mb: float
+    pss_mb: float
+
+
+# ======================================================================
+# ПРОЦЕССЫ И ПАМЯТЬ
+# ======================================================================
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    children = Path(f"/proc/{pid}/task/{pid}/children")
+    if children.exists():
+        for child in children.read_text().split():
+            pids += process_tree(int(child))
+    return pids
+
+
+def _proc_kb(path: Path, key: str) -> int:
+    try:
+        for line in path.read_text().splitlines():
+            if line.startswith(key + ":"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def memory_mb(pids: List[int]) -> tuple[float, float]:
+    """(RSS, PSS) процессов в МБ."""
+    rss = sum(_proc_kb(Path(f"/proc/{pid}/status"), "VmRSS") for pid in pids)
+    pss = sum(_proc_kb(Path(f"/proc/{pid}/smaps_rollup"), "Pss") for pid in pids)
+    return rss / 1024, pss / 1024
+
+
+def wait_ready(port: int, path: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", path)
+            if conn.getresponse().status < 500:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"gunicorn не ответил на {path} за {timeout} с")
+
+
+# ======================================================================
+# НАГРУЗКА
+# ======================================================================
+def _client(port: int, paths: List[str], deadline: float, result: LoadResult) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies: List[float] = []
+    requests = errors = 0
+    i = 0
+
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path, headers={"Accept": "text/html,application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+        requests += 1
+
+    conn.close()
+    with result.lock:
+        result.requests += requests
+        result.errors += errors
+        result.latencies += latencies
+
+
+def run_load(port: int, paths: List[str], duration: float, concurrency: int) -> LoadResult:
+    result = LoadResult()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=_client, args=(port, paths, deadline, result), daemon=True) for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return result
+
+
+# ======================================================================
+# ПРОГОН КОНФИГУРАЦИИ
+# ======================================================================
+def bench(name: str, paths: List[str], duration: float, concurrency: int) -> BenchResult:
+    port = free_port()
+    env = {**os.environ, **CONFIGS[name]}
+
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port, paths[0], timeout=60)
+        boot = time.monotonic() - started
+
+        # Короткий прогон, чтобы все воркеры ответили хотя бы раз
+        run_load(port, paths, duration=2, concurrency=concurrency)
+        load = run_load(port, paths, duration, concurrency)
+
+        pids = process_tree(process.pid)
+        rss, pss = memory_mb(pids)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+    latencies = sorted(load.latencies) or [0.0]
+    return BenchResult(
+        name=name,
+        workers=len(pids) - 1,
+        boot_seconds=boot,
+        rps=load.requests / duration,
+        p50_ms=statistics.median(latencies) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        errors=load.errors,
+        rss_mb=rss,
+        pss_mb=pss,
+    )
+
+
+def percentile(latencies: List[float], q: float) -> float:
+    """q-квантиль отсортированного списка."""
+    return latencies[min(len(latencies) - 1, int(len(latencies) * q))]
+
+
+def print_table(results: List[BenchResult]) -> None:
+    header = (
+        f"{'config':<24}{'workers':>8}{'boot s':>8}{'rps':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'err':>6}{'RSS MB':>9}{'PSS MB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.name:<24}{r.workers:>8}{r.boot_seconds:>8.1f}{r.rps:>10.1f}{r.p50_ms:>9.1f}"
+            f"{r.p95_ms:>9.1f}{r.p99_ms:>9.1f}{r.errors:>6}{r.rss_mb:>9.1f}{r.pss_mb:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGS), help="конфигурация (по умолчанию все)")
+    parser.add_argument("--path", action="append", help="URL под нагрузкой (по умолчанию / и /api/products/)")
+    parser.add_argument("--duration", type=float, default=15, help="длительность нагрузки, с")
+    parser.add_argument("--concurrency", type=int, default=16, help="число параллельных клиентов")
+    args = parser.parse_args()
+
+    paths = args.path or ["/", "/api/products/"]
+    results = []
+    for name in args.config or list(CONFIGS):
+        print(f"== {name} ...", file=sys.stderr)
+        results.append(bench(name, paths, args.duration, args.concurrency))
+
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Бенчмарк старта процесса: время загрузки приложения, память и самые
+«тяжёлые» импорты (python -X importtime).
+
+Каждый прогон — отдельный интерпретатор, который делает то же, что воркер
+Gunicorn при загрузке: get_wsgi_application() + загрузка URLconf.
+Выводит время загрузки, пиковый RSS процесса и пакеты верхнего уровня,
+отсортированные по суммарному собственному времени импорта модулей.
+
+Запуск из корня проекта:
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 5 --top 15
+    python scripts/bench_startup.py --json > startup.json
+
+Проверяет и ленивую загрузку: graphene, graphql-core и генератор схемы
+drf_spectacular при старте импортироваться не должны (см. main/lazy.py).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Модули, которые загружаются лениво — при первом запросе, а не при старте
+LAZY_MODULES = ("graphene", "graphene_django", "graphql", "drf_spectacular.generators", "drf_spectacular.views")
+
+BOOT_SCRIPT = f"""
+import json, os, resource, sys, time
+
+started = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+get_wsgi_application()
+get_resolver().url_patterns
+boot = time.perf_counter() - started
+
+print(json.dumps({{
+    "boot_ms": boot * 1000,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "eager": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+@dataclass(frozen=True)
+class StartupResult:
+    boot_ms: float
+    max_rss_mb: float
+    modules: int
+    eager: List[str]
+    top_packages: List[Tuple[str, float]]
+
+
+@dataclass(frozen=True)
+class StartupSummary:
+    runs: int
+    boot_ms_median: float
+    boot_ms_min: float
+    max_rss_mb: float
+    modules: int
+    eager: List[str]
+    top_packages: List[Tuple[str, float]]
+
+
+# ======================================================================
+# ПРОГОН
+# ======================================================================
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Собственное время импорта (мс), сложенное по пакетам верхнего уровня."""
+    totals: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us) / 1000
+    return totals
+
+
+def run_once(top: int) -> StartupResult:
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    data = json.loads(process.stdout.strip().splitlines()[-1])
+    totals = parse_importtime(process.stderr)
+    packages = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return StartupResult(
+        boot_ms=data["boot_ms"],
+        max_rss_mb=data["max_rss_mb"],
+        modules=data["modules"],
+        eager=data["eager"],
+        top_packages=[(name, round(ms, 1)) for name, ms in packages],
+    )
+
+
+def summarize(results: List[StartupResult]) -> StartupSummary:
+    last = results[-1]
+    return StartupSummary(
+        runs=len(results),
+        boot_ms_median=statistics.median(r.boot_ms for r in results),
+        boot_ms_min=min(r.boot_ms for r in results),
+        max_rss_mb=statistics.median(r.max_rss_mb for r in results),
+        modules=last.modules,
+        eager=last.eager,
+        top_packages=last.top_packages,
+    )
+
+
+def print_summary(summary: StartupSummary) -> None:
+    print(f"runs:               {summary.runs}")
+    print(f"boot, ms (median):  {summary.boot_ms_median:.1f}")
+    print(f"boot, ms (min):     {summary.boot_ms_min:.1f}")
+    print(f"max RSS, MB:        {summary.max_rss_mb:.1f}")
+    print(f"modules loaded:     {summary.modules}")
+    print(f"eager lazy modules: {', '.join(summary.eager) or '-'}")
+    print()
+    print(f"{'package':<32}{'self import ms':>16}")
+    print("-" * 48)
+    for name, ms in summary.top_packages:
+        print(f"{name:<32}{ms:>16.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="число прогонов (берётся медиана)")
+    parser.add_argument("--top", type=int, default=10, help="сколько пакетов показать")
+    parser.add_argument("--json", action="store_true", help="вывести результат в JSON")
+    args = parser.parse_args()
+
+    results = [run_once(args.top) for _ in range(max(1, args.repeat))]
+    summary = summarize(results)
+
+    if args.json:
+        print(json.dumps({**asdict(summary), "results": [asdict(r) for r in results]}, ensure_ascii=False, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from django import forms
 
+from products.image_queue import enqueue, take_upload
 from products.models import Product
 
 
@@ -48,3 +49,14 @@ class ProductAdminForm(forms.ModelForm):
             raise forms.ValidationError("Старая цена должна быть больше текущей.")
 
         return cleaned
+
+    def save(self, commit: bool = True) -> Product:
+        """
+        Новое изображение не сохраняется в запросе: файл уходит в очередь
+        обработки (products/image_queue.py), до её конца остаётся прежнее.
+        """
+        upload = take_upload(self) if commit else None
+        product = super().save(commit)
+        if upload is not None:
+            enqueue(product, upload)
+        return product
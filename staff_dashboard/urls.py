@@ -6,6 +6,7 @@ app_name = "staff_dashboard"
 
 urlpatterns = [
     path("", views.dashboard, name="home"),
+    path("orders/export/", views.orders_export, name="orders_export"),
     path("products/", views.products, name="products"),
     path("products/add/", views.product_form, name="product_add"),
     path("products/<int:pk>/edit/", views.product_form, name="product_edit"),
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.db.models import Sum
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
+from main.db_router import analytics_db
+from orders.export import FORMATS, export_response
 from orders.models import Order
+from products.image_queue import latest_upload
 from products.models import Product
 from staff_dashboard.decorators import staff_required
 from staff_dashboard.forms import ProductAdminForm
@@ -62,6 +65,17 @@ def _previous_period(start: date, end: date) -> tuple[date, date]:
     return prev_start, prev_end
 
 
+def _created_between(start: date, end: date) -> dict[str, datetime]:
+    """
+    Фильтр created_at по дням [start, end] границами datetime:
+    created_at__date__range приводит колонку к дате и не использует индекс.
+    """
+    return {
+        "created_at__gte": timezone.make_aware(datetime.combine(start, time.min)),
+        "created_at__lt": timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+    }
+
+
 def _pct_change(current: Decimal, previous: Decimal) -> tuple[int | None, str]:
     """
     current vs previous:
@@ -100,16 +114,21 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     start, end = _daterange_endpoints(today, period.days)
     prev_start, prev_end = _previous_period(start, end)
 
+    # Агрегаты считаются на реплике (если она есть и запрос не закреплён за основной БД)
+    db = analytics_db()
+
     # --- Products (на текущую дату) ---
-    products_total = Product.objects.count()
-    products_active = Product.objects.filter(is_active=True).count()
+    products = Product.objects.using(db)
+    products_total = products.count()
+    products_active = products.filter(is_active=True).count()
     products_inactive = products_total - products_active
-    out_of_stock = Product.objects.filter(stock=0).count()
+    out_of_stock = products.filter(stock=0).count()
 
     # --- Orders (период) ---
-    orders_qs = Order.objects.all()
-    curr_orders_qs = orders_qs.filter(created_at__date__range=(start, end))
-    prev_orders_qs = orders_qs.filter(created_at__date__range=(prev_start, prev_end))
+    # Заказы — вместе с архивом: итоги «за всё время» не уменьшаются после переноса
+    orders_qs = Order.objects.with_archive().using(db)
+    curr_orders_qs = orders_qs.filter(**_created_between(start, end))
+    prev_orders_qs = orders_qs.filter(**_created_between(prev_start, prev_end))
 
     orders_total = orders_qs.count()
     orders_curr = curr_orders_qs.count()
@@ -127,11 +146,11 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     sales_base = orders_qs.exclude(status=Order.STATUS_CANCELLED)
     sales_total = _sum_or_zero(sales_base, "total_price")
     sales_curr = _sum_or_zero(
-        sales_base.filter(created_at__date__range=(start, end)),
+        sales_base.filter(**_created_between(start, end)),
         "total_price",
     )
     sales_prev = _sum_or_zero(
-        sales_base.filter(created_at__date__range=(prev_start, prev_end)),
+        sales_base.filter(**_created_between(prev_start, prev_end)),
         "total_price",
     )
     sales_pct, sales_dir = _pct_change(sales_curr, sales_prev)
@@ -142,14 +161,15 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     avg_check_pct, avg_check_dir = _pct_change(avg_check_curr, avg_check_prev)
 
     # Users (если есть date_joined)
-    users_total = User.objects.count()
+    users = User.objects.using(db)
+    users_total = users.count()
     users_curr: int | None = None
     users_pct: int | None = None
     users_dir = "flat"
 
     if hasattr(User, "date_joined"):
-        users_curr_count = User.objects.filter(date_joined__date__range=(start, end)).count()
-        users_prev_count = User.objects.filter(date_joined__date__range=(prev_start, prev_end)).count()
+        users_curr_count = users.filter(date_joined__date__range=(start, end)).count()
+        users_prev_count = users.filter(date_joined__date__range=(prev_start, prev_end)).count()
 
         users_curr = users_curr_count
         users_pct, users_dir = _pct_change(
@@ -198,6 +218,22 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     return render(request, "staff_dashboard/dashboard.html", context)
 
 
+# ======================================================================
+# ORDERS EXPORT (orders/export.py)
+# ======================================================================
+@staff_required
+def orders_export(request: HttpRequest) -> HttpResponse | StreamingHttpResponse:
+    """Заказы выбранного на дашборде периода — потоковой выгрузкой CSV / JSONL."""
+    fmt = request.GET.get("format", "csv")
+    if fmt not in FORMATS:
+        return HttpResponse("Unknown format", status=400)
+
+    period = _get_period(request)
+    start, end = _daterange_endpoints(timezone.localdate(), period.days)
+    orders = Order.objects.with_archive().using(analytics_db()).filter(**_created_between(start, end))
+    return export_response(orders, fmt, name=f"orders_{start:%Y%m%d}_{end:%Y%m%d}")
+
+
 # ======================================================================
 # PRODUCTS LIST
 # ======================================================================
@@ -229,7 +265,13 @@ def product_form(request: HttpRequest, pk: int | None = None) -> HttpResponse:
     return render(
         request,
         "staff_dashboard/product_form.html",
-        {"form": form, "product": product, "mode": "edit" if product else "add"},
+        {
+            "form": form,
+            "product": product,
+            "mode": "edit" if product else "add",
+            # Статус обработки загруженного изображения (products/image_queue.py)
+            "image_upload": latest_upload(product),
+        },
     )
 
 
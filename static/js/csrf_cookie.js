@@ -0,0 +1,29 @@
+// Страницы каталога могут отдаваться из кеша прокси и не содержат CSRF-токена.
+// Перед отправкой формы берём токен из cookie (при необходимости запрашиваем её).
+document.addEventListener("DOMContentLoaded", () => {
+    const COOKIE_NAME = "csrftoken";
+
+    const readCookie = name => {
+        const match = document.cookie.match(new RegExp("(?:^|; )" + name + "=([^;]*)"));
+        return match ? decodeURIComponent(match[1]) : "";
+    };
+
+    document.querySelectorAll("input[data-csrf-from-cookie]").forEach(input => {
+        const form = input.form;
+        if (!form) return;
+
+        form.addEventListener("submit", async event => {
+            if (input.value) return;
+            event.preventDefault();
+
+            let token = readCookie(COOKIE_NAME);
+            if (!token) {
+                await fetch(input.dataset.csrfUrl, { credentials: "same-origin" });
+                token = readCookie(COOKIE_NAME);
+            }
+
+            input.value = token;
+            form.submit();
+        });
+    });
+});
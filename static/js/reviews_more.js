@@ -0,0 +1,25 @@
+// Лента отзывов на карточке товара: следующая страница подгружается
+// HTML-фрагментом (reviews:list) на место ссылки «Show more reviews».
+// Без JS ссылка открывает тот же фрагмент отдельной страницей.
+document.addEventListener("click", async event => {
+    const link = event.target.closest("a[data-reviews-more]");
+    if (!link) return;
+    event.preventDefault();
+
+    if (link.getAttribute("aria-busy") === "true") return;
+    link.setAttribute("aria-busy", "true");
+
+    try {
+        const response = await fetch(link.href, {
+            credentials: "same-origin",
+            headers: { "X-Requested-With": "XMLHttpRequest" },
+        });
+        if (!response.ok) throw new Error(response.statusText);
+
+        // Фрагмент: карточки и ссылка на следующую страницу (если есть)
+        link.insertAdjacentHTML("beforebegin", await response.text());
+        link.remove();
+    } catch (error) {
+        link.removeAttribute("aria-busy");
+    }
+});
@@ -18,7 +18,7 @@ from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 
 from cart.utils import merge_session_cart_into_user_cart
-from orders.models import Order
+from orders.models import Order, OrderRecord
 from reviews.models import Review
 
 from .forms import ProfileUpdateForm, RegisterForm, UserUpdateForm
@@ -131,7 +131,8 @@ def account_view(request: HttpRequest) -> HttpResponse:
         user_form = UserUpdateForm(instance=user)
         profile_form = ProfileUpdateForm(instance=profile)
 
-    orders: QuerySet[Order] = Order.objects.filter(user=user).order_by("-created_at")
+    # История — вместе с архивными заказами
+    orders: QuerySet[OrderRecord] = Order.objects.with_archive().filter(user=user).order_by("-created_at")
 
     reviewed_product_ids: set[int] = set(Review.objects.filter(user=user).values_list("product_id", flat=True))
 